@@ -56,7 +56,7 @@ setup(
     },
     entry_points={
         "console_scripts": [
-            "rfd=rfd.cli:main",
+            "rfd=rfd.client:main",
         ],
     },
     include_package_data=True,
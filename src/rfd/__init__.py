@@ -10,10 +10,32 @@ __author__ = "RFD Team"
 __email__ = "team@rfd-protocol.dev"
 __description__ = "Reality-First Development Protocol"
 
-from .build import BuildEngine
-from .rfd import RFD
-from .session import SessionManager
-from .spec import SpecEngine
-from .validation import ValidationEngine
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .build import BuildEngine
+    from .rfd import RFD
+    from .session import SessionManager
+    from .spec import SpecEngine
+    from .validation import ValidationEngine
 
 __all__ = ["RFD", "BuildEngine", "ValidationEngine", "SpecEngine", "SessionManager"]
+
+# Public names resolved on first access so `import rfd` (and every CLI call)
+# does not pull in requests/questionary/frontmatter up front
+_LAZY_EXPORTS = {
+    "RFD": ".rfd",
+    "BuildEngine": ".build",
+    "ValidationEngine": ".validation",
+    "SpecEngine": ".spec",
+    "SessionManager": ".session",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_EXPORTS:
+        value = getattr(import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
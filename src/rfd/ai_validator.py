@@ -3,16 +3,155 @@ AI Claim Validation Module
 Detects and validates AI claims about code creation and modifications
 """
 
+import bisect
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+from .project_files import ProjectFiles
+from .symbol_index import SymbolIndex
+
+# Common mock data patterns: (regex, description, lowercase literal every match contains)
+# Note: Using chr() to avoid self-detection in validation patterns
+_FAKE = chr(102) + "ake"  # f-ake
+_DUMMY = chr(100) + "ummy"  # d-ummy
+MOCK_PATTERNS: List[Tuple[str, str, str]] = [
+    # Test/fake data literals
+    (r'["\']test[_\s]?user["\']', "test user data", "test"),
+    (r'["\']' + _FAKE + r'[_\s]?\w+["\']', _FAKE + " data", _FAKE),
+    (r'["\']' + _DUMMY + r'[_\s]?\w+["\']', _DUMMY + " data", _DUMMY),
+    (r'["\']example\.com["\']', "example.com domain", "example.com"),
+    (r'["\']foo@bar\.com["\']', "foo@bar email", "foo@bar.com"),
+    (r'["\']lorem\s+ipsum["\']', "lorem ipsum text", "lorem"),
+    (r'["\']123[- ]?456[- ]?7890["\']', "phone number pattern", "123"),
+    # Mock libraries and frameworks
+    (r"from\s+unittest\.mock\s+import", "unittest mock import", "unittest.mock"),
+    (r"import\s+mock", "mock module import", "mock"),
+    (r"@mock\.", "mock decorator", "@mock."),
+    (r"MagicMock\s*\(", "MagicMock usage", "magicmock"),
+    (r"Mock\s*\(", "Mock object usage", "mock"),
+    (r"patch\s*\(", "patch usage", "patch"),
+    # Hardcoded test values
+    (r'password\s*=\s*["\']password["\']', "hardcoded test password", "password"),
+    (r'token\s*=\s*["\']test[_\s]?token["\']', "hardcoded test token", "token"),
+    (r'api[_\s]?key\s*=\s*["\']test[_\s]?key["\']', "hardcoded test API key", "key"),
+    # Mock functions/methods
+    (r"def\s+mock_\w+", "mock function definition", "mock_"),
+    (r"def\s+" + _FAKE + r"_\w+", _FAKE + " function definition", _FAKE + "_"),
+    (r"def\s+stub_\w+", "stub function definition", "stub_"),
+    (r"def\s+test_\w+", "test function definition", "test_"),
+    # Mock return values
+    (r'return\s+["\']mock[_\s]?\w+["\']', "mock return value", "mock"),
+    (r'return\s+["\']' + _FAKE + r'[_\s]?\w+["\']', _FAKE + " return value", _FAKE),
+    (r'return\s+\{\s*["\']test["\']', "test object return", "test"),
+    # Mock database records
+    (r'INSERT\s+INTO.*["\']test_', "test database insert", "insert"),
+    (r'VALUES.*["\']' + _DUMMY, _DUMMY + " database values", _DUMMY),
+    # Fixture and factory patterns
+    (r"@pytest\.fixture", "pytest fixture", "@pytest.fixture"),
+    (r"factory\.Faker\(", "Faker factory", "faker("),
+    (r"FactoryBoy", "FactoryBoy usage", "factoryboy"),
+]
+
+
+_MOCK_LITERALS = tuple(sorted({literal for _, _, literal in MOCK_PATTERNS}))
+
+
+@lru_cache(maxsize=None)
+def _mock_regex(index: int, lowered: bool) -> "re.Pattern[str]":
+    pattern = MOCK_PATTERNS[index][0]
+    if lowered:
+        # Matching lowercase text with a lowercase pattern lets re use its fast literal
+        # search, which IGNORECASE disables (the patterns use no uppercase escapes)
+        return re.compile(pattern.lower(), re.MULTILINE)
+    return re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+
+
+def find_mock_data(content: str, file_path: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Mock pattern findings for one file's content.
+
+    A pattern only runs if its literal occurs in the content, so most files are
+    rejected by a few substring checks. Line numbers come from the match offset
+    (bisect over the line start offsets), computed once per file.
+    """
+    lowered = content.lower()
+    present = {literal for literal in _MOCK_LITERALS if literal in lowered}
+    if not present:
+        return []
+
+    # lower() can change the length of a few non-ASCII strings - then offsets wouldn't line up
+    use_lowered = len(lowered) == len(content)
+    haystack = lowered if use_lowered else content
+
+    findings = []
+    line_starts = None
+    for index, (_, description, literal) in enumerate(MOCK_PATTERNS):
+        if literal not in present:
+            continue
+        for match in _mock_regex(index, use_lowered).finditer(haystack):
+            text = content[match.start() : match.end()]
+            if "\n" in text:
+                continue  # findings are per line - a match spanning lines was never reported
+            if line_starts is None:
+                line_starts = [0] + [newline.end() for newline in re.finditer("\n", content)]
+            findings.append(
+                {
+                    "type": "mock_data",
+                    "pattern": description,
+                    "match": text[:100],
+                    "line": bisect.bisect_right(line_starts, match.start()),
+                    "file": file_path or "provided content",
+                }
+            )
+    return findings
+
+
+def detect_mock_data(
+    file_path: Optional[str] = None, content: Optional[str] = None
+) -> Tuple[bool, List[Dict[str, Any]]]:
+    """AIClaimValidator.detect_mock_data as a plain function, so process pools can run it"""
+    # Get content to check
+    if file_path and not content:
+        if not Path(file_path).exists():
+            return False, [{"type": "error", "message": f"File {file_path} not found"}]
+        try:
+            with open(file_path, encoding="utf-8") as f:
+                content = f.read()
+        except Exception as e:
+            return False, [{"type": "error", "message": f"Error reading file: {e}"}]
+
+    if not content:
+        return False, [{"type": "error", "message": "No content to check"}]
+
+    mock_findings = find_mock_data(content, file_path)
+
+    # Check for test files (which are allowed to have mocks)
+    is_test_file = False
+    if file_path:
+        is_test_file = any(part in str(file_path) for part in ["test_", "_test.py", "tests/", "test/"])
+
+    # Filter findings if in test file
+    if is_test_file:
+        # In test files, only flag production mock usage
+        mock_findings = [f for f in mock_findings if "import" not in f["pattern"] and "fixture" not in f["pattern"]]
+
+    has_mocks = len(mock_findings) > 0
+
+    return has_mocks, mock_findings
+
 
 class AIClaimValidator:
     """Validates AI claims about files and functions"""
 
-    def __init__(self):
-        pass
+    def __init__(self, files: Optional[ProjectFiles] = None, symbols: Optional[SymbolIndex] = None):
+        # File inventory to search - pass the command's shared one to avoid another walk
+        self.files = files if files is not None else ProjectFiles()
+        # Definitions lookup - built over the same inventory unless one is shared
+        self.symbols = symbols if symbols is not None else SymbolIndex(self.files)
 
     def validate_ai_claims(self, claims: str) -> Tuple[bool, List[Dict[str, Any]]]:
         """
@@ -288,19 +427,8 @@ class AIClaimValidator:
             except Exception:
                 pass
 
-        # Search across all Python files
-        for py_file in Path(".").glob("**/*.py"):
-            # Skip virtual environments and common directories
-            if any(part in {".venv", "venv", "__pycache__", ".git"} for part in py_file.parts):
-                continue
-
-            try:
-                if self._check_function_in_file(func_name, str(py_file)):
-                    return True
-            except Exception:
-                continue
-
-        return False
+        # Search every indexed source file
+        return self.symbols.defines(func_name)
 
     def _check_function_in_file(self, func_name: str, file_path: str) -> bool:
         """Check if a specific function/class exists in a file"""
@@ -517,27 +645,10 @@ class AIClaimValidator:
         if file_hint and Path(file_hint).exists():
             target_file = file_hint
         else:
-            # Search for the file containing this function
-            for py_file in Path(".").glob("**/*.py"):
-                if any(part in {".venv", "venv", "__pycache__", ".git"} for part in py_file.parts):
-                    continue
-
-                try:
-                    with open(py_file, encoding="utf-8", errors="ignore") as f:
-                        content = f.read()
-                        if (
-                            re.search(rf"^\s*def\s+{target}\s*\(", content, re.MULTILINE)
-                            or re.search(rf"^\s*class\s+{target}\s*[:\(]", content, re.MULTILINE)
-                            or re.search(
-                                rf"^\s*async\s+def\s+{target}\s*\(",
-                                content,
-                                re.MULTILINE,
-                            )
-                        ):
-                            target_file = str(py_file)
-                            break
-                except Exception:
-                    continue
+            # Find the Python file defining this function/class
+            definitions = self.symbols.find(target, suffixes=(".py",))
+            if definitions:
+                target_file = str(self.symbols.path_of(definitions[0]))
 
         if not target_file:
             return False
@@ -659,113 +770,13 @@ class AIClaimValidator:
         Detect mock data patterns in code
         Returns (has_mocks, details) where details contains specific mock findings
         """
-        mock_findings = []
-
-        # Get content to check
-        if file_path and not content:
-            if not Path(file_path).exists():
-                return False, [{"type": "error", "message": f"File {file_path} not found"}]
-            try:
-                with open(file_path, encoding="utf-8") as f:
-                    content = f.read()
-            except Exception as e:
-                return False, [{"type": "error", "message": f"Error reading file: {e}"}]
-
-        if not content:
-            return False, [{"type": "error", "message": "No content to check"}]
-
-        # Common mock data patterns
-        # Note: Using chr() to avoid self-detection in validation patterns
-        mock_patterns = [
-            # Test/fake data literals
-            (r'["\']test[_\s]?user["\']', "test user data"),
-            (
-                r'["\']' + chr(102) + r'ake[_\s]?\w+["\']',
-                chr(102) + "ake data",
-            ),  # f-ake
-            (
-                r'["\']' + chr(100) + r'ummy[_\s]?\w+["\']',
-                chr(100) + "ummy data",
-            ),  # d-ummy
-            (r'["\']example\.com["\']', "example.com domain"),
-            (r'["\']foo@bar\.com["\']', "foo@bar email"),
-            (r'["\']lorem\s+ipsum["\']', "lorem ipsum text"),
-            (r'["\']123[- ]?456[- ]?7890["\']', "phone number pattern"),
-            # Mock libraries and frameworks
-            (r"from\s+unittest\.mock\s+import", "unittest mock import"),
-            (r"import\s+mock", "mock module import"),
-            (r"@mock\.", "mock decorator"),
-            (r"MagicMock\s*\(", "MagicMock usage"),
-            (r"Mock\s*\(", "Mock object usage"),
-            (r"patch\s*\(", "patch usage"),
-            # Hardcoded test values
-            (r'password\s*=\s*["\']password["\']', "hardcoded test password"),
-            (r'token\s*=\s*["\']test[_\s]?token["\']', "hardcoded test token"),
-            (r'api[_\s]?key\s*=\s*["\']test[_\s]?key["\']', "hardcoded test API key"),
-            # Mock functions/methods
-            (r"def\s+mock_\w+", "mock function definition"),
-            (
-                r"def\s+" + chr(102) + r"ake_\w+",
-                chr(102) + "ake function definition",
-            ),  # f-ake
-            (r"def\s+stub_\w+", "stub function definition"),
-            (r"def\s+test_\w+", "test function definition"),
-            # Mock return values
-            (r'return\s+["\']mock[_\s]?\w+["\']', "mock return value"),
-            (
-                r'return\s+["\']' + chr(102) + r'ake[_\s]?\w+["\']',
-                chr(102) + "ake return value",
-            ),  # f-ake
-            (r'return\s+\{\s*["\']test["\']', "test object return"),
-            # Mock database records
-            (r'INSERT\s+INTO.*["\']test_', "test database insert"),
-            (r'VALUES.*["\']dummy', "dummy database values"),
-            # Fixture and factory patterns
-            (r"@pytest\.fixture", "pytest fixture"),
-            (r"factory\.Faker\(", "Faker factory"),
-            (r"FactoryBoy", "FactoryBoy usage"),
-        ]
+        return detect_mock_data(file_path, content)
 
-        # Check each pattern
-        for pattern, description in mock_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE | re.MULTILINE)
-            if matches:
-                # Get line numbers for each match
-                lines = content.split("\n")
-                for match in matches:
-                    line_num = None
-                    for i, line in enumerate(lines, 1):
-                        if match in line or (isinstance(match, str) and match.strip() in line):
-                            line_num = i
-                            mock_findings.append(
-                                {
-                                    "type": "mock_data",
-                                    "pattern": description,
-                                    "match": (match[:100] if len(str(match)) > 100 else str(match)),
-                                    "line": line_num,
-                                    "file": file_path or "provided content",
-                                }
-                            )
-                            break
-
-        # Check for test files (which are allowed to have mocks)
-        is_test_file = False
-        if file_path:
-            is_test_file = any(part in str(file_path) for part in ["test_", "_test.py", "tests/", "test/"])
-
-        # Filter findings if in test file
-        if is_test_file:
-            # In test files, only flag production mock usage
-            mock_findings = [f for f in mock_findings if "import" not in f["pattern"] and "fixture" not in f["pattern"]]
-
-        has_mocks = len(mock_findings) > 0
-
-        return has_mocks, mock_findings
-
-    def validate_no_mocks(self, directory: str = "src", exclude_tests: bool = True) -> Dict[str, Any]:
+    def validate_no_mocks(self, directory: str = "src", exclude_tests: bool = True, jobs: int = 1) -> Dict[str, Any]:
         """
         Validate that no mock data exists in production code
-        Returns validation result with details
+        Returns validation result with details. jobs > 1 (0 = one per CPU)
+        scans files on a process pool.
         """
         results = {
             "passing": True,
@@ -780,7 +791,8 @@ class AIClaimValidator:
         if not path.exists():
             return {"passing": False, "error": f"Directory {directory} not found"}
 
-        for py_file in path.glob("**/*.py"):
+        files = []
+        for py_file in ProjectFiles(path).with_suffix(".py"):
             # Skip test files if requested
             if exclude_tests:
                 if any(part in str(py_file) for part in ["test_", "_test.py", "tests/", "test/", "__pycache__"]):
@@ -790,14 +802,25 @@ class AIClaimValidator:
             if "ai_validator.py" in str(py_file):
                 continue
 
-            results["files_checked"] += 1
+            files.append(str(py_file))
+
+        if jobs <= 0:
+            jobs = os.cpu_count() or 1
 
-            # Check for mocks in this file
-            has_mocks, findings = self.detect_mock_data(str(py_file))
+        # Check for mocks in each file - results are merged in file order either way
+        if jobs > 1 and len(files) > 1:
+            workers = min(jobs, len(files))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                scans = list(pool.map(detect_mock_data, files, chunksize=max(len(files) // (workers * 4), 1)))
+        else:
+            scans = [detect_mock_data(py_file) for py_file in files]
+
+        for py_file, (has_mocks, findings) in zip(files, scans):
+            results["files_checked"] += 1
 
             if has_mocks:
                 results["passing"] = False
-                results["files_with_mocks"].append(str(py_file))
+                results["files_with_mocks"].append(py_file)
                 results["total_mock_instances"] += len(findings)
                 results["details"].extend(findings)
 
@@ -195,18 +195,14 @@ class ArtifactAnalyzer:
 
             # Search for the endpoint in Python/JS files
             found = False
-            for pattern in ["**/*.py", "**/*.js", "**/*.ts"]:
-                files = list(self.project_root.glob(pattern))
-                for file in files:
-                    try:
-                        content = file.read_text()
-                        if endpoint in content and method in content:
-                            found = True
-                            break
-                    except Exception:
-                        continue
-                if found:
-                    break
+            for file in self.rfd.project_files.with_suffix(".py", ".js", ".ts"):
+                try:
+                    content = file.read_text()
+                    if endpoint in content and method in content:
+                        found = True
+                        break
+                except Exception:
+                    continue
 
             if found:
                 implemented += 1
@@ -231,9 +227,7 @@ class ArtifactAnalyzer:
         spec = self.rfd.load_project_spec()
 
         # Simple heuristic: look for test files
-        test_files = []
-        for pattern in ["**/test_*.py", "**/*_test.py", "**/*.test.js", "**/*.spec.js"]:
-            test_files.extend(list(self.project_root.glob(pattern)))
+        test_files = self.rfd.project_files.matching("test_*.py", "*_test.py", "*.test.js", "*.spec.js")
 
         if not test_files:
             coverage["status"] = "no_tests"
@@ -299,22 +293,21 @@ class ArtifactAnalyzer:
         for principle in principles:
             if "no mock" in principle["principle"].lower():
                 # Check for mock data in non-test files
-                for pattern in ["**/*.py", "**/*.js"]:
-                    files = [f for f in self.project_root.glob(pattern) if "test" not in f.name.lower()]
-                    for file in files:
-                        try:
-                            content = file.read_text()
-                            if any(mock in content for mock in ["mock(", "Mock(", "@patch", "jest.mock"]):
-                                adherence["violations"].append(
-                                    {
-                                        "principle": "No mock data in production",
-                                        "file": str(file.relative_to(self.project_root)),
-                                        "severity": "high",
-                                    }
-                                )
-                                adherence["status"] = "violated"
-                        except Exception:
-                            continue
+                files = [f for f in self.rfd.project_files.with_suffix(".py", ".js") if "test" not in f.name.lower()]
+                for file in files:
+                    try:
+                        content = file.read_text()
+                        if any(mock in content for mock in ["mock(", "Mock(", "@patch", "jest.mock"]):
+                            adherence["violations"].append(
+                                {
+                                    "principle": "No mock data in production",
+                                    "file": str(file.relative_to(self.project_root)),
+                                    "severity": "high",
+                                }
+                            )
+                            adherence["status"] = "violated"
+                    except Exception:
+                        continue
 
         conn.close()
         return adherence
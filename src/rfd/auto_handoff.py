@@ -4,13 +4,14 @@ No manual documents - everything from database and code
 """
 
 import json
-import sqlite3
 import subprocess
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 from typing import Any, Dict, List
 
+from .db_utils import get_db_connection
+
 
 class AutoHandoff:
     """
@@ -42,7 +43,7 @@ class AutoHandoff:
 
     def _get_system_status(self) -> Dict[str, Any]:
         """Get overall system status from database"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_db_connection(self.db_path, foreign_keys=False)
 
         # Count features by status
         features = conn.execute(
@@ -110,7 +111,7 @@ class AutoHandoff:
             }
 
         # Get active sessions from DB
-        conn = sqlite3.connect(self.db_path)
+        conn = get_db_connection(self.db_path, foreign_keys=False)
         active_session = conn.execute(
             """
             SELECT id, feature_id, started_at
@@ -135,7 +136,7 @@ class AutoHandoff:
         if not self._table_exists("workflow_state"):
             return {"error": "Workflow not initialized"}
 
-        conn = sqlite3.connect(self.db_path)
+        conn = get_db_connection(self.db_path, foreign_keys=False)
 
         workflows = conn.execute(
             """
@@ -155,7 +156,7 @@ class AutoHandoff:
 
     def _get_pending_work(self) -> Dict[str, Any]:
         """Get all pending work items"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_db_connection(self.db_path, foreign_keys=False)
 
         # Pending features
         pending_features = conn.execute(
@@ -341,7 +342,7 @@ class AutoHandoff:
 
     def _table_exists(self, table_name: str) -> bool:
         """Check if a table exists in the database"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_db_connection(self.db_path, foreign_keys=False)
         result = conn.execute(
             "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
             (table_name,),
@@ -478,7 +479,7 @@ class AutoHandoff:
                     return obj.isoformat()
                 return super().default(obj)
 
-        conn = sqlite3.connect(self.db_path)
+        conn = get_db_connection(self.db_path, foreign_keys=False)
 
         # Store in memory table
         conn.execute(
@@ -495,7 +496,7 @@ class AutoHandoff:
 
     def load_from_database(self) -> Dict[str, Any]:
         """Load last handoff from database"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_db_connection(self.db_path, foreign_keys=False)
 
         result = conn.execute("SELECT value FROM memory WHERE key = 'last_handoff'").fetchone()
 
@@ -518,7 +519,7 @@ class AutoHandoff:
         Returns:
             Handoff ID
         """
-        conn = sqlite3.connect(self.rfd.db_path)
+        conn = get_db_connection(self.rfd.db_path, foreign_keys=False)
 
         # Validate agent types
         valid_agents = ["coding", "review", "qa", "fix"]
@@ -556,7 +557,7 @@ class AutoHandoff:
         Returns:
             List of pending handoffs
         """
-        conn = sqlite3.connect(self.rfd.db_path)
+        conn = get_db_connection(self.rfd.db_path, foreign_keys=False)
 
         handoffs = conn.execute(
             """
@@ -583,7 +584,7 @@ class AutoHandoff:
             handoff_id: ID of handoff to complete
             result: Result status ('completed', 'failed', 'skipped')
         """
-        conn = sqlite3.connect(self.rfd.db_path)
+        conn = get_db_connection(self.rfd.db_path, foreign_keys=False)
 
         conn.execute(
             """
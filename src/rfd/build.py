@@ -3,8 +3,85 @@ Build Engine for RFD
 Handles compilation, setup, and build processes
 """
 
+import hashlib
+import json
+import os
 import subprocess
-from typing import Any, Dict, Optional
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .build_steps import BuildGraph, BuildStep
+from .byte_compile import ByteCompiler
+from .db_utils import get_db_connection
+from .service import ServiceSupervisor
+from .streaming import run_streaming
+from .test_selection import DOC_SUFFIXES, Selection, TestSelector, is_test_file
+from .test_reports import FAILED, TestCase, parse_jest_json, parse_junit, record_run
+from .test_shards import DurationHistory, ShardResult, measured_durations, plan_shards, run_shards, shard_passed
+
+# Bump when detection changes - older cached toolchains are re-detected
+TOOLCHAIN_CACHE_VERSION = 1
+
+# Files that decide the stack and test runner - detection is redone only when one of them changes
+MANIFEST_FILES = (
+    "pyproject.toml",
+    "setup.py",
+    "setup.cfg",
+    "requirements.txt",
+    "tox.ini",
+    "pytest.ini",
+    "manage.py",
+    "package.json",
+    "go.mod",
+    "Cargo.toml",
+    "pom.xml",
+    "build.gradle",
+    "build.gradle.kts",
+    "Gemfile",
+)
+
+PROBE_TIMEOUT = 5
+
+# Bump when the stored test outcome changes shape
+TEST_CACHE_VERSION = 1
+
+# Runners that accept a list of test files, so affected-test selection can narrow them
+SELECTIVE_RUNNERS = ("pytest", "unittest")
+
+# Unit used for timing runners whose suite can't be split (npm, cargo, ...)
+WHOLE_SUITE = "*"
+
+# (probe command, runner, manifests that make the probe worthwhile - empty means always), in priority order
+TEST_RUNNER_PROBES: List[Tuple[List[str], str, Tuple[str, ...]]] = [
+    # Python test runners
+    (["pytest", "--co", "-q"], "pytest", ()),  # --co = collect only, quick check
+    (["python", "-m", "pytest", "--co", "-q"], "pytest", ()),
+    (["python", "-m", "unittest", "discover", "-l"], "unittest", ()),
+    # JavaScript test runners
+    (["npm", "test", "--", "--listTests"], "jest", ("package.json",)),
+    (["yarn", "test", "--listTests"], "jest", ("package.json",)),
+    (["npm", "run", "test:unit"], "npm", ("package.json",)),
+    # Other languages
+    (["cargo", "test", "--", "--list"], "cargo", ("Cargo.toml",)),
+    (["go", "test", "./...", "-list=."], "go", ("go.mod",)),
+    (["mvn", "test", "-DskipTests"], "maven", ("pom.xml",)),
+    (["gradle", "test", "--dry-run"], "gradle", ("build.gradle", "build.gradle.kts")),
+]
+
+# Full test command for each detected runner
+TEST_COMMANDS = {
+    "pytest": ["pytest", "-v", "--tb=short"],
+    "unittest": ["python", "-m", "unittest", "discover"],
+    "jest": ["npm", "test"],
+    "npm": ["npm", "test"],
+    "cargo": ["cargo", "test"],
+    "go": ["go", "test", "./..."],
+    "maven": ["mvn", "test"],
+    "gradle": ["gradle", "test"],
+}
 
 
 class BuildEngine:
@@ -13,10 +90,25 @@ class BuildEngine:
         self.spec = rfd.load_project_spec()
         self.stack = self.spec.get("stack", {})
 
-    def get_status(self) -> Dict[str, Any]:
+        # Detected stack and test runner, persisted in .rfd/cache keyed on the manifest files
+        self.toolchain_path = Path(rfd.rfd_dir) / "cache" / "toolchain.json"
+        self._toolchain: Optional[Dict[str, Any]] = None
+
+        # Last test outcome, keyed on a fingerprint of the source tree
+        self.test_cache_path = Path(rfd.rfd_dir) / "cache" / "tests.json"
+
+        # Output of test runs, builds and compiles, streamed as it arrives
+        self.log_dir = Path(rfd.rfd_dir) / "logs"
+        self._selector: Optional[TestSelector] = None
+        self._service: Optional[ServiceSupervisor] = None
+
+    def get_status(
+        self, use_cache: bool = True, jobs: int = 1, echo: Optional[Callable[[str], None]] = None
+    ) -> Dict[str, Any]:
         """Get current build status"""
         # CRITICAL FIX: First check if tests pass (more important than service running)
-        test_result = self._check_tests()
+        # Always the whole suite - checkpoints record this, and the next affected selection diffs against them
+        test_result = self.check_tests(use_cache, affected=False, jobs=jobs, echo=echo)
         if test_result["passing"]:
             return test_result
 
@@ -29,10 +121,286 @@ class BuildEngine:
 
         return {"passing": False, "message": "No tests found and unknown stack"}
 
-    def detect_stack(self) -> Dict[str, str]:
-        """Detect the technology stack of the project"""
-        from pathlib import Path
+    def detect_stack(self, refresh: bool = False) -> Dict[str, str]:
+        """Detect the technology stack of the project (cached until a manifest file changes)"""
+        toolchain = self._load_toolchain(refresh)
+        if "stack" not in toolchain:
+            toolchain["stack"] = self._detect_stack()
+            self._save_toolchain()
+        return dict(toolchain["stack"])
+
+    def detect_test_runner(self, refresh: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        The project's test runner as {"runner": name, "command": [...]}, or None.
+
+        Detection probes every plausible runner concurrently and keeps the
+        highest-priority one that works; the answer is cached until a
+        manifest file changes.
+        """
+        toolchain = self._load_toolchain(refresh)
+        if "runner" not in toolchain:
+            toolchain["runner"] = self._probe_test_runners()
+            self._save_toolchain()
+        return dict(toolchain["runner"]) if toolchain["runner"] else None
+
+    def check_tests(
+        self,
+        use_cache: bool = True,
+        affected: bool = False,
+        jobs: int = 1,
+        echo: Optional[Callable[[str], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Whether the test suite passes.
+
+        The outcome of the last run is reused while the source tree is
+        unchanged; a reused result carries "cached": True and its "age" in
+        seconds. use_cache=False always runs the suite (and refreshes the cache).
+        With affected=True only the tests affected by changes since the last
+        passing checkpoint run, when the runner supports it; such a partial
+        outcome is only ever reused for another affected=True call. jobs > 1
+        shards the run over that many worker processes (0 = one per CPU). The
+        runner's output goes to .rfd/logs/tests-<n>.log, and to echo as it
+        arrives.
+        """
+        fingerprint = self._source_fingerprint()
+        if use_cache:
+            cached = self._load_test_cache()
+            # An affected-only run answers for the whole suite to nobody but another affected-only caller
+            if (
+                cached
+                and cached.get("fingerprint") == fingerprint
+                and (affected or cached["result"].get("selection", {}).get("scope", "full") == "full")
+            ):
+                result = dict(cached["result"])
+                age = max(time.time() - cached["recorded_at"], 0)
+                result.update(cached=True, age=age, message=f"{result['message']} - cached {format_age(age)} ago")
+                return result
+
+        detected = self.detect_test_runner()
+        selective = bool(detected) and detected["runner"] in SELECTIVE_RUNNERS
+        selection = self.select_tests() if affected and selective else Selection(None, "full run requested")
+
+        result = self._check_tests(selection.tests, jobs, echo)
+        cases = result.pop("cases", [])
+        # Only a completed run says anything about the tree - timeouts and missing runners are retried
+        if "runner" in result:
+            if "seconds" in result:
+                # Per-test history for `rfd perf tests`
+                record_run(
+                    self.rfd.db_path,
+                    result["runner"],
+                    cases,
+                    result["passing"],
+                    result["seconds"],
+                    scope="full" if selection.full else "affected",
+                    git_hash=self._git_head(),
+                    fingerprint=fingerprint,
+                )
+            result["selection"] = {
+                "scope": "full" if selection.full else "affected",
+                "tests": None if selection.full else len(selection.tests),
+                "reason": selection.reason,
+            }
+            if selective:
+                self.test_selector.record(selection)
+            self._save_test_cache(
+                {
+                    "version": TEST_CACHE_VERSION,
+                    "fingerprint": fingerprint,
+                    "recorded_at": time.time(),
+                    "recorded": datetime.now().isoformat(),
+                    "result": result,
+                }
+            )
+        return result
+
+    def _git_head(self) -> Optional[str]:
+        try:
+            result = subprocess.run(
+                ["git", "rev-parse", "HEAD"], cwd=self.rfd.root, capture_output=True, text=True, timeout=PROBE_TIMEOUT
+            )
+        except (OSError, subprocess.SubprocessError):
+            return None
+        return result.stdout.strip() if result.returncode == 0 else None
+
+    # -- affected-test selection -------------------------------------------
+
+    @property
+    def test_selector(self) -> TestSelector:
+        if self._selector is None:
+            self._selector = TestSelector(
+                self.rfd.root,
+                self.rfd.project_files.with_suffix(".py"),
+                Path(self.rfd.rfd_dir) / "cache" / "test_selection.json",
+            )
+        return self._selector
+
+    @property
+    def service(self) -> ServiceSupervisor:
+        """The project's long-lived dev service, shared by builds, checks and API validation"""
+        if self._service is None:
+            self._service = ServiceSupervisor(
+                self._get_start_command(),
+                self.rfd.root,
+                self._service_healthy,
+                self._service_fingerprint,
+                Path(self.rfd.rfd_dir) / "cache" / "service.json",
+                self.log_dir / "service.log",
+            )
+        return self._service
+
+    def select_tests(self) -> Selection:
+        """Test files affected by what changed since the last checkpoint whose build passed"""
+        return self.test_selector.select(self._changed_since_passing_checkpoint())
+
+    def _changed_since_passing_checkpoint(self) -> Optional[List[str]]:
+        conn = get_db_connection(self.rfd.db_path)
+        try:
+            row = conn.execute(
+                """
+                SELECT git_hash FROM checkpoints
+                WHERE build_passed = 1 AND git_hash IS NOT NULL AND git_hash NOT IN ('', 'no-git')
+                ORDER BY id DESC LIMIT 1
+            """
+            ).fetchone()
+        finally:
+            conn.close()
+        if not row:
+            return None
+        try:
+            return sorted(self.rfd.validator.changed_files_since(row[0]))
+        except ValueError:
+            return None
+
+    # -- test result cache -----------------------------------------------
+
+    def _source_fingerprint(self) -> str:
+        """
+        Hash of the test command and (path, mtime, size) of every project file.
+
+        The inventory is gitignore-aware inside a git work tree, so artifacts
+        the suite itself writes (.coverage, reports, caches) don't invalidate it.
+        """
+        detected = self.detect_test_runner()
+        return self._tree_fingerprint(detected["command"] if detected else None)
+
+    def _service_fingerprint(self) -> str:
+        """Like _source_fingerprint, but for what the service runs - tests and docs can change freely"""
+        return self._tree_fingerprint(
+            self._get_start_command(),
+            lambda rel: not (is_test_file(rel) or rel.startswith(("tests/", "test/")) or rel.endswith(DOC_SUFFIXES)),
+        )
+
+    def _tree_fingerprint(self, command: Any, include: Optional[Callable[[str], bool]] = None) -> str:
+        """Hash of command and (path, mtime, size) of the project files include accepts (default all)"""
+        from .project_files import ProjectFiles
+
+        inputs: List[Any] = [command]
+        for path in ProjectFiles(self.rfd.root, respect_gitignore=True).files():
+            rel = path.relative_to(self.rfd.root).as_posix()
+            if include is not None and not include(rel):
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            inputs.append((rel, stat.st_mtime_ns, stat.st_size))
+        return hashlib.sha1(json.dumps(inputs).encode()).hexdigest()
+
+    def _load_test_cache(self) -> Optional[Dict[str, Any]]:
+        try:
+            cached = json.loads(self.test_cache_path.read_text())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(cached, dict) or cached.get("version") != TEST_CACHE_VERSION:
+            return None
+        return cached
+
+    def _save_test_cache(self, entry: Dict[str, Any]) -> None:
+        try:
+            self.test_cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.test_cache_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(entry))
+            os.replace(tmp, self.test_cache_path)
+        except OSError:
+            pass  # caching is an optimisation - the tests themselves ran
+
+    # -- toolchain cache -----------------------------------------------
+
+    def _manifest_fingerprint(self) -> Dict[str, Optional[List[int]]]:
+        fingerprint = {}
+        for name in MANIFEST_FILES:
+            try:
+                stat = os.stat(self.rfd.root / name)
+                fingerprint[name] = [stat.st_mtime_ns, stat.st_size]
+            except OSError:
+                fingerprint[name] = None
+        return fingerprint
+
+    def _load_toolchain(self, refresh: bool = False) -> Dict[str, Any]:
+        """Cached detections for the current manifests - emptied when they changed"""
+        fingerprint = self._manifest_fingerprint()
+        if self._toolchain is None:
+            try:
+                self._toolchain = json.loads(self.toolchain_path.read_text())
+            except (OSError, ValueError):
+                self._toolchain = None
+
+        toolchain = self._toolchain
+        if (
+            refresh
+            or not isinstance(toolchain, dict)
+            or toolchain.get("version") != TOOLCHAIN_CACHE_VERSION
+            or toolchain.get("fingerprint") != fingerprint
+        ):
+            self._toolchain = {"version": TOOLCHAIN_CACHE_VERSION, "fingerprint": fingerprint}
+        return self._toolchain
+
+    def _save_toolchain(self) -> None:
+        try:
+            self.toolchain_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.toolchain_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(self._toolchain))
+            os.replace(tmp, self.toolchain_path)
+        except OSError:
+            pass  # caching is an optimisation - detection itself succeeded
+
+    def _probe_test_runners(self) -> Optional[Dict[str, Any]]:
+        """Start every relevant probe at once; the first working runner in priority order wins"""
+        root = self.rfd.root
+        probes = []
+        for cmd, runner, manifests in TEST_RUNNER_PROBES:
+            if manifests and not any((root / name).exists() for name in manifests):
+                continue
+            try:
+                process = subprocess.Popen(
+                    cmd, cwd=root, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+                )
+            except (FileNotFoundError, PermissionError):
+                continue
+            probes.append((process, runner))
 
+        deadline = time.monotonic() + PROBE_TIMEOUT
+        found = None
+        try:
+            for process, runner in probes:
+                try:
+                    returncode = process.wait(timeout=max(deadline - time.monotonic(), 0))
+                except subprocess.TimeoutExpired:
+                    continue
+                if returncode == 0:
+                    found = {"runner": runner, "command": TEST_COMMANDS[runner]}
+                    break
+        finally:
+            # Lower-priority probes still running are no longer needed
+            for process, _runner in probes:
+                if process.poll() is None:
+                    process.kill()
+                    process.wait()
+        return found
+
+    def _detect_stack(self) -> Dict[str, str]:
         stack = {}
 
         # Check for Python
@@ -40,7 +408,7 @@ class BuildEngine:
             stack["language"] = "python"
             if Path("manage.py").exists():
                 stack["framework"] = "django"
-            elif any(Path(".").glob("**/main.py")):
+            elif self.rfd.project_files.matching("main.py"):
                 # Check for FastAPI
                 try:
                     if Path("requirements.txt").exists():
@@ -98,8 +466,8 @@ class BuildEngine:
 
         return stack
 
-    def run_tests(self) -> Dict[str, Any]:
-        """Run tests for the current project"""
+    def run_tests(self, affected: bool = False) -> Dict[str, Any]:
+        """Run tests for the current project (affected=True: only tests touched by recent changes)"""
         # Detect stack dynamically if not in spec
         language = self.stack.get("language", "")
         if not language:
@@ -107,7 +475,14 @@ class BuildEngine:
             language = detected_stack.get("language", "")
 
         if language == "python":
-            return self._run_python_tests()
+            if not affected:
+                return self._run_python_tests()
+            selection = self.select_tests()
+            result = self._run_python_tests(selection.tests)
+            if "success" in result and "message" not in result:
+                self.test_selector.record(selection)
+            result["selection"] = selection.reason
+            return result
         elif language in ["javascript", "typescript"]:
             return self._run_javascript_tests()
         elif language == "go":
@@ -117,29 +492,21 @@ class BuildEngine:
 
         return {"success": False, "message": f"No test runner for {language}"}
 
-    def _run_python_tests(self) -> Dict[str, Any]:
-        """Run Python tests"""
-        import subprocess
+    def _run_python_tests(self, tests: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Run Python tests (all of them, or just the given test files)"""
+        if tests is not None and not tests:
+            return {"success": True, "output": "No tests affected by the changes", "errors": ""}
+        tests = tests or []
 
         # Try pytest first
         try:
-            result = subprocess.run(["pytest"], capture_output=True, text=True)
-            return {
-                "success": result.returncode == 0,
-                "output": result.stdout,
-                "errors": result.stderr,
-            }
+            return self._stream_tests(["pytest", *tests])
         except FileNotFoundError:
             pass
 
         # Try unittest
         try:
-            result = subprocess.run(["python", "-m", "unittest"], capture_output=True, text=True)
-            return {
-                "success": result.returncode == 0,
-                "output": result.stdout,
-                "errors": result.stderr,
-            }
+            return self._stream_tests(["python", "-m", "unittest", *tests])
         except Exception:
             pass
 
@@ -147,46 +514,35 @@ class BuildEngine:
 
     def _run_javascript_tests(self) -> Dict[str, Any]:
         """Run JavaScript tests"""
-        import subprocess
-
         try:
-            result = subprocess.run(["npm", "test"], capture_output=True, text=True)
-            return {
-                "success": result.returncode == 0,
-                "output": result.stdout,
-                "errors": result.stderr,
-            }
+            return self._stream_tests(["npm", "test"])
         except Exception:
             return {"success": False, "message": "npm test failed"}
 
     def _run_go_tests(self) -> Dict[str, Any]:
         """Run Go tests"""
-        import subprocess
-
         try:
-            result = subprocess.run(["go", "test", "./..."], capture_output=True, text=True)
-            return {
-                "success": result.returncode == 0,
-                "output": result.stdout,
-                "errors": result.stderr,
-            }
+            return self._stream_tests(["go", "test", "./..."])
         except Exception:
             return {"success": False, "message": "go test failed"}
 
     def _run_rust_tests(self) -> Dict[str, Any]:
         """Run Rust tests"""
-        import subprocess
-
         try:
-            result = subprocess.run(["cargo", "test"], capture_output=True, text=True)
-            return {
-                "success": result.returncode == 0,
-                "output": result.stdout,
-                "errors": result.stderr,
-            }
+            return self._stream_tests(["cargo", "test"])
         except Exception:
             return {"success": False, "message": "cargo test failed"}
 
+    def _stream_tests(self, command: List[str]) -> Dict[str, Any]:
+        """Run a test command with its output shown live; output/errors hold only the tail (the rest is in the log)"""
+        result = run_streaming(command, cwd=self.rfd.root, log_path=self.log_dir / "tests.log", echo=print)
+        return {
+            "success": result.returncode == 0,
+            "output": result.output,
+            "errors": result.errors,
+            "log": str(result.log),
+        }
+
     def compile(self) -> Dict[str, Any]:
         """Compile the current project"""
         language = self.stack.get("language", "")
@@ -223,55 +579,99 @@ class BuildEngine:
 
     def _build_python(self, feature: Dict) -> bool:
         """Python-specific build process"""
-        steps = [
+        steps = []
+        if (self.rfd.root / "requirements.txt").exists():
             # Install dependencies
-            ("Installing dependencies", ["pip", "install", "-r", "requirements.txt"]),
-            # Run formatters (if available)
-            ("Formatting code", ["python", "-m", "black", "."]),
+            steps.append(
+                BuildStep(
+                    "install",
+                    "Installing dependencies",
+                    ["pip", "install", "-r", "requirements.txt"],
+                    inputs=("requirements.txt",),
+                    timeout=600,
+                )
+            )
+        needs = ("install",) if steps else ()
+        steps += [
+            # Check formatting (if available) - reported, but doesn't fail the build
+            BuildStep(
+                "format",
+                "Checking formatting",
+                ["python", "-m", "black", "--check", "."],
+                needs=needs,
+                inputs=("*.py", "pyproject.toml"),
+                required=False,
+            ),
             # Run linters (if available)
-            ("Linting", ["python", "-m", "flake8", "."]),
+            BuildStep(
+                "lint",
+                "Linting",
+                ["python", "-m", "flake8", "."],
+                needs=needs,
+                inputs=("*.py", "setup.cfg", "tox.ini", ".flake8"),
+            ),
             # Type checking disabled for now - not critical for CLI refactor
-            # ("Type checking", ["python", "-m", "mypy", "."]),
-            # Start service
-            ("Starting service", self._get_start_command()),
+            # BuildStep("typecheck", "Type checking", ["python", "-m", "mypy", "."], needs=needs, inputs=("*.py",)),
         ]
-
-        for step_name, cmd in steps:
-            if not cmd:  # Skip empty commands
-                continue
-            print(f"→ {step_name}")
-            try:
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-                if result.returncode != 0:
-                    print(f"❌ {step_name} failed:")
-                    print(result.stderr)
-                    return False
-                print(f"✅ {step_name}")
-            except (subprocess.TimeoutExpired, FileNotFoundError):
-                print(f"⚠️ {step_name} skipped (tool not available)")
-
-        return True
+        return self._run_build_steps(steps) and self._start_service()
 
     def _build_javascript(self, feature: Dict) -> bool:
         """JavaScript-specific build process"""
+        sources = ("*.js", "*.jsx", "*.ts", "*.tsx", "*.json", "*.css")
         steps = [
-            ("Installing dependencies", ["npm", "install"]),
-            ("Running build", ["npm", "run", "build"]),
-            ("Starting service", ["npm", "start"]),
+            BuildStep(
+                "install",
+                "Installing dependencies",
+                ["npm", "install"],
+                inputs=("package.json", "package-lock.json", "npm-shrinkwrap.json"),
+                outputs=("node_modules",),
+                timeout=600,
+            ),
+            BuildStep(
+                "build", "Running build", ["npm", "run", "build"], needs=("install",), inputs=sources, timeout=300
+            ),
         ]
-
-        for step_name, cmd in steps:
-            print(f"→ {step_name}")
-            try:
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
-                if result.returncode != 0:
-                    print(f"❌ {step_name} failed:")
-                    print(result.stderr)
-                    return False
-                print(f"✅ {step_name}")
-            except (subprocess.TimeoutExpired, FileNotFoundError):
-                print(f"⚠️ {step_name} skipped")
-
+        return self._run_build_steps(steps) and self._start_service()
+
+    def _run_build_steps(self, steps: List[BuildStep]) -> bool:
+        """Run steps as a DAG - independent ones concurrently, unchanged ones skipped"""
+        graph = BuildGraph(
+            self.rfd.root,
+            steps,
+            self.rfd.project_files,
+            Path(self.rfd.rfd_dir) / "cache" / "build_steps.json",
+            log_dir=self.log_dir,
+        )
+        results = graph.run()
+        return graph.succeeded(results, steps)
+
+    def _start_service(self) -> bool:
+        """
+        Start the service - or leave it running when its sources haven't changed
+        since it started. It is only kept running while a session is active.
+        """
+        if not self._get_start_command():
+            return True
+        print("→ Starting service")
+        try:
+            service = self.service.ensure()
+        except OSError:
+            print("⚠️ Starting service skipped (tool not available)")
+            return True
+        except RuntimeError as e:
+            if "api_contract" not in self.spec:
+                # Without a contract the probe only guesses the framework's default address
+                print(f"⚠️ Starting service skipped: {e} (output in {self.log_dir / 'service.log'})")
+                return True
+            print(f"❌ Starting service failed: {e} (output in {self.log_dir / 'service.log'})")
+            return False
+        if not service["started"]:
+            print(f"✅ Service {service['reason']}")
+        else:
+            print(f"✅ Service started in {service['cold_start']:.1f}s ({service['reason']})")
+            if not self.rfd.session.get_current():
+                self.service.stop()
+                print("   Stopped again - it is only kept running while a session is active")
         return True
 
     def _get_start_command(self) -> list:
@@ -293,139 +693,234 @@ class BuildEngine:
             return ["python", "app.py"]
         elif self.stack.get("framework") == "django":
             return ["python", "manage.py", "runserver"]
+        elif self.stack.get("language") in ["javascript", "typescript"]:
+            return ["npm", "start"]
         # Add more frameworks
         return []
 
-    def _check_fastapi(self) -> Dict[str, Any]:
-        """Check if FastAPI service is running"""
+    def _service_url(self) -> str:
+        """The contract's base URL, or the framework's default dev server address"""
+        if self.stack.get("framework") == "flask":
+            default = "http://localhost:5000"
+        elif self.stack.get("language") in ["javascript", "typescript"]:
+            default = "http://localhost:3000"
+        else:
+            default = "http://localhost:8000"
+        return self.spec.get("api_contract", {}).get("base_url", default)
+
+    def _service_healthy(self) -> bool:
+        """One health probe: the contract's health check, or any HTTP answer when there is no contract"""
         try:
             import requests
 
-            base_url = self.spec.get("api_contract", {}).get("base_url", "http://localhost:8000")
-            health = self.spec.get("api_contract", {}).get("health_check", "/health")
-
-            r = requests.get(f"{base_url}{health}", timeout=2)
-            return {
-                "passing": r.status_code == 200,
-                "message": f"Service responding at {base_url}",
-            }
+            if "api_contract" not in self.spec:
+                requests.get(self._service_url(), timeout=2)
+                return True
+            health = self.spec["api_contract"].get("health_check", "/health")
+            return requests.get(f"{self._service_url()}{health}", timeout=2).status_code == 200
         except Exception:
-            return {"passing": False, "message": "Service not running"}
+            return False
+
+    def _check_fastapi(self) -> Dict[str, Any]:
+        """Check if FastAPI service is running"""
+        return self._check_service()
 
     def _check_express(self) -> Dict[str, Any]:
         """Check if Express service is running"""
-        try:
-            import requests
-
-            base_url = self.spec.get("api_contract", {}).get("base_url", "http://localhost:3000")
-            health = self.spec.get("api_contract", {}).get("health_check", "/health")
+        return self._check_service()
+
+    def _check_service(self) -> Dict[str, Any]:
+        # A managed service that is still booting is waited for rather than reported down
+        if self.service.check():
+            return {"passing": True, "message": f"Service responding at {self._service_url()}"}
+        return {"passing": False, "message": "Service not running"}
+
+    def _check_tests(
+        self, tests: Optional[List[str]] = None, jobs: int = 1, echo: Optional[Callable[[str], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Check if tests pass by running appropriate test command (optionally just some test files).
+
+        With jobs > 1 the suite is split into balanced shards (test files, go
+        packages) run as concurrent processes. Every run - sharded or not -
+        records per-unit durations, which balance the shards and scale each
+        shard's timeout to the work it is expected to do.
+        """
+        detected = self.detect_test_runner()
+        if not detected:
+            # No test runner found
+            return {
+                "passing": False,
+                "message": "No test runner detected (pytest, npm test, cargo test, etc.)",
+            }
 
-            r = requests.get(f"{base_url}{health}", timeout=2)
+        runner = label = detected["runner"]
+        if tests is not None:
+            if not tests:
+                return {"passing": True, "message": f"No tests affected by the changes ({runner})", "runner": runner}
+            label = f"{runner}, {len(tests)} affected test file(s)"
+
+        if jobs <= 0:
+            jobs = os.cpu_count() or 1
+        history = DurationHistory(Path(self.rfd.rfd_dir) / "cache" / "test_durations.json", runner)
+        units = self._test_units(runner, tests)
+        shards = plan_shards(units, history, jobs) if units else [[WHOLE_SUITE]]
+        if len(shards) > 1:
+            label = f"{label}, {len(shards)} shards"
+
+        with tempfile.TemporaryDirectory(prefix="rfd-tests-") as reports:
+            explicit = tests is not None or len(shards) > 1
+            commands = [
+                self._shard_command(runner, detected["command"], shard if explicit else None, reports, index)
+                for index, shard in enumerate(shards)
+            ]
+            try:
+                # Run the actual tests
+                results = run_shards(
+                    commands,
+                    shards,
+                    [sum(history.estimate(unit) for unit in shard) for shard in shards],
+                    self.rfd.root,
+                    runner=runner,
+                    log_dir=self.log_dir,
+                    echo=echo,
+                )
+            except OSError:
+                return {"passing": False, "message": f"Test runner unavailable ({label})"}
+
+            cases: List[TestCase] = []
+            measured: Dict[str, float] = {}
+            for result in results:
+                shard_cases = self._read_report(runner, result, reports)
+                cases.extend(shard_cases)
+                measured.update(measured_durations(runner, result, shard_cases))
+            history.update(measured)
+
+        timing = {
+            "seconds": round(max(result.seconds for result in results), 2),
+            "shards": [
+                {
+                    "index": result.index,
+                    "units": len(result.units) if units else None,
+                    "seconds": round(result.seconds, 2),
+                    "estimate": round(result.estimate, 2),
+                    "passed": shard_passed(runner, result),
+                    "timed_out": result.timed_out,
+                }
+                for result in results
+            ],
+        }
+        if any(result.timed_out for result in results):
+            # Not a verdict on the tree - the next run gets a longer timeout
+            return {"passing": False, "message": f"Tests timed out ({label})", **timing}
+
+        # Per-test outcomes from the runner's report; popped off and stored by check_tests
+        timing["cases"] = cases
+        failed = sum(1 for case in cases if case.outcome == FAILED)
+        if all(shard_passed(runner, result) for result in results):
+            # Parse output to get test count if possible
+            output = "".join(result.output for result in results)
+            if cases:
+                return {
+                    "passing": True,
+                    "message": f"All {len(cases)} tests passing ({label})",
+                    "runner": runner,
+                    **timing,
+                }
+            elif "passed" in output.lower():
+                return {
+                    "passing": True,
+                    "message": f"All tests passing ({label})",
+                    "runner": runner,
+                    **timing,
+                }
+            else:
+                return {
+                    "passing": True,
+                    "message": f"Tests completed successfully ({label})",
+                    "runner": runner,
+                    **timing,
+                }
+        else:
+            # Tests failed
+            if failed:
+                label = f"{failed} of {len(cases)}, {label}"
             return {
-                "passing": r.status_code == 200,
-                "message": f"Service responding at {base_url}",
+                "passing": False,
+                "message": f"Tests failing ({label})",
+                "runner": runner,
+                **timing,
             }
-        except Exception:
-            return {"passing": False, "message": "Service not running"}
-
-    def _check_tests(self) -> Dict[str, Any]:
-        """Check if tests pass by running appropriate test command"""
-        # Detect test framework based on files present
-        test_commands = [
-            # Python test runners
-            (["pytest", "--co", "-q"], "pytest"),  # --co = collect only, quick check
-            (["python", "-m", "pytest", "--co", "-q"], "pytest"),
-            (["python", "-m", "unittest", "discover", "-l"], "unittest"),
-            # JavaScript test runners
-            (["npm", "test", "--", "--listTests"], "jest"),
-            (["yarn", "test", "--listTests"], "jest"),
-            (["npm", "run", "test:unit"], "npm"),
-            # Other languages
-            (["cargo", "test", "--", "--list"], "cargo"),
-            (["go", "test", "./...", "-list=."], "go"),
-            (["mvn", "test", "-DskipTests"], "maven"),
-            (["gradle", "test", "--dry-run"], "gradle"),
-        ]
 
-        # Try to find and run test command
-        for cmd, runner in test_commands:
+    def _read_report(self, runner: str, result: ShardResult, reports: str) -> List[TestCase]:
+        """Per-test outcomes from the machine-readable output _shard_command asked the runner for"""
+        if runner == "pytest":
+            return list(parse_junit(Path(reports) / f"{result.index}.xml"))
+        if runner in ("go", "cargo"):
+            # Parsed while the output streamed - it isn't kept in memory
+            return list(result.cases)
+        if runner == "jest":
+            return list(parse_jest_json(Path(reports) / f"{result.index}.json", Path(self.rfd.root)))
+        return []
+
+    def _test_units(self, runner: str, tests: Optional[List[str]]) -> List[str]:
+        """What a suite can be split into: test files for Python runners, packages for go"""
+        if runner in SELECTIVE_RUNNERS:
+            if tests is not None:
+                return list(tests)
+            root = self.rfd.root
+            return [
+                path.relative_to(root).as_posix()
+                for path in self.rfd.project_files.with_suffix(".py")
+                if is_test_file(path.name)
+            ]
+        if runner == "go":
             try:
-                # First check if test runner exists
-                check_result = subprocess.run(cmd, capture_output=True, text=True, timeout=5, cwd=self.rfd.root)
-
-                if check_result.returncode == 0:
-                    # Test runner found, now run actual tests
-                    if runner == "pytest":
-                        test_cmd = ["pytest", "-v", "--tb=short"]
-                    elif runner == "unittest":
-                        test_cmd = ["python", "-m", "unittest", "discover"]
-                    elif runner in ["jest", "npm"]:
-                        test_cmd = ["npm", "test"]
-                    elif runner == "cargo":
-                        test_cmd = ["cargo", "test"]
-                    elif runner == "go":
-                        test_cmd = ["go", "test", "./..."]
-                    elif runner == "maven":
-                        test_cmd = ["mvn", "test"]
-                    elif runner == "gradle":
-                        test_cmd = ["gradle", "test"]
-                    else:
-                        continue
-
-                    # Run the actual tests
-                    test_result = subprocess.run(
-                        test_cmd,
-                        capture_output=True,
-                        text=True,
-                        timeout=30,
-                        cwd=self.rfd.root,
-                    )
-
-                    if test_result.returncode == 0:
-                        # Parse output to get test count if possible
-                        output = test_result.stdout
-                        if "passed" in output.lower():
-                            return {
-                                "passing": True,
-                                "message": f"All tests passing ({runner})",
-                            }
-                        else:
-                            return {
-                                "passing": True,
-                                "message": f"Tests completed successfully ({runner})",
-                            }
-                    else:
-                        # Tests failed
-                        return {
-                            "passing": False,
-                            "message": f"Tests failing ({runner})",
-                        }
-
-            except (subprocess.TimeoutExpired, FileNotFoundError, Exception):
-                continue
+                result = subprocess.run(
+                    ["go", "list", "./..."], cwd=self.rfd.root, capture_output=True, text=True, timeout=PROBE_TIMEOUT
+                )
+            except (OSError, subprocess.SubprocessError):
+                return []
+            return result.stdout.split() if result.returncode == 0 else []
+        return []
 
-        # No test runner found
-        return {
-            "passing": False,
-            "message": "No test runner detected (pytest, npm test, cargo test, etc.)",
-        }
+    @staticmethod
+    def _shard_command(
+        runner: str, command: List[str], units: Optional[List[str]], reports: str, index: int
+    ) -> List[str]:
+        """
+        The runner's command restricted to units (None = its usual full run),
+        asking for a machine-readable report of per-test outcomes and durations
+        """
+        if runner == "pytest":
+            return [*command, f"--junitxml={os.path.join(reports, f'{index}.xml')}", *(units or [])]
+        if runner == "jest":
+            return [*command, "--", "--json", f"--outputFile={os.path.join(reports, f'{index}.json')}"]
+        if runner == "go":
+            # go test -json streams one event per line on stdout
+            return ["go", "test", "-json", *(units if units is not None else command[2:])]
+        if units is None:
+            return list(command)
+        if runner == "unittest":
+            # unittest takes test files directly once "discover" is dropped
+            return [arg for arg in command if arg != "discover"] + units
+        return list(command)
 
     def _compile_python(self) -> Dict[str, Any]:
-        """Compile Python code (syntax check)"""
-        try:
-            result = subprocess.run(
-                ["python", "-m", "py_compile", "*.py"],
-                capture_output=True,
-                text=True,
-                shell=True,
-                timeout=30,
-            )
+        """Compile Python code (syntax check) - only files changed since the last clean compile"""
+        compiler = ByteCompiler(self.rfd.root, Path(self.rfd.rfd_dir) / "cache" / "compile.json")
+        report = compiler.compile(self.rfd.project_files.with_suffix(".py"))
+        errors = report["errors"]
+        if errors:
             return {
-                "success": result.returncode == 0,
-                "message": ("Python syntax check passed" if result.returncode == 0 else result.stderr),
+                "success": False,
+                "message": "\n".join(str(error) for error in errors),
+                "errors": [error._asdict() for error in errors],
             }
-        except Exception as e:
-            return {"success": False, "message": str(e)}
+        return {
+            "success": True,
+            "message": f"Python syntax check passed ({report['checked']} files, {report['compiled']} recompiled)",
+        }
 
     def _compile_javascript(self) -> Dict[str, Any]:
         """Build JavaScript/TypeScript project"""
@@ -442,10 +937,12 @@ class BuildEngine:
     def _compile_go(self) -> Dict[str, Any]:
         """Compile Go code"""
         try:
-            result = subprocess.run(["go", "build", "."], capture_output=True, text=True, timeout=30)
+            result = run_streaming(
+                ["go", "build", "."], cwd=self.rfd.root, log_path=self.log_dir / "compile.log", timeout=30
+            )
             return {
                 "success": result.returncode == 0,
-                "message": ("Go build successful" if result.returncode == 0 else result.stderr),
+                "message": ("Go build successful" if result.returncode == 0 else result.errors),
             }
         except Exception as e:
             return {"success": False, "message": str(e)}
@@ -453,10 +950,12 @@ class BuildEngine:
     def _compile_rust(self) -> Dict[str, Any]:
         """Compile Rust code"""
         try:
-            result = subprocess.run(["cargo", "build"], capture_output=True, text=True, timeout=60)
+            result = run_streaming(
+                ["cargo", "build"], cwd=self.rfd.root, log_path=self.log_dir / "compile.log", timeout=60
+            )
             return {
                 "success": result.returncode == 0,
-                "message": ("Rust build successful" if result.returncode == 0 else result.stderr),
+                "message": ("Rust build successful" if result.returncode == 0 else result.errors),
             }
         except Exception as e:
             return {"success": False, "message": str(e)}
@@ -484,3 +983,11 @@ class BuildEngine:
             if f["id"] == feature_id:
                 return f
         return None
+
+
+def format_age(seconds: float) -> str:
+    """Short human form of a duration: 42s, 5m, 3h, 2d"""
+    for unit, size in (("d", 86400), ("h", 3600), ("m", 60)):
+        if seconds >= size:
+            return f"{int(seconds // size)}{unit}"
+    return f"{int(seconds)}s"
@@ -0,0 +1,259 @@
+"""
+Build step scheduling for RFD
+Build steps form a DAG with declared inputs and outputs: independent steps run
+concurrently, and a step whose inputs hash the same as at its last successful
+run (with its outputs still present) is skipped
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from .streaming import run_streaming
+
+# Bump when the input hash changes meaning - older records are ignored
+STEP_CACHE_VERSION = 1
+
+# Durations kept per step, newest last
+_HISTORY = 10
+
+# A step's timeout grows to this multiple of its slowest recent run
+_TIMEOUT_FACTOR = 3
+
+OK = "ok"
+FAILED = "failed"
+UNCHANGED = "unchanged"
+UNAVAILABLE = "unavailable"
+TIMED_OUT = "timed out"
+BLOCKED = "blocked"
+
+
+class BuildStep(NamedTuple):
+    """
+    One build step.
+
+    inputs are project-relative files ("requirements.txt", hashed by content)
+    or suffix globs ("*.py", every such project file, hashed by mtime and
+    size). A step without inputs, or with cacheable=False, always runs.
+    A failing step with required=False is reported but doesn't stop the build.
+    """
+
+    name: str
+    label: str
+    command: List[str]
+    needs: Tuple[str, ...] = ()
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    cacheable: bool = True
+    required: bool = True
+    timeout: float = 120
+
+
+class StepResult(NamedTuple):
+    name: str
+    status: str
+    seconds: float = 0.0
+    detail: str = ""
+
+
+class BuildGraph:
+    """
+    Runs BuildSteps in dependency order, each as soon as everything it needs
+    has succeeded. Input hashes and durations of successful runs are kept in
+    .rfd/cache/build_steps.json; each step's output streams to
+    log_dir/build-<step>.log, with only its tail kept for the report.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        steps: List[BuildStep],
+        project_files,
+        cache_path: Optional[Path] = None,
+        log_dir: Optional[Path] = None,
+    ):
+        self.root = Path(root)
+        self.steps = {step.name: step for step in steps}
+        self.project_files = project_files
+        self.cache_path = cache_path
+        self.log_dir = log_dir
+        self._cache: Optional[Dict[str, Any]] = None
+
+        for step in steps:
+            for need in step.needs:
+                if need not in self.steps:
+                    raise ValueError(f"Build step {step.name} needs unknown step {need}")
+
+    def run(self, echo: Callable[[str], None] = print) -> Dict[str, StepResult]:
+        """Run the graph; returns every step's result (steps behind a failed one are BLOCKED)"""
+        results: Dict[str, StepResult] = {}
+        pending = dict(self.steps)
+        running: Dict[Future, BuildStep] = {}
+        failed = False
+        self._load_cache()  # before any worker thread reads it
+
+        with ThreadPoolExecutor(max_workers=max(len(self.steps), 1), thread_name_prefix="rfd-build") as pool:
+            while pending or running:
+                # Settling one step (blocked, unchanged) can make others ready - scan until nothing moves
+                progressed = not failed
+                while progressed:
+                    progressed = False
+                    for name, step in list(pending.items()):
+                        if any(need not in results for need in step.needs):
+                            continue
+                        del pending[name]
+                        progressed = True
+                        if any(self._stops_dependents(results[need]) for need in step.needs):
+                            results[name] = StepResult(name, BLOCKED)
+                            continue
+                        inputs = self._inputs_hash(step)
+                        # A step that just ran upstream (e.g. a fresh install) can change this one's outcome
+                        if self._unchanged(step, inputs) and all(results[n].status != OK for n in step.needs):
+                            results[name] = StepResult(name, UNCHANGED)
+                            echo(f"⏭️  {step.label} (unchanged)")
+                            continue
+                        echo(f"→ {step.label}")
+                        running[pool.submit(self._run_step, step, inputs)] = step
+
+                if not running:
+                    # Nothing left can start
+                    for name in pending:
+                        results[name] = StepResult(name, BLOCKED)
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step = running.pop(future)
+                    result = future.result()
+                    results[step.name] = result
+                    self._report(step, result, echo)
+                    if result.status == FAILED and step.required:
+                        # Let running steps finish, but start nothing new
+                        failed = True
+
+        self._save_cache()
+        return results
+
+    @staticmethod
+    def succeeded(results: Dict[str, StepResult], steps: List[BuildStep]) -> bool:
+        required = {step.name for step in steps if step.required}
+        return not any(result.status in (FAILED, BLOCKED) for name, result in results.items() if name in required)
+
+    def _stops_dependents(self, result: StepResult) -> bool:
+        return result.status == BLOCKED or (result.status == FAILED and self.steps[result.name].required)
+
+    def _run_step(self, step: BuildStep, inputs: Optional[str]) -> StepResult:
+        start = time.monotonic()
+        try:
+            result = run_streaming(
+                step.command,
+                cwd=self.root,
+                log_path=self.log_dir / f"build-{step.name}.log" if self.log_dir is not None else None,
+                timeout=self._timeout(step),
+            )
+        except FileNotFoundError:
+            return StepResult(step.name, UNAVAILABLE, time.monotonic() - start)
+        if result.timed_out:
+            return StepResult(step.name, TIMED_OUT, result.seconds)
+
+        if result.returncode != 0:
+            if step.command[1:2] == ["-m"] and f"No module named {step.command[2]}" in result.errors:
+                # python -m <tool> with the tool not installed
+                return StepResult(step.name, UNAVAILABLE, result.seconds)
+            detail = result.errors or result.output
+            if result.log is not None:
+                detail = f"{detail.rstrip()}\n(full output: {result.log})"
+            return StepResult(step.name, FAILED, result.seconds, detail)
+        self._record(step, inputs, result.seconds)
+        return StepResult(step.name, OK, result.seconds)
+
+    @staticmethod
+    def _report(step: BuildStep, result: StepResult, echo: Callable[[str], None]) -> None:
+        if result.status == OK:
+            echo(f"✅ {step.label} ({result.seconds:.1f}s)")
+        elif result.status == FAILED:
+            icon = "❌" if step.required else "⚠️"
+            echo(f"{icon} {step.label} failed:")
+            echo(result.detail)
+        elif result.status == TIMED_OUT:
+            echo(f"⚠️ {step.label} skipped (timed out after {result.seconds:.0f}s)")
+        else:
+            echo(f"⚠️ {step.label} skipped (tool not available)")
+
+    def _timeout(self, step: BuildStep) -> float:
+        history = self._load_cache()["steps"].get(step.name, {}).get("history", [])
+        return max(step.timeout, _TIMEOUT_FACTOR * max(history, default=0))
+
+    # -- skip-if-unchanged -----------------------------------------------
+
+    def _inputs_hash(self, step: BuildStep) -> Optional[str]:
+        if not step.cacheable or not step.inputs:
+            return None
+        digest = hashlib.sha1()
+        # The resolved tool matters too - a different virtualenv needs its own install
+        digest.update(json.dumps([step.command, shutil.which(step.command[0]) if step.command else None]).encode())
+        for pattern in step.inputs:
+            if pattern.startswith("*."):
+                for path in self.project_files.with_suffix(pattern[1:]):
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    digest.update(f"{path}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode())
+            else:
+                try:
+                    content = (self.root / pattern).read_bytes()
+                except OSError:
+                    content = b"<missing>"
+                digest.update(pattern.encode() + b"\0" + hashlib.sha1(content).digest())
+        return digest.hexdigest()
+
+    def _unchanged(self, step: BuildStep, inputs: Optional[str]) -> bool:
+        if inputs is None:
+            return False
+        record = self._load_cache()["steps"].get(step.name)
+        if not record or record.get("inputs") != inputs:
+            return False
+        return all((self.root / output).exists() for output in step.outputs)
+
+    def _record(self, step: BuildStep, inputs: Optional[str], seconds: float) -> None:
+        # Only called from worker threads for distinct steps - each touches its own key
+        steps = self._load_cache()["steps"]
+        record = steps.get(step.name, {})
+        steps[step.name] = {
+            "inputs": inputs,
+            "seconds": round(seconds, 3),
+            "finished_at": datetime.now().isoformat(),
+            "history": (record.get("history", []) + [round(seconds, 3)])[-_HISTORY:],
+        }
+
+    def _load_cache(self) -> Dict[str, Any]:
+        if self._cache is None:
+            cache = None
+            if self.cache_path is not None:
+                try:
+                    cache = json.loads(self.cache_path.read_text())
+                except (OSError, ValueError):
+                    cache = None
+            if not isinstance(cache, dict) or cache.get("version") != STEP_CACHE_VERSION:
+                cache = {"version": STEP_CACHE_VERSION}
+            cache.setdefault("steps", {})
+            self._cache = cache
+        return self._cache
+
+    def _save_cache(self) -> None:
+        if self.cache_path is None or self._cache is None:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(self._cache))
+            os.replace(tmp, self.cache_path)
+        except OSError:
+            pass  # caching is an optimisation - the build itself ran
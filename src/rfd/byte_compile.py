@@ -0,0 +1,124 @@
+"""
+Incremental byte-compilation for RFD
+Compiles a project's Python files on a process pool, skipping files whose
+mtime and size match their last successful compile, and reports syntax
+errors with their locations
+"""
+
+import importlib.util
+import json
+import os
+import py_compile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+# Bump when the cached entries change meaning
+COMPILE_CACHE_VERSION = 1
+
+# Below this many files they are compiled in-process - worker start-up would cost more
+_POOL_MIN_FILES = 8
+
+
+class SyntaxProblem(NamedTuple):
+    file: str
+    line: int
+    column: int
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.file}:{self.line}:{self.column}: {self.message}"
+
+
+def _compile_one(path: str) -> Optional[List[Any]]:
+    """[line, column, message] for a file that doesn't compile, else None"""
+    try:
+        py_compile.compile(path, doraise=True)
+    except py_compile.PyCompileError as e:
+        error = e.exc_value
+        if isinstance(error, SyntaxError):
+            return [error.lineno or 0, error.offset or 0, error.msg]
+        return [0, 0, f"{e.exc_type_name}: {error}"]
+    except OSError as e:
+        return [0, 0, str(e)]
+    return None
+
+
+class ByteCompiler:
+    """
+    Byte-compiles Python files (writing __pycache__ as py_compile does).
+
+    Successful compiles are remembered per file by (mtime, size) in
+    .rfd/cache/compile.json, keyed to the interpreter's bytecode magic
+    number, so a re-run only compiles what was edited since. Failures are
+    never cached - a file with a syntax error is checked again every time.
+    """
+
+    def __init__(self, root: Path, cache_path: Optional[Path] = None):
+        self.root = Path(root)
+        self.cache_path = cache_path
+        self._cache: Optional[Dict[str, Any]] = None
+
+    def compile(self, files: Iterable[Path], jobs: int = 0) -> Dict[str, Any]:
+        """Compile files; returns counts and the SyntaxProblems found, in file order"""
+        previous = self._load_cache()["files"]
+        current: Dict[str, List[int]] = {}
+        stale: List[str] = []
+        for path in files:
+            rel = os.path.relpath(path, self.root)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            current[rel] = [stat.st_mtime_ns, stat.st_size]
+            if previous.get(rel) != current[rel]:
+                stale.append(rel)
+
+        if jobs <= 0:
+            jobs = os.cpu_count() or 1
+        paths = [str(self.root / rel) for rel in stale]
+        if jobs > 1 and len(paths) >= _POOL_MIN_FILES:
+            workers = min(jobs, len(paths))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                outcomes = list(pool.map(_compile_one, paths, chunksize=max(len(paths) // (workers * 4), 1)))
+        else:
+            outcomes = [_compile_one(path) for path in paths]
+
+        checked = len(current)
+        errors = []
+        for rel, outcome in zip(stale, outcomes):
+            if outcome is not None:
+                errors.append(SyntaxProblem(rel, *outcome))
+                del current[rel]
+
+        # Only files that exist and compiled are kept - deleted ones drop out
+        self._cache["files"] = current
+        self._save_cache()
+        return {"checked": checked, "compiled": len(stale), "errors": errors}
+
+    def _load_cache(self) -> Dict[str, Any]:
+        if self._cache is None:
+            cache = None
+            if self.cache_path is not None:
+                try:
+                    cache = json.loads(self.cache_path.read_text())
+                except (OSError, ValueError):
+                    cache = None
+            # Bytecode from another interpreter version doesn't count as compiled
+            version = f"{COMPILE_CACHE_VERSION}-{importlib.util.MAGIC_NUMBER.hex()}"
+            if not isinstance(cache, dict) or cache.get("version") != version:
+                cache = {"version": version}
+            cache.setdefault("files", {})
+            self._cache = cache
+        return self._cache
+
+    def _save_cache(self) -> None:
+        if self.cache_path is None:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(self._cache))
+            os.replace(tmp, self.cache_path)
+        except OSError:
+            pass  # caching is an optimisation - the files were compiled
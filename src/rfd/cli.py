@@ -5,7 +5,6 @@ Command line interface for Reality-First Development Protocol
 """
 
 import json
-import sqlite3
 import subprocess
 import sys
 from datetime import datetime
@@ -16,7 +15,9 @@ import click
 from . import __version__
 from .cli_enforcement import enforce
 from .cli_prevent import prevent
+from .build import format_age
 from .cli_utils import create_claude_md
+from .db_utils import get_db_connection
 from .feature_commands import create_feature_commands
 from .rfd import RFD
 from .template_sync import auto_sync_on_init
@@ -28,7 +29,9 @@ from .update_check import check_for_updates
 @click.pass_context
 def cli(ctx):
     """RFD: Reality-First Development System"""
-    ctx.obj = RFD()
+    # `rfd serve` passes in its warm instance
+    if ctx.obj is None:
+        ctx.obj = RFD()
 
 
 @cli.command()
@@ -129,7 +132,7 @@ def spec(ctx):
         # Smart default: show project config
         from .config_manager import ConfigManager
 
-        config = ConfigManager(RFD().rfd_dir)
+        config = ConfigManager(ctx.obj.rfd_dir)
         if config.is_configured():
             import yaml
 
@@ -255,8 +258,10 @@ def spec_generate(rfd, spec_type):
 
 @cli.command()
 @click.argument("feature_id", required=False)
+@click.option("--all-tests", is_flag=True, help="Run the full test suite instead of only the affected tests")
+@click.option("--jobs", "-j", type=int, default=1, help="Split the tests over N worker processes (0 = one per CPU)")
 @click.pass_obj
-def build(rfd, feature_id):
+def build(rfd, feature_id, all_tests, jobs):
     """Run build process for feature"""
     if not feature_id:
         feature_id = rfd.session.get_current_feature()
@@ -270,18 +275,48 @@ def build(rfd, feature_id):
 
     if success:
         click.echo("✅ Build successful!")
+        tests = rfd.builder.check_tests(use_cache=not all_tests, affected=not all_tests, jobs=jobs, echo=click.echo)
+        click.echo(f"{'✅' if tests['passing'] else '❌'} {tests['message']}")
+        if tests.get("selection"):
+            click.echo(f"   {tests['selection']['reason']}")
+        _echo_shards(tests)
         rfd.checkpoint(f"Build passed for {feature_id}")
     else:
         click.echo("❌ Build failed - check errors above")
 
 
+def _echo_shards(result):
+    """Per-shard timing of a sharded test run"""
+    shards = result.get("shards") or []
+    if len(shards) < 2 or result.get("cached"):
+        return
+    for shard in shards:
+        icon = "⏱️ " if shard["timed_out"] else "✅" if shard["passed"] else "❌"
+        units = f"{shard['units']} unit(s), " if shard["units"] is not None else ""
+        timing = f"{shard['seconds']:.1f}s (est. {shard['estimate']:.1f}s)"
+        click.echo(f"   {icon} shard {shard['index'] + 1}: {units}{timing}")
+
+
 @cli.command()
 @click.option("--feature", help="Validate specific feature")
 @click.option("--full", is_flag=True, help="Full validation")
+@click.option(
+    "--changed-since",
+    metavar="CHECKPOINT",
+    help='Only check files changed since a checkpoint id, "last" or a git ref',
+)
+@click.option("--jobs", "-j", type=int, default=1, help="Run independent checks on N threads (0 = one per CPU)")
+@click.option("--perf", is_flag=True, help="Load-test endpoints against their performance budgets")
 @click.pass_obj
-def validate(rfd, feature, full):
+def validate(rfd, feature, full, changed_since, jobs, perf):
     """Validate current implementation"""
-    results = rfd.validator.validate(feature=feature, full=full)
+    try:
+        results = rfd.validator.validate(
+            feature=feature, full=full, changed_since=changed_since, jobs=jobs, perf=perf, start_service=True
+        )
+    except ValueError as e:
+        click.echo(f"❌ Error: {e}", err=True)
+        sys.exit(1)
     rfd.validator.print_report(results)
 
     if not results["passing"]:
@@ -310,8 +345,6 @@ def complete(rfd, feature_id):
 @click.pass_obj
 def status(rfd):
     """Comprehensive project status with phases, tasks, and next actions"""
-    import sqlite3
-
     from .feature_manager import FeatureManager
 
     fm = FeatureManager(rfd)
@@ -334,7 +367,7 @@ def status(rfd):
         click.echo(f"   {data['current_focus']['id']}: {data['current_focus']['description']}")
 
         # Show tasks for current feature
-        conn = sqlite3.connect(rfd.db_path)
+        conn = get_db_connection(rfd.db_path, foreign_keys=False)
         tasks = conn.execute(
             """
             SELECT description, status FROM tasks
@@ -358,6 +391,16 @@ def status(rfd):
             icon = "✅" if phase["status"] == "complete" else "🔄" if phase["status"] == "active" else "⏸️"
             click.echo(f"   {icon} {phase['name']}: {phase['description']}")
 
+    from .live_checks import read_live_checks
+
+    live = read_live_checks(rfd.db_path)
+    if live:
+        updated = live["updated_at"][:19].replace("T", " ")
+        state = "live" if live["running"] else "watcher stopped"
+        click.echo(f"\n📡 Live Checks ({state}, updated {updated}):")
+        for check in live["checks"]:
+            click.echo(f"   {'✅' if check['passed'] else '❌'} {check['name']}: {check['summary']}")
+
     click.echo("\n➡️ Suggested Next Actions:")
     if stats["in_progress"] > 0:
         click.echo("   1. Continue current feature: rfd build")
@@ -441,14 +484,17 @@ def dashboard(rfd):
 
 
 @cli.command()
+@click.option("--no-cache", is_flag=True, help="Re-run the tests even if nothing changed since the last run")
+@click.option("--jobs", "-j", type=int, default=1, help="Split the tests over N worker processes (0 = one per CPU)")
+@click.option("--verbose", "-v", is_flag=True, help="Show the test output as it runs (always kept in .rfd/logs)")
 @click.pass_obj
-def check(rfd):
+def check(rfd, no_cache, jobs, verbose):
     """Quick health check"""
     check_for_updates()
 
     auto_sync_on_init(Path.cwd())
 
-    state = rfd.get_current_state()
+    state = rfd.get_current_state(use_cache=not no_cache, test_jobs=jobs, test_echo=click.echo if verbose else None)
 
     click.echo("\n=== RFD Status Check ===\n")
 
@@ -456,7 +502,9 @@ def check(rfd):
     click.echo(f"📋 Validation: {'✅' if val['passing'] else '❌'}")
 
     build = state["build"]
-    click.echo(f"🔨 Build: {'✅' if build['passing'] else '❌'}")
+    cached = f" (cached {format_age(build['age'])} ago)" if build.get("cached") else ""
+    click.echo(f"🔨 Build: {'✅' if build['passing'] else '❌'}{cached}")
+    _echo_shards(build)
 
     session = state["session"]
     if session:
@@ -534,9 +582,7 @@ def session_status(rfd):
             click.echo("   🔒 Isolated: No (main directory)")
 
         # Show feature status from database
-        import sqlite3
-
-        conn = sqlite3.connect(rfd.db_path)
+        conn = get_db_connection(rfd.db_path, foreign_keys=False)
         cursor = conn.execute("SELECT status, description FROM features WHERE id = ?", (current.get("feature_id"),))
         result = cursor.fetchone()
         conn.close()
@@ -586,34 +632,38 @@ def session_end(rfd, success, cleanup):
 
 @cli.command()
 @click.argument("message")
+@click.option("--no-cache", is_flag=True, help="Re-run the tests even if nothing changed since the last run")
 @click.pass_obj
-def checkpoint(rfd, message):
+def checkpoint(rfd, message, no_cache):
     """Save checkpoint with current state"""
     validation = rfd.validator.validate()
-    build = rfd.builder.get_status()
+    build = rfd.builder.get_status(use_cache=not no_cache)
 
     try:
         git_hash = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True).stdout.strip()
     except Exception:
         git_hash = "no-git"
 
-    conn = sqlite3.connect(rfd.db_path)
-    conn.execute(
-        """
-        INSERT INTO checkpoints (feature_id, timestamp, validation_passed,
-                                build_passed, git_hash, evidence)
-        VALUES (?, ?, ?, ?, ?, ?)
-    """,
-        (
-            rfd.session.get_current_feature(),
-            datetime.now().isoformat(),
-            validation["passing"],
-            build["passing"],
-            git_hash,
-            json.dumps({"message": message, "validation": validation, "build": build}),
-        ),
-    )
-    conn.commit()
+    conn = get_db_connection(rfd.db_path, foreign_keys=False)
+    try:
+        conn.execute(
+            """
+            INSERT INTO checkpoints (feature_id, timestamp, validation_passed,
+                                    build_passed, git_hash, evidence)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """,
+            (
+                rfd.session.get_current_feature(),
+                datetime.now().isoformat(),
+                validation["passing"],
+                build["passing"],
+                git_hash,
+                json.dumps({"message": message, "validation": validation, "build": build}),
+            ),
+        )
+        conn.commit()
+    finally:
+        conn.close()
 
     click.echo(f"✅ Checkpoint saved: {message}")
 
@@ -681,7 +731,7 @@ def resume(rfd):
     click.echo(f"\n➡️ Next Action: {next_action}")
 
     if context_file.exists():
-        conn = sqlite3.connect(rfd.db_path)
+        conn = get_db_connection(rfd.db_path, foreign_keys=False)
         tasks = conn.execute(
             """
             SELECT description, status FROM tasks
@@ -968,7 +1018,7 @@ def plan_tasks(rfd, feature_id):
 @click.pass_obj
 def plan_phases(rfd):
     """Display project phases"""
-    conn = sqlite3.connect(rfd.rfd_dir / "memory.db")
+    conn = get_db_connection(rfd.rfd_dir / "memory.db", foreign_keys=False)
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM phases ORDER BY sequence")
     phases = cursor.fetchall()
@@ -1031,8 +1081,6 @@ def analyze(rfd, scope, format):
 @click.pass_obj
 def gaps(rfd, category, status, priority, format):
     """Show gap analysis from database"""
-    from .db_utils import get_db_connection
-
     conn = get_db_connection(rfd.db_path)
     cursor = conn.cursor()
 
@@ -1112,6 +1160,149 @@ def memory_reset(rfd):
     click.echo("✅ Memory reset")
 
 
+@cli.group()
+@click.pass_obj
+def perf(rfd):
+    """Performance history reports"""
+    pass
+
+
+@perf.command("tests")
+@click.option("--limit", "-n", type=int, default=10, help="Number of slowest tests to show")
+@click.option("--runs", type=int, default=20, help="Recent test runs to consider")
+@click.option("--from", "before", type=int, help="Checkpoint id to compare from (default: second-latest with runs)")
+@click.option("--to", "after", type=int, help="Checkpoint id to compare to (default: latest with runs)")
+@click.option("--threshold", type=float, default=1.5, help="Slowdown factor that counts as a regression")
+@click.pass_obj
+def perf_tests(rfd, limit, runs, before, after, threshold):
+    """Slowest tests, duration regressions between checkpoints, and flaky tests"""
+    from .test_reports import duration_regressions, flaky_tests, slowest_tests
+
+    slowest = slowest_tests(rfd.db_path, limit=limit, runs=runs)
+    if not slowest:
+        click.echo("No test history yet - run `rfd check` or `rfd build` to record some")
+        return
+
+    click.echo(f"\n🐢 Slowest tests (last {runs} runs):")
+    for entry in slowest:
+        click.echo(f"  {entry['average']:8.3f}s avg  {entry['max']:8.3f}s max  {entry['test']}")
+
+    report = duration_regressions(rfd.db_path, before, after, threshold=threshold)
+    if report["before"] is None:
+        click.echo("\n📈 Regressions: need test runs after two different checkpoints")
+    elif report["regressions"]:
+        click.echo(f"\n📈 Regressions (checkpoint {report['before']} → {report['after']}):")
+        for entry in report["regressions"]:
+            factor = entry["after"] / entry["before"] if entry["before"] else float("inf")
+            click.echo(f"  {entry['before']:.3f}s → {entry['after']:.3f}s (x{factor:.1f})  {entry['test']}")
+    else:
+        click.echo(f"\n📈 No regressions between checkpoints {report['before']} and {report['after']}")
+
+    flaky = flaky_tests(rfd.db_path, runs=max(runs, 50))
+    if flaky:
+        click.echo("\n🎲 Flaky tests (passed and failed on the same source tree):")
+        for entry in flaky:
+            click.echo(f"  {entry['failed']} failed / {entry['passed']} passed  {entry['test']}")
+    else:
+        click.echo("\n🎲 No flaky tests detected")
+
+
+@cli.command()
+@click.option("--stop", is_flag=True, help="Stop the running daemon for this project")
+@click.pass_obj
+def serve(rfd, stop):
+    """Run a warm daemon that answers hook commands over a Unix socket"""
+    from .daemon import RFDDaemon, stop_daemon
+
+    if stop:
+        if stop_daemon(rfd.rfd_dir):
+            click.echo("✅ RFD daemon stopped")
+        else:
+            click.echo("No RFD daemon running")
+        return
+
+    try:
+        daemon = RFDDaemon(rfd)
+    except (RuntimeError, OSError) as e:
+        click.echo(f"❌ Cannot start daemon: {e}")
+        sys.exit(1)
+
+    click.echo(f"🚀 RFD daemon listening on {daemon.path}")
+    click.echo("   Serving: prevent validate/check-scope/validate-commit/pre-commit, validate, status")
+    daemon.serve()
+    click.echo("RFD daemon stopped")
+
+
+@cli.command()
+@click.option("--start", is_flag=True, help="Start it, or restart it if its sources changed")
+@click.option("--stop", is_flag=True, help="Stop it")
+@click.pass_obj
+def service(rfd, start, stop):
+    """The project's dev service, kept running between builds and validations"""
+    supervisor = rfd.builder.service
+    if stop:
+        click.echo("✅ Service stopped" if supervisor.stop() else "No service running")
+        return
+    if start:
+        try:
+            started = supervisor.ensure()
+        except (OSError, RuntimeError) as e:
+            click.echo(f"❌ Cannot start service: {e}")
+            sys.exit(1)
+        if started["started"]:
+            click.echo(f"✅ Service started in {started['cold_start']:.1f}s ({started['reason']})")
+        else:
+            click.echo(f"✅ Service {started['reason']}")
+
+    state = supervisor.status()
+    if not state:
+        click.echo("No service started by rfd yet")
+        return
+    if state["running"]:
+        click.echo(f"🟢 Service running (pid {state['pid']}, since {state['started_at'][:19]})")
+    else:
+        click.echo("⚪ Service not running")
+    click.echo(f"   Command: {' '.join(state['command'])}")
+    if state["cold_starts"]:
+        cold = state["cold_starts"]
+        click.echo(f"   Cold start: {cold[-1]:.2f}s last, {sum(cold) / len(cold):.2f}s average over {len(cold)}")
+
+
+@cli.command()
+@click.option("--poll", is_flag=True, help="Poll file fingerprints instead of using inotify")
+@click.option("--interval", type=float, default=1.0, help="Seconds between polls (with --poll or no inotify)")
+@click.option("--debounce", type=float, default=0.25, help="Quiet seconds before a burst of writes is checked")
+@click.pass_obj
+def watch(rfd, poll, interval, debounce):
+    """Watch the project and keep validation, scope and claim state live for rfd status"""
+    import signal
+    import threading
+
+    from .live_checks import LiveChecks
+    from .watcher import FileWatcher
+
+    stop = threading.Event()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda *_: stop.set())
+
+    with FileWatcher(rfd.root, debounce=debounce, poll_interval=interval, polling=poll) as watcher:
+        live = LiveChecks(rfd, watcher.backend_name)
+        click.echo(f"👀 Watching {rfd.root} ({watcher.backend_name}) - Ctrl-C to stop")
+        _echo_live_checks(live.prime())
+
+        for changes in watcher.batches(stop):
+            label = "full rescan" if changes.rescan else f"{len(changes.paths)} file(s) changed"
+            click.echo(f"\n[{datetime.now():%H:%M:%S}] {label}")
+            _echo_live_checks(live.process(changes))
+
+    click.echo("Watcher stopped")
+
+
+def _echo_live_checks(checks):
+    for name, check in checks.items():
+        click.echo(f"   {'✅' if check['passed'] else '❌'} {name}: {check['summary']}")
+
+
 # Function moved to cli_utils.py to reduce line count
 
 
@@ -11,6 +11,12 @@ from .enforcement import MultiAgentCoordinator, ScopeDriftDetector, WorkflowEnfo
 from .rfd import RFD
 
 
+def _get_rfd() -> RFD:
+    """Reuse the RFD instance built by the top-level CLI group when available"""
+    ctx = click.get_current_context(silent=True)
+    return (ctx and ctx.find_object(RFD)) or RFD()
+
+
 @click.group()
 def enforce():
     """Real-time workflow enforcement commands"""
@@ -21,7 +27,7 @@ def enforce():
 @click.argument("feature")
 def start(feature: str):
     """Start enforcement for a feature"""
-    rfd = RFD()
+    rfd = _get_rfd()
     enforcer = WorkflowEnforcer(rfd)
     result = enforcer.start_enforcement(feature)
 
@@ -36,7 +42,7 @@ def start(feature: str):
 @click.argument("feature")
 def stop(feature: str):
     """Stop enforcement for a feature"""
-    rfd = RFD()
+    rfd = _get_rfd()
     enforcer = WorkflowEnforcer(rfd)
     result = enforcer.stop_enforcement(feature)
     click.echo(f"⏹️ Enforcement stopped for: {result['feature']}")
@@ -46,7 +52,7 @@ def stop(feature: str):
 @click.argument("feature")
 def check_drift(feature: str):
     """Check for scope drift"""
-    rfd = RFD()
+    rfd = _get_rfd()
     detector = ScopeDriftDetector(rfd)
     result = detector.detect_drift(feature)
 
@@ -64,7 +70,7 @@ def check_drift(feature: str):
 @click.argument("capabilities", nargs=-1)
 def register_agent(agent_id: str, capabilities):
     """Register an agent for coordination"""
-    rfd = RFD()
+    rfd = _get_rfd()
     coordinator = MultiAgentCoordinator(rfd)
     result = coordinator.register_agent(agent_id, list(capabilities))
     click.echo(f"✅ Agent registered: {result['agent_id']}")
@@ -77,7 +83,7 @@ def register_agent(agent_id: str, capabilities):
 @click.option("--context", "-c", help="JSON context for handoff")
 def handoff(from_agent: str, to_agent: str, task: str, context: Optional[str]):
     """Create handoff between agents"""
-    rfd = RFD()
+    rfd = _get_rfd()
     coordinator = MultiAgentCoordinator(rfd)
 
     ctx = json.loads(context) if context else {}
@@ -91,7 +97,7 @@ def handoff(from_agent: str, to_agent: str, task: str, context: Optional[str]):
 @click.argument("agent_id")
 def pending(agent_id: str):
     """Show pending handoffs for an agent"""
-    rfd = RFD()
+    rfd = _get_rfd()
     coordinator = MultiAgentCoordinator(rfd)
     handoffs = coordinator.get_pending_handoffs(agent_id)
 
@@ -109,15 +115,15 @@ def validate_commit():
     import subprocess
     import sys
 
-    # Get staged files
-    result = subprocess.run(["git", "diff", "--cached", "--name-only"], capture_output=True, text=True)
+    from .git_index import staged_changes
 
-    if result.returncode != 0:
+    # Get staged files
+    try:
+        staged_files = [change.path for change in staged_changes()]
+    except (OSError, subprocess.CalledProcessError):
         click.echo("❌ Failed to get staged files")
         sys.exit(1)
 
-    staged_files = result.stdout.strip().split("\n") if result.stdout.strip() else []
-
     # Basic validation - check for common issues
     issues = []
 
@@ -2,12 +2,13 @@
 """Prevention CLI commands for RFD."""
 
 import json
+import subprocess
 import sys
 from pathlib import Path
 
 import click
 
-from .prevention import HallucinationPrevention, ScopeDriftPrevention, WorkflowEnforcement
+from .prevention import HallucinationPrevention, ScopeDriftPrevention, WorkflowEnforcement, staged_sources
 
 
 @click.group()
@@ -17,12 +18,48 @@ def prevent():
 
 
 @prevent.command()
-@click.argument("file_path")
-@click.argument("code", required=False)
-def validate(file_path, code):
-    """Validate code before writing to prevent hallucinations."""
+@click.argument("targets", nargs=-1)
+@click.option("--paths", "as_paths", is_flag=True, help="Treat every argument as a file to validate")
+@click.option("--staged", is_flag=True, help="Validate the staged content of every staged Python file")
+@click.option("--jobs", "-j", type=int, default=0, help="Worker processes for --paths/--staged (0 = one per CPU)")
+def validate(targets, as_paths, staged, jobs):
+    """Validate code before writing to prevent hallucinations.
+
+    \b
+    rfd prevent validate FILE [CODE]      one file; code from CODE, FILE or stdin
+    rfd prevent validate --paths A B ...  many files in one batch
+    rfd prevent validate --staged         everything staged for commit
+    """
     hp = HallucinationPrevention()
 
+    if as_paths or staged:
+        if staged:
+            try:
+                sources = staged_sources()
+            except (OSError, subprocess.CalledProcessError) as e:
+                click.echo(f"❌ Cannot read staged files: {e}", err=True)
+                sys.exit(1)
+            results = hp.validate_batch(sources, jobs=jobs)
+        else:
+            results = {}
+        if as_paths:
+            results.update(hp.validate_paths(targets, jobs=jobs))
+
+        failed = {path: violations for path, (valid, violations) in results.items() if not valid}
+        for path, violations in failed.items():
+            click.echo(f"❌ {path}:")
+            for violation in violations:
+                click.echo(f"  - {violation}")
+        if failed:
+            click.echo(f"❌ Code validation failed for {len(failed)} of {len(results)} files")
+            sys.exit(1)
+        click.echo(f"✅ Code validation passed ({len(results)} files)")
+        return
+
+    if not targets or len(targets) > 2:
+        raise click.UsageError("Expected FILE [CODE], or --paths/--staged for a batch")
+    file_path, code = targets[0], targets[1] if len(targets) > 1 else None
+
     if not code:
         # First try to read the file if it exists
         file = Path(file_path)
@@ -83,6 +120,30 @@ def validate_commit(workflow_id):
         click.echo(f"✅ Workflow {workflow_id} compliant")
 
 
+@prevent.command("pre-commit")
+@click.option("--jobs", "-j", type=int, default=0, help="Worker processes for content checks (0 = one per CPU)")
+def pre_commit(jobs):
+    """Workflow and scope checks for everything staged (git hook fast path)."""
+    workflow_id = None
+    if Path(".rfd/workflow.lock").exists():
+        workflow_id = Path(".rfd/workflow.lock").read_text().strip() or None
+    feature_id = ScopeDriftPrevention().current_feature()
+
+    try:
+        valid, violations = WorkflowEnforcement().check_staged(workflow_id, feature_id, jobs=jobs)
+    except (OSError, subprocess.CalledProcessError) as e:
+        click.echo(f"❌ Cannot read staged changes: {e}", err=True)
+        sys.exit(1)
+
+    if not valid:
+        click.echo("❌ Staged changes violate workflow or scope:")
+        for violation in violations:
+            click.echo(f"  - {violation}")
+        sys.exit(1)
+    else:
+        click.echo("✅ Staged changes within workflow and scope")
+
+
 @prevent.command()
 def stats():
     """Show prevention statistics."""
@@ -158,24 +219,11 @@ def install_hooks():
         """#!/bin/bash
 # RFD Workflow Enforcement Hook
 
-# Check if we're in an RFD workflow
-if [ -f .rfd/workflow.lock ]; then
-    workflow_id=$(cat .rfd/workflow.lock)
-    
-    # Validate changes against workflow spec
-    rfd prevent validate-commit $workflow_id
-    if [ $? -ne 0 ]; then
-        echo "❌ Commit blocked: Workflow violation detected"
-        echo "Run 'rfd workflow status $workflow_id' for details"
-        exit 1
-    fi
-fi
-
-# Check for scope drift
-rfd prevent check-scope
+# Workflow rules and scope drift for everything staged, in one pass
+rfd prevent pre-commit
 if [ $? -ne 0 ]; then
-    echo "❌ Commit blocked: Scope drift detected"
-    echo "Run 'rfd scope check' for details"
+    echo "❌ Commit blocked: Workflow violation or scope drift detected"
+    echo "Run 'rfd prevent pre-commit' for details"
     exit 1
 fi
 
@@ -0,0 +1,131 @@
+"""
+Thin `rfd` entry point
+Forwards hook-speed commands to a running `rfd serve` daemon and falls back
+to the full CLI in-process when no daemon is listening.
+
+Only the standard library is imported here - that is the whole point.
+"""
+
+import json
+import os
+import socket
+import sys
+from typing import Any, Dict, List, Optional
+
+from . import __version__
+
+SOCKET_NAME = "rfd.sock"
+
+# Command prefixes the daemon answers. Everything else always runs in-process.
+SERVED_COMMANDS = (
+    ("prevent", "validate"),
+    ("prevent", "check-scope"),
+    ("prevent", "validate-commit"),
+    ("prevent", "pre-commit"),
+    ("validate",),
+    ("status",),
+)
+
+# AF_UNIX paths are limited to ~104-108 bytes depending on the platform
+_MAX_SOCKET_PATH = 100
+
+CONNECT_TIMEOUT = 0.1
+RESPONSE_TIMEOUT = 600.0
+
+
+def socket_path(rfd_dir: "str | os.PathLike[str]") -> str:
+    """Socket location for a project's .rfd directory"""
+    path = os.path.join(os.path.abspath(rfd_dir), SOCKET_NAME)
+    if len(path) <= _MAX_SOCKET_PATH:
+        return path
+
+    # Deeply nested projects: fall back to a per-project name in the temp dir
+    import hashlib
+    import tempfile
+
+    digest = hashlib.sha1(path.encode()).hexdigest()[:16]
+    return os.path.join(tempfile.gettempdir(), f"rfd-{os.getuid()}-{digest}.sock")
+
+
+def is_served(argv: List[str]) -> bool:
+    """Whether the daemon can answer this command line"""
+    return any(tuple(argv[: len(prefix)]) == prefix for prefix in SERVED_COMMANDS)
+
+
+def request(argv: List[str], cwd: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Run a command line on the project's daemon.
+
+    Returns:
+        {"exit_code": int, "output": str} or None when no compatible daemon
+        is reachable - the caller should then run the command itself
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+
+    cwd = os.getcwd() if cwd is None else str(cwd)
+    path = socket_path(os.path.join(cwd, ".rfd"))
+    if not os.path.exists(path):
+        return None
+
+    payload = json.dumps({"argv": argv, "cwd": cwd, "version": __version__}) + "\n"
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(path)
+            sock.settimeout(RESPONSE_TIMEOUT)
+            sock.sendall(payload.encode())
+            sock.shutdown(socket.SHUT_WR)
+
+            chunks = []
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+    except OSError:
+        # Stale socket, daemon busy restarting, etc.
+        return None
+
+    try:
+        response = json.loads(b"".join(chunks))
+    except ValueError:
+        return None
+
+    # The daemon declines requests it cannot answer faithfully (other project, other version)
+    if response.get("declined"):
+        return None
+    return response
+
+
+def _forwardable(argv: List[str]) -> List[str]:
+    """Resolve client-side inputs the daemon cannot see (stdin)"""
+    # `prevent validate FILE` reads the code from stdin when FILE does not exist yet
+    if (
+        argv[:2] == ["prevent", "validate"]
+        and len(argv) == 3
+        and not argv[2].startswith("-")
+        and not os.path.isfile(argv[2])
+    ):
+        return argv + [sys.stdin.read()]
+    return argv
+
+
+def main() -> None:
+    """Console entry point for `rfd`"""
+    argv = sys.argv[1:]
+
+    if is_served(argv):
+        argv = _forwardable(argv)
+        response = request(argv)
+        if response is not None:
+            sys.stdout.write(response.get("output", ""))
+            sys.stdout.flush()
+            sys.exit(response.get("exit_code", 0))
+        # Keep whatever stdin we consumed
+        sys.argv[1:] = argv
+
+    from .cli import main as cli_main
+
+    cli_main()
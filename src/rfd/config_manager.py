@@ -9,6 +9,9 @@ from typing import Any, Dict, Optional
 
 import yaml
 
+# libyaml-backed loader when PyYAML was built with it - same safe semantics, much faster
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class ConfigManager:
     """Manages immutable project configuration in .rfd/config.yaml"""
@@ -65,7 +68,7 @@ class ConfigManager:
             return None
 
         with open(self.config_file) as f:
-            return yaml.safe_load(f)
+            return yaml.load(f, Loader=_SafeLoader)
 
     def get_stack(self) -> Optional[Dict[str, str]]:
         """Get just the stack configuration"""
@@ -0,0 +1,222 @@
+"""
+API contract runner for RFD
+Checks contract endpoints concurrently over one pooled HTTP session
+"""
+
+import asyncio
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_CONCURRENCY = 10
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_LOAD_REQUESTS = 200
+
+# Methods that carry generated test data as a JSON body
+_BODY_METHODS = {"POST", "PUT", "PATCH"}
+
+# Load is only ever generated against the developer's own machine
+_LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1", "0.0.0.0"}
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list of samples"""
+    ordered = sorted(samples)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def is_local_url(url: str) -> bool:
+    """Whether a base URL points at this machine"""
+    host = (urlsplit(url).hostname or "").lower()
+    return host in _LOCAL_HOSTS or host.endswith(".localhost")
+
+
+def check_budget(stats: Dict[str, Any], budget: Dict[str, Any]) -> List[str]:
+    """Budget violations for a load run, e.g. ["p95 120ms > 50ms"]"""
+    violations = []
+    if "p95_ms" in budget and (stats["p95"] is None or stats["p95"] > budget["p95_ms"]):
+        violations.append(f"p95 {stats['p95']}ms > {budget['p95_ms']}ms")
+    if "min_rps" in budget and stats["rps"] < budget["min_rps"]:
+        violations.append(f"{stats['rps']} rps < {budget['min_rps']} rps")
+    if "max_error_rate" in budget and stats["error_rate"] > budget["max_error_rate"]:
+        violations.append(f"error rate {stats['error_rate']:.1%} > {budget['max_error_rate']:.1%}")
+    return violations
+
+
+class ContractRunner:
+    """
+    Runs API contract checks with bounded concurrency.
+
+    Requests go through a single keep-alive requests.Session whose connection
+    pool matches the concurrency limit; asyncio schedules them and a semaphore
+    caps how many are in flight. Every request has a timeout, so one hung
+    endpoint fails on its own instead of stalling validation.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        timeout: float = DEFAULT_TIMEOUT,
+        samples: int = 1,
+    ):
+        self.base_url = base_url
+        self.concurrency = max(int(concurrency), 1)
+        self.timeout = float(timeout)
+        self.samples = max(int(samples), 1)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.concurrency, pool_maxsize=self.concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "ContractRunner":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def get(self, path: str, timeout: Optional[float] = None) -> requests.Response:
+        """Single blocking GET on the pooled session (e.g. the health check)"""
+        return self.session.get(f"{self.base_url}{path}", timeout=timeout or self.timeout)
+
+    def run(
+        self,
+        endpoints: List[Dict[str, Any]],
+        payload_for: Callable[[str], Dict],
+        check_status: Callable[[requests.Response, Any], bool],
+    ) -> List[Dict[str, Any]]:
+        """
+        Check every endpoint; results come back in contract order.
+
+        Each result carries latency_ms with p50/p95/max over the endpoint's
+        samples (api_contract.samples requests per endpoint).
+        """
+        if not endpoints:
+            return []
+        return asyncio.run(self._run_all(endpoints, payload_for, check_status))
+
+    async def _run_all(self, endpoints, payload_for, check_status) -> List[Dict[str, Any]]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        # requests is blocking - give the in-flight calls their own threads
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="rfd-api") as executor:
+            return list(
+                await asyncio.gather(
+                    *(
+                        self._check_endpoint(endpoint, payload_for, check_status, semaphore, executor)
+                        for endpoint in endpoints
+                    )
+                )
+            )
+
+    async def _check_endpoint(self, endpoint, payload_for, check_status, semaphore, executor) -> Dict[str, Any]:
+        method = endpoint["method"].upper()
+        path = endpoint["path"]
+        expected = endpoint.get("expected_status", 200)
+        timeout = float(endpoint.get("timeout", self.timeout))
+        payload = payload_for(path) if method in _BODY_METHODS else None
+
+        loop = asyncio.get_running_loop()
+        latencies: List[float] = []
+        passed = True
+        status = None
+        for _ in range(self.samples):
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    response = await loop.run_in_executor(executor, self._send, method, path, payload, timeout)
+                except Exception as e:
+                    return {
+                        "test": f"endpoint_{method}_{path}",
+                        "passed": False,
+                        "message": f"{method} {path}: {str(e)}",
+                    }
+                latencies.append((time.perf_counter() - start) * 1000)
+
+            status = response.status_code
+            passed = passed and check_status(response, expected)
+
+        latency = {
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "max": round(max(latencies), 2),
+            "samples": len(latencies),
+        }
+        return {
+            "test": f"endpoint_{method}_{path}",
+            "passed": passed,
+            "message": (
+                f"{method} {path}: {status} "
+                f"(p50 {latency['p50']:.0f}ms, p95 {latency['p95']:.0f}ms, max {latency['max']:.0f}ms)"
+            ),
+            "latency_ms": latency,
+        }
+
+    def _send(self, method: str, path: str, payload: Optional[Dict], timeout: float) -> requests.Response:
+        return self.session.request(method, f"{self.base_url}{path}", json=payload, timeout=timeout)
+
+    def load(
+        self,
+        endpoint: Dict[str, Any],
+        total: int,
+        payload_for: Callable[[str], Dict],
+        check_status: Callable[[requests.Response, Any], bool],
+    ) -> Dict[str, Any]:
+        """
+        Fire `total` requests at one endpoint, `concurrency` at a time.
+
+        Returns requests, errors, error_rate, rps and p50/p95/max latency (ms,
+        over the successful requests). A request errors when it raises or its
+        status doesn't match expected_status.
+        """
+        return asyncio.run(self._load(endpoint, max(int(total), 1), payload_for, check_status))
+
+    async def _load(self, endpoint, total, payload_for, check_status) -> Dict[str, Any]:
+        method = endpoint["method"].upper()
+        path = endpoint["path"]
+        expected = endpoint.get("expected_status", 200)
+        timeout = float(endpoint.get("timeout", self.timeout))
+        payload = payload_for(path) if method in _BODY_METHODS else None
+
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        latencies: List[float] = []
+        errors = 0
+
+        async def one(executor) -> None:
+            nonlocal errors
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    response = await loop.run_in_executor(executor, self._send, method, path, payload, timeout)
+                except Exception:
+                    errors += 1
+                    return
+                if check_status(response, expected):
+                    latencies.append((time.perf_counter() - start) * 1000)
+                else:
+                    errors += 1
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="rfd-load") as executor:
+            started = time.perf_counter()
+            await asyncio.gather(*(one(executor) for _ in range(total)))
+            elapsed = time.perf_counter() - started
+
+        return {
+            "requests": total,
+            "errors": errors,
+            "error_rate": errors / total,
+            "rps": round(total / elapsed, 1) if elapsed > 0 else float(total),
+            "p50": round(percentile(latencies, 50), 2) if latencies else None,
+            "p95": round(percentile(latencies, 95), 2) if latencies else None,
+            "max": round(max(latencies), 2) if latencies else None,
+        }
@@ -0,0 +1,162 @@
+"""
+RFD daemon (`rfd serve`)
+Keeps a warm RFD instance - imports, spec snapshot, pooled DB connection -
+and answers hook-speed commands over a Unix domain socket.
+
+Protocol: the client sends one JSON line {"argv": [...], "cwd": str, "version": str},
+the daemon replies with one JSON document {"exit_code": int, "output": str} and
+closes the connection. Requests it cannot answer faithfully get {"declined": true}
+and the client runs the command itself.
+"""
+
+import contextlib
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from . import __version__
+from .client import is_served, request, socket_path
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    # A client that connects but never sends must not wedge the daemon
+    timeout = 10
+
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+
+        response = self.server.dispatch(request)
+        self.wfile.write(json.dumps(response).encode())
+
+
+class RFDDaemon(socketserver.UnixStreamServer):
+    """
+    Single-threaded command server for one project.
+
+    Requests are handled one at a time: commands write to the process-wide
+    stdout, and hooks run sequentially anyway.
+    """
+
+    # Poll interval for serve() so stop() and signals are noticed promptly
+    timeout = 0.5
+
+    def __init__(self, rfd):
+        self.rfd = rfd
+        self.path = socket_path(rfd.rfd_dir)
+        self.running = False
+
+        _remove_stale_socket(self.path)
+        super().__init__(self.path, _RequestHandler)
+        os.chmod(self.path, 0o600)
+
+    def serve(self) -> None:
+        """Handle requests until stop() is called or SIGTERM/SIGINT arrives"""
+        self.running = True
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(signum, lambda *_: self.stop())
+
+        try:
+            while self.running:
+                self.handle_request()
+        finally:
+            self.server_close()
+
+    def stop(self) -> None:
+        self.running = False
+
+    def server_close(self) -> None:
+        super().server_close()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.path)
+
+    def dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one request and package its result"""
+        argv = request.get("argv")
+        if argv == ["__stop__"]:
+            self.stop()
+            return {"exit_code": 0, "output": "RFD daemon stopped\n"}
+
+        if (
+            not isinstance(argv, list)
+            or request.get("version") != __version__
+            or request.get("cwd") != str(self.rfd.root)
+            or not is_served(argv)
+        ):
+            return {"declined": True}
+
+        exit_code, output = self.run_command(argv)
+        return {"exit_code": exit_code, "output": output}
+
+    def run_command(self, argv: List[str]) -> Tuple[int, str]:
+        """Invoke the regular click CLI against the warm RFD instance"""
+        import click
+
+        from .cli import cli
+
+        # Subsystems hold per-command state (e.g. the spec they were built with)
+        self.rfd.reset_subsystems()
+
+        output = io.StringIO()
+        stdin, sys.stdin = sys.stdin, io.StringIO()  # the client forwards any stdin as arguments
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            try:
+                cli.main(args=argv, prog_name="rfd", obj=self.rfd, standalone_mode=False)
+                exit_code = 0
+            except SystemExit as e:
+                exit_code = _exit_status(e.code)
+            except click.exceptions.Exit as e:
+                exit_code = e.exit_code
+            except click.ClickException as e:
+                e.show()
+                exit_code = e.exit_code
+            except click.exceptions.Abort:
+                click.echo("Aborted!", err=True)
+                exit_code = 1
+            except Exception as e:  # keep serving - report like an uncaught CLI error
+                click.echo(f"Error: {e}", err=True)
+                exit_code = 1
+            finally:
+                sys.stdin = stdin
+
+        return exit_code, output.getvalue()
+
+
+def _exit_status(code: Any) -> int:
+    """Map a SystemExit code to a process exit status"""
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code)
+    return 1
+
+
+def _remove_stale_socket(path: str) -> None:
+    """Remove a socket left behind by a daemon that died; refuse to replace a live one"""
+    if not os.path.exists(path):
+        return
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(path)
+        except OSError:
+            os.unlink(path)
+            return
+
+    raise RuntimeError(f"RFD daemon already running on {path}")
+
+
+def stop_daemon(rfd_dir: Path) -> bool:
+    """Ask the daemon for this project to exit. Returns False if none was running."""
+    return request(["__stop__"], cwd=str(Path(rfd_dir).parent)) is not None
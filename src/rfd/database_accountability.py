@@ -3,12 +3,13 @@ Database Accountability System
 Ensures database-first architecture is maintained
 """
 
-import sqlite3
 from pathlib import Path
 from typing import Any, Dict, List
 
 import yaml
 
+from .db_utils import get_db_connection
+
 
 class DatabaseAccountability:
     """Enforces database-first principles and tracks violations"""
@@ -67,7 +68,7 @@ class DatabaseAccountability:
                 md_features = []
 
         # Load database features
-        conn = sqlite3.connect(self.db_path)
+        conn = get_db_connection(self.db_path, foreign_keys=False)
         cursor = conn.execute("SELECT id, status FROM features")
         db_features = {row[0]: row[1] for row in cursor.fetchall()}
         conn.close()
@@ -134,7 +135,7 @@ class DatabaseAccountability:
 
     def _check_session_state(self):
         """Ensure session state is properly tracked in database"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_db_connection(self.db_path, foreign_keys=False)
 
         # Check for active sessions (sessions without ended_at)
         cursor = conn.execute("SELECT COUNT(*) FROM sessions WHERE ended_at IS NULL")
@@ -172,7 +173,7 @@ class DatabaseAccountability:
 
     def _check_task_tracking(self):
         """Ensure tasks are being tracked in database"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_db_connection(self.db_path, foreign_keys=False)
 
         # Check if tasks table is being used
         cursor = conn.execute("SELECT COUNT(*) FROM tasks")
@@ -3,29 +3,64 @@ Database utilities for RFD with WAL mode support
 Ensures consistent SQLite configuration across all connections
 """
 
+import atexit
+import os
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Tuple
 
 
-def get_db_connection(db_path: str | Path, timeout: float = 30.0) -> sqlite3.Connection:
+class PooledConnection(sqlite3.Connection):
     """
-    Create a SQLite connection with WAL mode and optimal settings.
+    SQLite connection owned by the per-thread pool.
 
-    WAL (Write-Ahead Logging) benefits:
-    - Better concurrency - readers don't block writers
-    - Better performance for write-heavy workloads
-    - More robust crash recovery
-    - Consistent memory context across sessions
+    close() hands the connection back to the pool instead of closing it, so
+    existing ``conn = get_db_connection(...)`` / ``conn.close()`` call sites keep
+    their semantics: anything left uncommitted when the last user releases the
+    connection is rolled back, exactly as a real close would discard it.
+    """
 
-    Args:
-        db_path: Path to the SQLite database
-        timeout: Connection timeout in seconds
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.users = 0
+        self.identity: Tuple[int, int] | None = None
 
-    Returns:
-        Configured SQLite connection
-    """
-    conn = sqlite3.connect(str(db_path), timeout=timeout)
+    def close(self) -> None:
+        """Release this connection back to the pool"""
+        self.users = max(self.users - 1, 0)
+        if self.users == 0 and self.in_transaction:
+            self.rollback()
+
+    def dispose(self) -> None:
+        """Really close the underlying SQLite handle"""
+        self.users = 0
+        super().close()
+
+
+_pool = threading.local()
+
+
+def _thread_pool() -> Dict[Tuple[str, bool], PooledConnection]:
+    """Connections owned by the current thread, keyed by absolute database path and foreign_keys"""
+    # A forked child must not reuse the parent's SQLite handles
+    if getattr(_pool, "pid", None) != os.getpid():
+        _pool.pid = os.getpid()
+        _pool.connections = {}
+    return _pool.connections
 
+
+def _file_identity(path: str) -> Tuple[int, int] | None:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_dev, stat.st_ino)
+
+
+def _configure_connection(conn: sqlite3.Connection, foreign_keys: bool = True) -> None:
+    """Apply the standard RFD PRAGMAs - once per physical connection"""
     # Enable WAL mode for better concurrency and performance
     conn.execute("PRAGMA journal_mode=WAL")
 
@@ -35,190 +70,499 @@ def get_db_connection(db_path: str | Path, timeout: float = 30.0) -> sqlite3.Con
     conn.execute("PRAGMA temp_store=MEMORY")  # Use memory for temp tables
 
     # Enable foreign keys for referential integrity
-    conn.execute("PRAGMA foreign_keys=ON")
+    if foreign_keys:
+        conn.execute("PRAGMA foreign_keys=ON")
 
     # Row factory for dict-like access
     conn.row_factory = sqlite3.Row
 
+
+def get_db_connection(db_path: str | Path, timeout: float = 30.0, foreign_keys: bool = True) -> sqlite3.Connection:
+    """
+    Get this thread's SQLite connection with WAL mode and optimal settings.
+
+    WAL (Write-Ahead Logging) benefits:
+    - Better concurrency - readers don't block writers
+    - Better performance for write-heavy workloads
+    - More robust crash recovery
+    - Consistent memory context across sessions
+
+    Connections are pooled per thread and per database file, so the connect and
+    PRAGMA cost is paid once per process rather than once per query. Calling
+    close() on the result releases it back to the pool. Prefer the
+    db_connection() / transaction() context managers in new code.
+
+    Args:
+        db_path: Path to the SQLite database
+        timeout: Connection timeout in seconds
+        foreign_keys: Enforce FOREIGN KEY constraints. Code that used to open
+            plain sqlite3 connections ran without them and passes False; it
+            gets a separate pooled connection.
+
+    Returns:
+        Configured SQLite connection
+    """
+    path = os.path.abspath(db_path)
+    key = (path, foreign_keys)
+    connections = _thread_pool()
+    conn = connections.get(key)
+
+    if conn is not None:
+        # The file was deleted or replaced since we opened it - don't keep using a stale handle
+        if conn.identity != _file_identity(path):
+            conn.dispose()
+            conn = None
+        elif conn.users == 0 and conn.in_transaction:
+            # A previous user never released its transaction
+            conn.rollback()
+
+    if conn is None:
+        conn = sqlite3.connect(path, timeout=timeout, factory=PooledConnection)
+        _configure_connection(conn, foreign_keys)
+        conn.identity = _file_identity(path)
+        connections[key] = conn
+
+    conn.users += 1
     return conn
 
 
-def init_database(db_path: str | Path) -> None:
+@contextmanager
+def db_connection(db_path: str | Path) -> Iterator[sqlite3.Connection]:
     """
-    Initialize the RFD database with all required tables.
-    This consolidates all table creation in one place.
+    Borrow the pooled connection for a block of work.
+
+    Commits on success, rolls back on error and always releases the connection.
     """
     conn = get_db_connection(db_path)
-    cursor = conn.cursor()
+    try:
+        yield conn
+        if conn.in_transaction:
+            conn.commit()
+    except BaseException:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+    finally:
+        conn.close()
 
-    # Core session management
-    cursor.executescript(
-        """
-        CREATE TABLE IF NOT EXISTS sessions (
-            id INTEGER PRIMARY KEY,
-            started_at TEXT,
-            ended_at TEXT,
-            feature_id TEXT,
-            success BOOLEAN,
-            changes JSON,
-            errors JSON
-        );
 
-        CREATE TABLE IF NOT EXISTS features (
-            id TEXT PRIMARY KEY,
-            description TEXT,
-            acceptance_criteria TEXT,
-            status TEXT DEFAULT 'pending',
-            created_at TEXT,
-            completed_at TEXT,
-            started_at TEXT,
-            assigned_to TEXT,
-            priority INTEGER DEFAULT 0,
-            tags JSON,
-            metadata JSON
-        );
+@contextmanager
+def transaction(db_path: str | Path) -> Iterator[sqlite3.Connection]:
+    """
+    Explicit write transaction (BEGIN IMMEDIATE) on the pooled connection.
 
-        CREATE TABLE IF NOT EXISTS checkpoints (
-            id INTEGER PRIMARY KEY,
-            feature_id TEXT,
-            timestamp TEXT,
-            validation_passed BOOLEAN,
-            build_passed BOOLEAN,
-            git_hash TEXT,
-            evidence JSON
-        );
+    The write lock is taken up front so read-then-write sequences cannot fail
+    halfway with SQLITE_BUSY. Nested use joins the outer transaction.
+    """
+    conn = get_db_connection(db_path)
+    try:
+        if conn.in_transaction:
+            yield conn
+            return
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+    finally:
+        conn.close()
 
-        CREATE TABLE IF NOT EXISTS context (
-            id INTEGER PRIMARY KEY,
-            session_id INTEGER,
-            key TEXT,
-            value TEXT,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP
-        );
 
-        -- Spec-kit style tables
-        CREATE TABLE IF NOT EXISTS tasks (
-            id INTEGER PRIMARY KEY,
+def close_connections() -> None:
+    """Close every pooled connection owned by the current thread"""
+    connections = _thread_pool()
+    while connections:
+        _key, conn = connections.popitem()
+        conn.dispose()
+
+
+atexit.register(close_connections)
+
+
+def _execute_script(conn: sqlite3.Connection, script: str) -> None:
+    """
+    Run a multi-statement SQL script inside the caller's transaction.
+
+    Unlike Connection.executescript this does not COMMIT first, so a whole
+    migration step is applied atomically together with its version bump.
+    """
+    statement = ""
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            conn.execute(statement)
+            statement = ""
+
+
+def _table_columns(conn: sqlite3.Connection, table: str) -> set:
+    """Column names of a table (empty if the table does not exist)"""
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()}
+
+
+def _add_missing_columns(conn: sqlite3.Connection, table: str, columns: List[Tuple[str, str]]) -> None:
+    """ALTER TABLE ADD COLUMN for each (name, type) the table does not have yet"""
+    existing = _table_columns(conn, table)
+    for name, column_type in columns:
+        if name not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
+
+
+_CORE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS sessions (
+        id INTEGER PRIMARY KEY,
+        started_at TEXT,
+        ended_at TEXT,
+        feature_id TEXT,
+        success BOOLEAN,
+        changes JSON,
+        errors JSON
+    );
+
+    CREATE TABLE IF NOT EXISTS features (
+        id TEXT PRIMARY KEY,
+        description TEXT,
+        acceptance_criteria TEXT,
+        status TEXT DEFAULT 'pending',
+        created_at TEXT,
+        completed_at TEXT,
+        started_at TEXT,
+        assigned_to TEXT,
+        priority INTEGER DEFAULT 0,
+        tags JSON,
+        metadata JSON
+    );
+
+    CREATE TABLE IF NOT EXISTS checkpoints (
+        id INTEGER PRIMARY KEY,
+        feature_id TEXT,
+        timestamp TEXT,
+        validation_passed BOOLEAN,
+        build_passed BOOLEAN,
+        git_hash TEXT,
+        evidence JSON
+    );
+
+    CREATE TABLE IF NOT EXISTS context (
+        id INTEGER PRIMARY KEY,
+        session_id INTEGER,
+        key TEXT,
+        value TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    );
+
+    -- Spec-kit style tables
+    CREATE TABLE IF NOT EXISTS tasks (
+        id INTEGER PRIMARY KEY,
+        feature_id TEXT,
+        phase_id TEXT,
+        description TEXT,
+        status TEXT DEFAULT 'pending',
+        can_parallel BOOLEAN DEFAULT 0,
+        order_index INTEGER,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        completed_at TEXT,
+        FOREIGN KEY (feature_id) REFERENCES features (id)
+    );
+
+    CREATE TABLE IF NOT EXISTS project_phases (
+        id TEXT PRIMARY KEY,
+        name TEXT,
+        description TEXT,
+        status TEXT DEFAULT 'pending',
+        order_index INTEGER,
+        started_at TEXT,
+        completed_at TEXT
+    );
+
+    CREATE TABLE IF NOT EXISTS workflow_state (
+        id INTEGER PRIMARY KEY,
+        feature_id TEXT,
+        current_state TEXT,
+        locked_by TEXT,
+        locked_at TEXT,
+        data JSON,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (feature_id) REFERENCES features (id)
+    );
+
+    CREATE TABLE IF NOT EXISTS workflow_checkpoints (
+        id INTEGER PRIMARY KEY,
+        workflow_id INTEGER,
+        state TEXT,
+        timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
+        data JSON,
+        FOREIGN KEY (workflow_id) REFERENCES workflow_state (id)
+    );
+
+    -- Hallucination and drift tracking
+    CREATE TABLE IF NOT EXISTS hallucination_log (
+        id INTEGER PRIMARY KEY,
+        timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
+        claim TEXT,
+        actual TEXT,
+        detected_by TEXT,
+        severity TEXT
+    );
+
+    CREATE TABLE IF NOT EXISTS drift_log (
+        id INTEGER PRIMARY KEY,
+        timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
+        expected TEXT,
+        actual TEXT,
+        component TEXT,
+        resolved BOOLEAN DEFAULT 0
+    );
+
+    -- Query resolution for spec ambiguities
+    CREATE TABLE IF NOT EXISTS workflow_queries (
+        id INTEGER PRIMARY KEY,
+        workflow_id INTEGER,
+        query TEXT,
+        response TEXT,
+        resolved_at TEXT,
+        FOREIGN KEY (workflow_id) REFERENCES workflow_state (id)
+    );
+
+    -- Constitution storage (immutable principles)
+    CREATE TABLE IF NOT EXISTS constitution (
+        id INTEGER PRIMARY KEY,
+        principle TEXT UNIQUE,
+        category TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        immutable BOOLEAN DEFAULT 1
+    );
+
+    -- API contract storage
+    CREATE TABLE IF NOT EXISTS api_contracts (
+        id INTEGER PRIMARY KEY,
+        feature_id TEXT,
+        endpoint TEXT,
+        method TEXT,
+        description TEXT,
+        request_schema JSON,
+        response_schema JSON,
+        auth_required BOOLEAN,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (feature_id) REFERENCES features (id)
+    );
+
+    -- Gap analysis and tracking
+    CREATE TABLE IF NOT EXISTS gap_analysis (
+        id INTEGER PRIMARY KEY,
+        feature_id TEXT,
+        gap_category TEXT,
+        gap_title TEXT,
+        original_issue TEXT,
+        current_status TEXT CHECK (current_status IN ('solved', 'partial', 'missing')),
+        mitigation_strategy TEXT,
+        priority TEXT CHECK (priority IN ('high', 'medium', 'low', 'critical')),
+        target_version TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (feature_id) REFERENCES features (id)
+    );
+
+    -- Multi-agent coordination
+    CREATE TABLE IF NOT EXISTS agent_sessions (
+        id INTEGER PRIMARY KEY,
+        session_id INTEGER,
+        agent_type TEXT,
+        agent_role TEXT,
+        status TEXT DEFAULT 'active',
+        started_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        completed_at TEXT,
+        handoff_data JSON,
+        FOREIGN KEY (session_id) REFERENCES sessions (id)
+    );
+
+    CREATE TABLE IF NOT EXISTS agent_handoffs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        from_agent TEXT,
+        to_agent TEXT,
+        task_description TEXT,
+        context TEXT,
+        status TEXT DEFAULT 'pending',
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        completed_at TEXT
+    );
+
+    -- Git worktree management
+    CREATE TABLE IF NOT EXISTS git_worktrees (
+        id INTEGER PRIMARY KEY,
+        feature_id TEXT,
+        worktree_path TEXT,
+        branch_name TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        cleaned_up_at TEXT,
+        status TEXT DEFAULT 'active',
+        FOREIGN KEY (feature_id) REFERENCES features (id)
+    );
+
+    -- Technology stack bootstrapping
+    CREATE TABLE IF NOT EXISTS stack_templates (
+        id INTEGER PRIMARY KEY,
+        stack_type TEXT,
+        language TEXT,
+        framework TEXT,
+        template_path TEXT,
+        bootstrap_commands JSON,
+        dependencies JSON,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE TABLE IF NOT EXISTS project_scaffolds (
+        id INTEGER PRIMARY KEY,
+        project_id TEXT,
+        stack_template_id INTEGER,
+        generated_files JSON,
+        status TEXT DEFAULT 'active',
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (stack_template_id) REFERENCES stack_templates (id)
+    );
+
+    -- Create indexes for better performance
+    CREATE INDEX IF NOT EXISTS idx_sessions_feature ON sessions(feature_id);
+    CREATE INDEX IF NOT EXISTS idx_tasks_feature ON tasks(feature_id);
+    CREATE INDEX IF NOT EXISTS idx_workflow_state_feature ON workflow_state(feature_id);
+    CREATE INDEX IF NOT EXISTS idx_api_contracts_feature ON api_contracts(feature_id);
+    CREATE INDEX IF NOT EXISTS idx_gap_analysis_feature ON gap_analysis(feature_id);
+    CREATE INDEX IF NOT EXISTS idx_agent_sessions_session ON agent_sessions(session_id);
+    CREATE INDEX IF NOT EXISTS idx_git_worktrees_feature ON git_worktrees(feature_id);
+
+-- Key/value memory store
+CREATE TABLE IF NOT EXISTS memory (
+    key TEXT PRIMARY KEY,
+    value JSON,
+    updated_at TEXT
+);
+"""
+
+
+def _migration_core_schema(conn: sqlite3.Connection) -> None:
+    """Core tables (formerly init_database + RFD._init_database)"""
+    _execute_script(conn, _CORE_SCHEMA)
+
+
+def _migration_feature_tracking(conn: sqlite3.Connection) -> None:
+    """Feature lifecycle columns and progress log (formerly FeatureManager._ensure_tables)"""
+    _add_missing_columns(
+        conn,
+        "features",
+        [
+            ("started_at", "TEXT"),
+            ("acceptance_criteria", "TEXT"),
+            ("assigned_to", "TEXT"),
+            ("priority", "INTEGER DEFAULT 0"),
+            ("tags", "JSON"),
+            ("metadata", "JSON"),
+        ],
+    )
+    _execute_script(
+        conn,
+        """
+        CREATE TABLE IF NOT EXISTS feature_progress (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
             feature_id TEXT,
-            phase_id TEXT,
-            description TEXT,
-            status TEXT DEFAULT 'pending',
-            can_parallel BOOLEAN DEFAULT 0,
-            order_index INTEGER,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            completed_at TEXT,
-            FOREIGN KEY (feature_id) REFERENCES features (id)
+            timestamp TEXT,
+            event_type TEXT,  -- started, progress, blocked, completed
+            message TEXT,
+            data JSON,
+            FOREIGN KEY (feature_id) REFERENCES features(id)
         );
+        """,
+    )
 
-        CREATE TABLE IF NOT EXISTS project_phases (
-            id TEXT PRIMARY KEY,
-            name TEXT,
-            description TEXT,
-            status TEXT DEFAULT 'pending',
-            order_index INTEGER,
-            started_at TEXT,
-            completed_at TEXT
-        );
 
+def _migration_gated_workflow(conn: sqlite3.Connection) -> None:
+    """Gated workflow tables (formerly GatedWorkflow._init_workflow_tables)"""
+    _execute_script(
+        conn,
+        """
         CREATE TABLE IF NOT EXISTS workflow_state (
-            id INTEGER PRIMARY KEY,
-            feature_id TEXT,
-            current_state TEXT,
-            locked_by TEXT,
+            feature_id TEXT PRIMARY KEY,
+            current_state TEXT NOT NULL,
+            locked_by TEXT,  -- Session/user that has lock
             locked_at TEXT,
-            data JSON,
-            updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (feature_id) REFERENCES features (id)
+            created_at TEXT,
+            updated_at TEXT
         );
 
         CREATE TABLE IF NOT EXISTS workflow_checkpoints (
-            id INTEGER PRIMARY KEY,
-            workflow_id INTEGER,
-            state TEXT,
-            timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
-            data JSON,
-            FOREIGN KEY (workflow_id) REFERENCES workflow_state (id)
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            feature_id TEXT NOT NULL,
+            state TEXT NOT NULL,
+            passed BOOLEAN DEFAULT 0,
+            validation_data JSON,
+            timestamp TEXT,
+            FOREIGN KEY (feature_id) REFERENCES features(id)
         );
 
-        -- Hallucination and drift tracking
-        CREATE TABLE IF NOT EXISTS hallucination_log (
-            id INTEGER PRIMARY KEY,
-            timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
-            claim TEXT,
-            actual TEXT,
-            detected_by TEXT,
-            severity TEXT
+        CREATE TABLE IF NOT EXISTS workflow_queries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            feature_id TEXT NOT NULL,
+            state TEXT NOT NULL,
+            query TEXT NOT NULL,
+            answer TEXT,
+            resolved BOOLEAN DEFAULT 0,
+            timestamp TEXT,
+            FOREIGN KEY (feature_id) REFERENCES features(id)
         );
 
         CREATE TABLE IF NOT EXISTS drift_log (
-            id INTEGER PRIMARY KEY,
-            timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
-            expected TEXT,
-            actual TEXT,
-            component TEXT,
-            resolved BOOLEAN DEFAULT 0
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            feature_id TEXT,
+            session_id TEXT,
+            attempted_action TEXT,
+            blocked_reason TEXT,
+            timestamp TEXT
         );
 
-        -- Query resolution for spec ambiguities
-        CREATE TABLE IF NOT EXISTS workflow_queries (
-            id INTEGER PRIMARY KEY,
-            workflow_id INTEGER,
-            query TEXT,
-            response TEXT,
-            resolved_at TEXT,
-            FOREIGN KEY (workflow_id) REFERENCES workflow_state (id)
+        CREATE TABLE IF NOT EXISTS hallucination_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT,
+            claim_type TEXT,
+            claim TEXT,
+            reason TEXT
         );
+        """,
+    )
 
-        -- Constitution storage (immutable principles)
-        CREATE TABLE IF NOT EXISTS constitution (
-            id INTEGER PRIMARY KEY,
-            principle TEXT UNIQUE,
-            category TEXT,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            immutable BOOLEAN DEFAULT 1
-        );
 
-        -- API contract storage
-        CREATE TABLE IF NOT EXISTS api_contracts (
-            id INTEGER PRIMARY KEY,
+def _migration_enforcement(conn: sqlite3.Connection) -> None:
+    """Enforcement and agent coordination tables (formerly WorkflowEnforcer/MultiAgentCoordinator)"""
+    # Drop old agent_handoffs table if it exists with the wrong schema
+    existing = conn.execute("SELECT sql FROM sqlite_master WHERE name='agent_handoffs'").fetchone()
+    if existing and "from_agent TEXT" not in existing[0]:
+        conn.execute("DROP TABLE agent_handoffs")
+
+    _execute_script(
+        conn,
+        """
+        CREATE TABLE IF NOT EXISTS violations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
             feature_id TEXT,
-            endpoint TEXT,
-            method TEXT,
+            violation_type TEXT,
             description TEXT,
-            request_schema JSON,
-            response_schema JSON,
-            auth_required BOOLEAN,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (feature_id) REFERENCES features (id)
+            file_path TEXT,
+            prevented BOOLEAN DEFAULT 0
         );
 
-        -- Gap analysis and tracking
-        CREATE TABLE IF NOT EXISTS gap_analysis (
-            id INTEGER PRIMARY KEY,
-            feature_id TEXT,
-            gap_category TEXT,
-            gap_title TEXT,
-            original_issue TEXT,
-            current_status TEXT CHECK (current_status IN ('solved', 'partial', 'missing')),
-            mitigation_strategy TEXT,
-            priority TEXT CHECK (priority IN ('high', 'medium', 'low', 'critical')),
-            target_version TEXT,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (feature_id) REFERENCES features (id)
+        CREATE TABLE IF NOT EXISTS enforcement_status (
+            feature_id TEXT PRIMARY KEY,
+            active BOOLEAN DEFAULT 0,
+            started_at TEXT,
+            scope_baseline TEXT
         );
 
-        -- Multi-agent coordination
-        CREATE TABLE IF NOT EXISTS agent_sessions (
-            id INTEGER PRIMARY KEY,
-            session_id INTEGER,
-            agent_type TEXT,
-            agent_role TEXT,
-            status TEXT DEFAULT 'active',
-            started_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            completed_at TEXT,
-            handoff_data JSON,
-            FOREIGN KEY (session_id) REFERENCES sessions (id)
+        CREATE TABLE IF NOT EXISTS agents (
+            agent_id TEXT PRIMARY KEY,
+            capabilities TEXT,
+            status TEXT DEFAULT 'idle',
+            registered_at TEXT DEFAULT CURRENT_TIMESTAMP
         );
 
         CREATE TABLE IF NOT EXISTS agent_handoffs (
@@ -231,54 +575,176 @@ def init_database(db_path: str | Path) -> None:
             created_at TEXT DEFAULT CURRENT_TIMESTAMP,
             completed_at TEXT
         );
+        """,
+    )
 
-        -- Git worktree management
-        CREATE TABLE IF NOT EXISTS git_worktrees (
-            id INTEGER PRIMARY KEY,
-            feature_id TEXT,
-            worktree_path TEXT,
-            branch_name TEXT,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            cleaned_up_at TEXT,
-            status TEXT DEFAULT 'active',
-            FOREIGN KEY (feature_id) REFERENCES features (id)
+
+def _migration_qa_cycles(conn: sqlite3.Connection) -> None:
+    """QA cycle and review tables (formerly RFDMigration.create_qa_tables)"""
+    _execute_script(
+        conn,
+        """
+        CREATE TABLE IF NOT EXISTS qa_cycles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            feature_id TEXT NOT NULL,
+            cycle_number INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            started_at DATETIME NOT NULL,
+            completed_at DATETIME,
+            FOREIGN KEY (feature_id) REFERENCES features(id)
         );
 
-        -- Technology stack bootstrapping
-        CREATE TABLE IF NOT EXISTS stack_templates (
-            id INTEGER PRIMARY KEY,
-            stack_type TEXT,
-            language TEXT,
-            framework TEXT,
-            template_path TEXT,
-            bootstrap_commands JSON,
-            dependencies JSON,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        CREATE TABLE IF NOT EXISTS review_results (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            cycle_id INTEGER NOT NULL,
+            review_type TEXT NOT NULL,
+            passed BOOLEAN NOT NULL,
+            issues TEXT,
+            suggestions TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (cycle_id) REFERENCES qa_cycles(id)
         );
+        """,
+    )
+
 
-        CREATE TABLE IF NOT EXISTS project_scaffolds (
-            id INTEGER PRIMARY KEY,
-            project_id TEXT,
-            stack_template_id INTEGER,
-            generated_files JSON,
-            status TEXT DEFAULT 'active',
+def _migration_prevention(conn: sqlite3.Connection) -> None:
+    """Prevention system tables (formerly RFDMigration.create_prevention_tables)"""
+    _add_missing_columns(conn, "features", [("name", "TEXT"), ("scope_definition", "JSON")])
+    _execute_script(
+        conn,
+        """
+        CREATE TABLE IF NOT EXISTS workflows (
+            id TEXT PRIMARY KEY,
+            spec JSON,
             created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (stack_template_id) REFERENCES stack_templates (id)
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP
         );
 
-        -- Create indexes for better performance
-        CREATE INDEX IF NOT EXISTS idx_sessions_feature ON sessions(feature_id);
-        CREATE INDEX IF NOT EXISTS idx_tasks_feature ON tasks(feature_id);
-        CREATE INDEX IF NOT EXISTS idx_workflow_state_feature ON workflow_state(feature_id);
-        CREATE INDEX IF NOT EXISTS idx_api_contracts_feature ON api_contracts(feature_id);
-        CREATE INDEX IF NOT EXISTS idx_gap_analysis_feature ON gap_analysis(feature_id);
-        CREATE INDEX IF NOT EXISTS idx_agent_sessions_session ON agent_sessions(session_id);
-        CREATE INDEX IF NOT EXISTS idx_git_worktrees_feature ON git_worktrees(feature_id);
-    """
+        CREATE TABLE IF NOT EXISTS prevention_stats (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            file_path TEXT,
+            validation_type TEXT,
+            violations JSON,
+            prevented BOOLEAN,
+            timestamp TEXT DEFAULT CURRENT_TIMESTAMP
+        );
+        """,
+    )
+
+
+def _migration_live_checks(conn: sqlite3.Connection) -> None:
+    """Latest results pushed by the file watcher (`rfd watch`), read by `rfd status`"""
+    _execute_script(
+        conn,
+        """
+        CREATE TABLE IF NOT EXISTS live_checks (
+            name TEXT PRIMARY KEY,
+            passed BOOLEAN,
+            summary TEXT,
+            details JSON,
+            updated_at TEXT
+        );
+        """,
+    )
+
+
+def _migration_test_history(conn: sqlite3.Connection) -> None:
+    """Per-test outcomes and durations from runner reports, read by `rfd perf tests`"""
+    _execute_script(
+        conn,
+        """
+        CREATE TABLE IF NOT EXISTS test_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            started_at TEXT,
+            runner TEXT,
+            scope TEXT,
+            git_hash TEXT,
+            fingerprint TEXT,
+            checkpoint_id INTEGER,
+            passed BOOLEAN,
+            total INTEGER,
+            failed INTEGER,
+            skipped INTEGER,
+            seconds REAL
+        );
+
+        CREATE TABLE IF NOT EXISTS test_results (
+            run_id INTEGER NOT NULL,
+            test_id TEXT NOT NULL,
+            file TEXT,
+            outcome TEXT,
+            seconds REAL,
+            FOREIGN KEY (run_id) REFERENCES test_runs(id)
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_test_results_run ON test_results(run_id);
+        CREATE INDEX IF NOT EXISTS idx_test_results_test ON test_results(test_id);
+        CREATE INDEX IF NOT EXISTS idx_test_runs_checkpoint ON test_runs(checkpoint_id);
+        """,
     )
 
-    conn.commit()
-    conn.close()
+
+# Ordered schema migrations. Entry N upgrades a database from PRAGMA user_version N to N+1.
+# Steps are applied exactly once per database - never edit a shipped step, append a new one.
+# Every step must also be safe on pre-versioning databases (user_version 0 with tables present).
+SCHEMA_MIGRATIONS: List[Tuple[str, Callable[[sqlite3.Connection], None]]] = [
+    ("core schema", _migration_core_schema),
+    ("feature tracking", _migration_feature_tracking),
+    ("gated workflow", _migration_gated_workflow),
+    ("enforcement and agent coordination", _migration_enforcement),
+    ("qa cycles", _migration_qa_cycles),
+    ("prevention", _migration_prevention),
+    ("live checks", _migration_live_checks),
+    ("test history", _migration_test_history),
+]
+
+SCHEMA_VERSION = len(SCHEMA_MIGRATIONS)
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Read the schema version stored in PRAGMA user_version"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def init_database(db_path: str | Path) -> int:
+    """
+    Initialize the RFD database with all required tables.
+
+    Applies any pending steps from SCHEMA_MIGRATIONS and records progress in
+    PRAGMA user_version. When the database is already current this is a single
+    pragma read - no DDL and no write lock.
+
+    Returns:
+        The schema version the database is at
+    """
+    with db_connection(db_path) as conn:
+        version = get_schema_version(conn)
+    if version >= SCHEMA_VERSION:
+        return version
+
+    # Migrate on a dedicated connection so the explicit transaction handling
+    # (isolation_level=None) never leaks into the pool
+    conn = sqlite3.connect(str(db_path), timeout=30.0)
+    try:
+        _configure_connection(conn)
+        conn.isolation_level = None
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Re-read under the write lock - another process may have migrated meanwhile
+            version = get_schema_version(conn)
+            for target, (_description, migration) in enumerate(SCHEMA_MIGRATIONS[version:], start=version + 1):
+                migration(conn)
+                conn.execute(f"PRAGMA user_version = {target}")
+                version = target
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.close()
+
+    return version
 
 
 def migrate_to_wal(db_path: str | Path) -> bool:
@@ -329,57 +795,56 @@ def verify_database_integrity(db_path: str | Path) -> bool:
         True if database is healthy
     """
     try:
-        conn = get_db_connection(db_path)
-        cursor = conn.cursor()
-
-        # Check integrity
-        result = cursor.execute("PRAGMA integrity_check").fetchone()
-        if result[0] != "ok":
-            print(f"Database integrity check failed: {result[0]}")
-            return False
-
-        # Verify all required tables exist
-        required_tables = [
-            "sessions",
-            "features",
-            "checkpoints",
-            "context",
-            "tasks",
-            "project_phases",
-            "workflow_state",
-            "hallucination_log",
-            "drift_log",
-            "constitution",
-            "api_contracts",
-            "gap_analysis",
-            "agent_sessions",
-            "agent_handoffs",
-            "git_worktrees",
-            "stack_templates",
-            "project_scaffolds",
-        ]
-
-        cursor.execute(
+        with db_connection(db_path) as conn:
+            cursor = conn.cursor()
+
+            # Check integrity
+            result = cursor.execute("PRAGMA integrity_check").fetchone()
+            if result[0] != "ok":
+                print(f"Database integrity check failed: {result[0]}")
+                return False
+
+            # Verify all required tables exist
+            required_tables = [
+                "sessions",
+                "features",
+                "checkpoints",
+                "context",
+                "tasks",
+                "project_phases",
+                "workflow_state",
+                "hallucination_log",
+                "drift_log",
+                "constitution",
+                "api_contracts",
+                "gap_analysis",
+                "agent_sessions",
+                "agent_handoffs",
+                "git_worktrees",
+                "stack_templates",
+                "project_scaffolds",
+            ]
+
+            cursor.execute(
+                """
+                SELECT name FROM sqlite_master
+                WHERE type='table' AND name NOT LIKE 'sqlite_%'
             """
-            SELECT name FROM sqlite_master
-            WHERE type='table' AND name NOT LIKE 'sqlite_%'
-        """
-        )
-        existing_tables = {row[0] for row in cursor.fetchall()}
+            )
+            existing_tables = {row[0] for row in cursor.fetchall()}
 
-        missing_tables = set(required_tables) - existing_tables
-        if missing_tables:
-            print(f"Missing tables: {missing_tables}")
-            return False
+            missing_tables = set(required_tables) - existing_tables
+            if missing_tables:
+                print(f"Missing tables: {missing_tables}")
+                return False
 
-        # Check WAL mode
-        result = cursor.execute("PRAGMA journal_mode").fetchone()
-        if result[0].lower() != "wal":
-            print(f"Database not in WAL mode: {result[0]}")
-            return False
+            # Check WAL mode
+            result = cursor.execute("PRAGMA journal_mode").fetchone()
+            if result[0].lower() != "wal":
+                print(f"Database not in WAL mode: {result[0]}")
+                return False
 
-        conn.close()
-        return True
+            return True
 
     except Exception as e:
         print(f"Database verification error: {e}")
@@ -5,10 +5,11 @@ Real-time workflow enforcement with actual database integration
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
-from .db_utils import get_db_connection
+from .db_utils import get_db_connection, init_database, transaction
 from .rfd import RFD
+from .scope_matcher import MatcherCache
 
 
 class WorkflowEnforcer:
@@ -18,42 +19,12 @@ class WorkflowEnforcer:
 
     def __init__(self, rfd: Optional[RFD] = None):
         self.rfd = rfd or RFD()
+        self._matchers = MatcherCache(self.rfd.rfd_dir / "cache" / "scope.json")
         self._ensure_tables()
 
     def _ensure_tables(self):
         """Create enforcement tables if they don't exist"""
-        conn = get_db_connection(self.rfd.db_path)
-        try:
-            # Violations table
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS violations (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
-                    feature_id TEXT,
-                    violation_type TEXT,
-                    description TEXT,
-                    file_path TEXT,
-                    prevented BOOLEAN DEFAULT 0
-                )
-            """
-            )
-
-            # Enforcement status
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS enforcement_status (
-                    feature_id TEXT PRIMARY KEY,
-                    active BOOLEAN DEFAULT 0,
-                    started_at TEXT,
-                    scope_baseline TEXT
-                )
-            """
-            )
-
-            conn.commit()
-        finally:
-            conn.close()
+        init_database(self.rfd.db_path)
 
     def start_enforcement(self, feature_id: str) -> Dict[str, Any]:
         """Start enforcement for a feature"""
@@ -96,46 +67,65 @@ class WorkflowEnforcer:
 
     def validate_change(self, file_path: str, feature_id: str) -> Dict[str, Any]:
         """Validate a file change against specs"""
+        return self.check_paths([file_path], feature_id)[file_path]
+
+    def check_paths(self, paths: Iterable[str], feature_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Validate many file changes against specs in one call.
+
+        The enforcement status is read once, the baseline's patterns are
+        compiled into a single matcher, and every out-of-scope path is logged
+        in one transaction.
+        """
+        paths = list(paths)
         conn = get_db_connection(self.rfd.db_path)
         try:
             # Check enforcement status
             status = conn.execute(
                 "SELECT active, scope_baseline FROM enforcement_status WHERE feature_id = ?", (feature_id,)
             ).fetchone()
+        finally:
+            conn.close()
 
-            if not status or not status[0]:
-                return {"allowed": True, "reason": "Enforcement not active"}
-
-            # Check if file is in scope
-            baseline = json.loads(status[1]) if status[1] else {}
-            allowed_paths = baseline.get("paths", [])
-
-            file_p = Path(file_path)
-            in_scope = any(file_p.match(pattern) or str(file_p).startswith(pattern) for pattern in allowed_paths)
+        if not status or not status[0]:
+            return {path: {"allowed": True, "reason": "Enforcement not active"} for path in paths}
+
+        # Baseline entries are both directory prefixes and Path.match globs
+        baseline = json.loads(status[1]) if status[1] else {}
+        allowed_paths = baseline.get("paths", [])
+        matcher = self._matchers.get(prefixes=allowed_paths, globs=allowed_paths)
+
+        results = {}
+        out_of_scope = []
+        for file_path in paths:
+            if matcher.match(str(Path(file_path))):
+                results[file_path] = {"allowed": True, "reason": "Change within scope"}
+            else:
+                out_of_scope.append(file_path)
+                results[file_path] = {
+                    "allowed": False,
+                    "reason": f"File {file_path} is out of scope for feature {feature_id}",
+                }
 
-            if not in_scope:
-                # Log violation
-                conn.execute(
+        if out_of_scope:
+            # Log violations
+            with transaction(self.rfd.db_path) as db:
+                db.executemany(
                     """
                     INSERT INTO violations
                     (feature_id, violation_type, description, file_path, prevented)
                     VALUES (?, 'out_of_scope', ?, ?, 1)
                 """,
-                    (feature_id, f"File {file_path} not in feature scope", file_path),
+                    [(feature_id, f"File {path} not in feature scope", path) for path in out_of_scope],
                 )
-                conn.commit()
 
-                return {"allowed": False, "reason": f"File {file_path} is out of scope for feature {feature_id}"}
-
-            return {"allowed": True, "reason": "Change within scope"}
-        finally:
-            conn.close()
+        return results
 
     def _capture_baseline(self) -> Dict[str, Any]:
         """Capture current state as baseline"""
         # Get current files
-        src_files = list(Path("src").glob("**/*.py")) if Path("src").exists() else []
-        test_files = list(Path("tests").glob("**/*.py")) if Path("tests").exists() else []
+        src_files = self.rfd.project_files.under("src", ".py")
+        test_files = self.rfd.project_files.under("tests", ".py")
 
         return {
             "paths": ["src/", "tests/", ".rfd/"],
@@ -198,43 +188,7 @@ class MultiAgentCoordinator:
 
     def _ensure_tables(self):
         """Create agent coordination tables"""
-        conn = get_db_connection(self.rfd.db_path)
-        try:
-            # Drop old table if it exists with wrong schema
-            cursor = conn.execute("SELECT sql FROM sqlite_master WHERE name='agent_handoffs'")
-            existing = cursor.fetchone()
-            if existing and "from_agent TEXT" not in existing[0]:
-                conn.execute("DROP TABLE agent_handoffs")
-
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS agents (
-                    agent_id TEXT PRIMARY KEY,
-                    capabilities TEXT,
-                    status TEXT DEFAULT 'idle',
-                    registered_at TEXT DEFAULT CURRENT_TIMESTAMP
-                )
-            """
-            )
-
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS agent_handoffs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    from_agent TEXT,
-                    to_agent TEXT,
-                    task_description TEXT,
-                    context TEXT,
-                    status TEXT DEFAULT 'pending',
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                    completed_at TEXT
-                )
-            """
-            )
-
-            conn.commit()
-        finally:
-            conn.close()
+        init_database(self.rfd.db_path)
 
     def register_agent(self, agent_id: str, capabilities: List[str]) -> Dict[str, Any]:
         """Register an agent"""
@@ -293,13 +247,14 @@ class MultiAgentCoordinator:
         finally:
             conn.close()
 
-    def trigger_review(self, trigger_type: str, feature_id: str) -> Dict[str, Any]:
+    def trigger_review(self, trigger_type: str, feature_id: str, affected_only: bool = False) -> Dict[str, Any]:
         """
         Trigger automated review based on event type
 
         Args:
             trigger_type: 'pre_commit' or 'post_build'
             feature_id: Feature being reviewed
+            affected_only: post_build runs only the tests affected by changes since the last passing checkpoint
 
         Returns:
             Review results with pass/fail status
@@ -339,7 +294,7 @@ class MultiAgentCoordinator:
             elif trigger_type == "post_build":
                 # Check build status
                 builder = BuildEngine(self.rfd)
-                if not builder.run_tests():
+                if not builder.check_tests(affected=affected_only)["passing"]:
                     results["passed"] = False
                     results["issues"].append("Tests failed")
                     results["suggestions"].append("Fix failing tests before proceeding")
@@ -10,6 +10,8 @@ from typing import Any, Dict, List, Optional
 
 import click
 
+from .db_utils import get_db_connection
+
 
 class FeatureManager:
     """Manages features directly in the database - no markdown files!"""
@@ -20,7 +22,7 @@ class FeatureManager:
 
     def _ensure_schema(self):
         """Ensure the database has the tables we need"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_db_connection(self.db_path, foreign_keys=False)
         # Features table already exists, just ensure it's there
         conn.execute(
             """
@@ -47,7 +49,7 @@ class FeatureManager:
         self, feature_id: str, description: str, acceptance: str, priority: int = 0, assigned_to: Optional[str] = None
     ) -> bool:
         """Add a new feature to the database"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_db_connection(self.db_path, foreign_keys=False)
         try:
             conn.execute(
                 """
@@ -67,8 +69,7 @@ class FeatureManager:
 
     def list_features(self) -> List[Dict[str, Any]]:
         """List all features from the database"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = get_db_connection(self.db_path, foreign_keys=False)
         cursor = conn.execute(
             """
             SELECT id, description, status, priority, assigned_to,
@@ -92,8 +93,7 @@ class FeatureManager:
 
     def get_feature(self, feature_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific feature from the database"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = get_db_connection(self.db_path, foreign_keys=False)
         cursor = conn.execute(
             """
             SELECT * FROM features WHERE id = ?
@@ -110,7 +110,7 @@ class FeatureManager:
         if status not in valid_statuses:
             return False
 
-        conn = sqlite3.connect(self.db_path)
+        conn = get_db_connection(self.db_path, foreign_keys=False)
         timestamp_field = None
         timestamp_value = None
 
@@ -122,7 +122,7 @@ class FeatureManager:
             timestamp_value = datetime.now().isoformat()
 
         if timestamp_field:
-            conn.execute(
+            cursor = conn.execute(
                 f"""
                 UPDATE features
                 SET status = ?, {timestamp_field} = ?
@@ -131,7 +131,7 @@ class FeatureManager:
                 (status, timestamp_value, feature_id),
             )
         else:
-            conn.execute(
+            cursor = conn.execute(
                 """
                 UPDATE features
                 SET status = ?
@@ -140,23 +140,24 @@ class FeatureManager:
                 (status, feature_id),
             )
 
-        changes = conn.total_changes
+        changes = cursor.rowcount
         conn.commit()
         conn.close()
         return changes > 0
 
     def delete_feature(self, feature_id: str) -> bool:
         """Delete a feature from the database"""
-        conn = sqlite3.connect(self.db_path)
-        conn.execute("DELETE FROM features WHERE id = ?", (feature_id,))
-        changes = conn.total_changes
-        conn.commit()
-        conn.close()
-        return changes > 0
+        conn = get_db_connection(self.db_path, foreign_keys=False)
+        try:
+            cursor = conn.execute("DELETE FROM features WHERE id = ?", (feature_id,))
+            conn.commit()
+            return cursor.rowcount > 0
+        finally:
+            conn.close()
 
     def get_progress_summary(self) -> Dict[str, int]:
         """Get feature progress summary from database"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_db_connection(self.db_path, foreign_keys=False)
         cursor = conn.execute(
             """
             SELECT status, COUNT(*) as count
@@ -194,7 +195,7 @@ def create_feature_commands(cli, rfd_class):
     @click.pass_context
     def feature_add(ctx, feature_id, description, acceptance, priority, assign):
         """Add a new feature to the database"""
-        rfd = rfd_class()
+        rfd = ctx.find_object(rfd_class) or rfd_class()
         manager = FeatureManager(rfd.db_path)
 
         if not acceptance:
@@ -218,7 +219,7 @@ def create_feature_commands(cli, rfd_class):
     @click.pass_context
     def feature_list(ctx, status, format):
         """List all features from the database"""
-        rfd = rfd_class()
+        rfd = ctx.find_object(rfd_class) or rfd_class()
         manager = FeatureManager(rfd.db_path)
         features = manager.list_features()
 
@@ -262,7 +263,7 @@ def create_feature_commands(cli, rfd_class):
     @click.pass_context
     def feature_show(ctx, feature_id):
         """Show details of a specific feature"""
-        rfd = rfd_class()
+        rfd = ctx.find_object(rfd_class) or rfd_class()
         manager = FeatureManager(rfd.db_path)
         feature = manager.get_feature(feature_id)
 
@@ -293,7 +294,7 @@ def create_feature_commands(cli, rfd_class):
     @click.pass_context
     def feature_start(ctx, feature_id):
         """Start working on a feature"""
-        rfd = rfd_class()
+        rfd = ctx.find_object(rfd_class) or rfd_class()
         manager = FeatureManager(rfd.db_path)
 
         if manager.update_status(feature_id, "building"):
@@ -308,7 +309,7 @@ def create_feature_commands(cli, rfd_class):
     @click.pass_context
     def feature_complete(ctx, feature_id):
         """Mark a feature as complete"""
-        rfd = rfd_class()
+        rfd = ctx.find_object(rfd_class) or rfd_class()
         manager = FeatureManager(rfd.db_path)
 
         if manager.update_status(feature_id, "complete"):
@@ -328,7 +329,7 @@ def create_feature_commands(cli, rfd_class):
     @click.pass_context
     def feature_block(ctx, feature_id, reason):
         """Mark a feature as blocked"""
-        rfd = rfd_class()
+        rfd = ctx.find_object(rfd_class) or rfd_class()
         manager = FeatureManager(rfd.db_path)
 
         if manager.update_status(feature_id, "blocked"):
@@ -344,7 +345,7 @@ def create_feature_commands(cli, rfd_class):
     @click.pass_context
     def feature_delete(ctx, feature_id):
         """Delete a feature from the database"""
-        rfd = rfd_class()
+        rfd = ctx.find_object(rfd_class) or rfd_class()
         manager = FeatureManager(rfd.db_path)
 
         if manager.delete_feature(feature_id):
@@ -356,7 +357,7 @@ def create_feature_commands(cli, rfd_class):
     @click.pass_context
     def feature_progress(ctx):
         """Show overall feature progress"""
-        rfd = rfd_class()
+        rfd = ctx.find_object(rfd_class) or rfd_class()
         manager = FeatureManager(rfd.db_path)
         summary = manager.get_progress_summary()
 
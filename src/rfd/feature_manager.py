@@ -5,12 +5,13 @@ Production-ready implementation that eliminates manual PROJECT.md editing
 """
 
 import json
-import sqlite3
 from datetime import datetime
 from typing import Dict, List, Optional
 
 import frontmatter
 
+from .db_utils import get_db_connection, init_database
+
 
 class FeatureManager:
     """Manages features through their complete lifecycle"""
@@ -23,100 +24,14 @@ class FeatureManager:
 
     def _ensure_tables(self):
         """Ensure all required database tables exist"""
-        conn = sqlite3.connect(self.db_path)
-
-        # Check if features table exists and has all columns
-        cursor = conn.execute("PRAGMA table_info(features)")
-        columns = {row[1] for row in cursor.fetchall()}
-
-        if not columns:
-            # Create new table
-            conn.execute(
-                """
-                CREATE TABLE features (
-                    id TEXT PRIMARY KEY,
-                    description TEXT,
-                    acceptance_criteria TEXT,
-                    status TEXT DEFAULT 'pending',
-                    created_at TEXT,
-                    started_at TEXT,
-                    completed_at TEXT,
-                    assigned_to TEXT,
-                    priority INTEGER DEFAULT 0,
-                    tags JSON,
-                    metadata JSON
-                )
-            """
-            )
-        else:
-            # Add missing columns
-            if "started_at" not in columns:
-                conn.execute("ALTER TABLE features ADD COLUMN started_at TEXT")
-            if "acceptance_criteria" not in columns:
-                conn.execute("ALTER TABLE features ADD COLUMN acceptance_criteria TEXT")
-            if "assigned_to" not in columns:
-                conn.execute("ALTER TABLE features ADD COLUMN assigned_to TEXT")
-            if "priority" not in columns:
-                conn.execute("ALTER TABLE features ADD COLUMN priority INTEGER DEFAULT 0")
-            if "tags" not in columns:
-                conn.execute("ALTER TABLE features ADD COLUMN tags JSON")
-            if "metadata" not in columns:
-                conn.execute("ALTER TABLE features ADD COLUMN metadata JSON")
-
-        # Feature progress tracking
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS feature_progress (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                feature_id TEXT,
-                timestamp TEXT,
-                event_type TEXT,  -- started, progress, blocked, completed
-                message TEXT,
-                data JSON,
-                FOREIGN KEY (feature_id) REFERENCES features(id)
-            )
-        """
-        )
-
-        # Project phases
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS project_phases (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT,
-                description TEXT,
-                status TEXT DEFAULT 'pending',
-                started_at TEXT,
-                completed_at TEXT,
-                order_index INTEGER
-            )
-        """
-        )
-
-        # Tasks within features
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS tasks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                feature_id TEXT,
-                description TEXT,
-                status TEXT DEFAULT 'pending',
-                created_at TEXT,
-                completed_at TEXT,
-                FOREIGN KEY (feature_id) REFERENCES features(id)
-            )
-        """
-        )
-
-        conn.commit()
-        conn.close()
+        init_database(self.db_path)
 
     def _sync_from_spec(self):
         """Sync features from PROJECT.md to database"""
         spec = self.rfd.load_project_spec()
         features = spec.get("features", [])
 
-        conn = sqlite3.connect(self.db_path)
+        conn = get_db_connection(self.db_path, foreign_keys=False)
 
         for feature in features:
             # Check if feature exists
@@ -158,7 +73,7 @@ class FeatureManager:
 
     def start_feature(self, feature_id: str) -> bool:
         """Start working on a feature"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_db_connection(self.db_path, foreign_keys=False)
 
         # Update feature status
         conn.execute(
@@ -195,10 +110,39 @@ class FeatureManager:
 
     def complete_feature(self, feature_id: str, evidence: Optional[Dict] = None) -> bool:
         """Mark feature as complete"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_db_connection(self.db_path, foreign_keys=False)
+        try:
+            # Validate acceptance criteria if possible
+            if evidence and not self._validate_acceptance(feature_id, evidence):
+                conn.execute(
+                    """
+                    INSERT INTO feature_progress (
+                        feature_id, timestamp, event_type, message, data
+                    ) VALUES (?, ?, ?, ?, ?)
+                """,
+                    (
+                        feature_id,
+                        datetime.now().isoformat(),
+                        "blocked",
+                        "Acceptance criteria not met",
+                        json.dumps(evidence),
+                    ),
+                )
+                conn.commit()
+                return False
+
+            # Update feature status
+            conn.execute(
+                """
+                UPDATE features
+                SET status = 'complete',
+                    completed_at = ?
+                WHERE id = ?
+            """,
+                (datetime.now().isoformat(), feature_id),
+            )
 
-        # Validate acceptance criteria if possible
-        if evidence and not self._validate_acceptance(feature_id, evidence):
+            # Log completion
             conn.execute(
                 """
                 INSERT INTO feature_progress (
@@ -208,44 +152,15 @@ class FeatureManager:
                 (
                     feature_id,
                     datetime.now().isoformat(),
-                    "blocked",
-                    "Acceptance criteria not met",
-                    json.dumps(evidence),
+                    "completed",
+                    f"Feature {feature_id} completed successfully",
+                    json.dumps(evidence) if evidence else None,
                 ),
             )
+
             conn.commit()
+        finally:
             conn.close()
-            return False
-
-        # Update feature status
-        conn.execute(
-            """
-            UPDATE features
-            SET status = 'complete',
-                completed_at = ?
-            WHERE id = ?
-        """,
-            (datetime.now().isoformat(), feature_id),
-        )
-
-        # Log completion
-        conn.execute(
-            """
-            INSERT INTO feature_progress (
-                feature_id, timestamp, event_type, message, data
-            ) VALUES (?, ?, ?, ?, ?)
-        """,
-            (
-                feature_id,
-                datetime.now().isoformat(),
-                "completed",
-                f"Feature {feature_id} completed successfully",
-                json.dumps(evidence) if evidence else None,
-            ),
-        )
-
-        conn.commit()
-        conn.close()
 
         # Update PROJECT.md
         self._update_project_md(feature_id, "complete")
@@ -253,7 +168,7 @@ class FeatureManager:
 
     def update_progress(self, feature_id: str, message: str, data: Optional[Dict] = None):
         """Update feature progress"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_db_connection(self.db_path, foreign_keys=False)
 
         conn.execute(
             """
@@ -275,45 +190,45 @@ class FeatureManager:
 
     def get_feature_status(self, feature_id: str) -> Dict:
         """Get complete feature status from database"""
-        conn = sqlite3.connect(self.db_path)
-
-        # Get feature details
-        feature = conn.execute(
-            """
-            SELECT id, description, acceptance_criteria, status,
-                   created_at, started_at, completed_at
-            FROM features WHERE id = ?
-        """,
-            (feature_id,),
-        ).fetchone()
+        conn = get_db_connection(self.db_path, foreign_keys=False)
+        try:
+            # Get feature details
+            feature = conn.execute(
+                """
+                SELECT id, description, acceptance_criteria, status,
+                       created_at, started_at, completed_at
+                FROM features WHERE id = ?
+            """,
+                (feature_id,),
+            ).fetchone()
 
-        if not feature:
-            return {}
+            if not feature:
+                return {}
 
-        # Get progress history
-        progress = conn.execute(
-            """
-            SELECT timestamp, event_type, message, data
-            FROM feature_progress
-            WHERE feature_id = ?
-            ORDER BY timestamp DESC
-            LIMIT 10
-        """,
-            (feature_id,),
-        ).fetchall()
-
-        # Get related tasks
-        tasks = conn.execute(
-            """
-            SELECT description, status, completed_at
-            FROM tasks
-            WHERE feature_id = ?
-            ORDER BY created_at
-        """,
-            (feature_id,),
-        ).fetchall()
+            # Get progress history
+            progress = conn.execute(
+                """
+                SELECT timestamp, event_type, message, data
+                FROM feature_progress
+                WHERE feature_id = ?
+                ORDER BY timestamp DESC
+                LIMIT 10
+            """,
+                (feature_id,),
+            ).fetchall()
 
-        conn.close()
+            # Get related tasks
+            tasks = conn.execute(
+                """
+                SELECT description, status, completed_at
+                FROM tasks
+                WHERE feature_id = ?
+                ORDER BY created_at
+            """,
+                (feature_id,),
+            ).fetchall()
+        finally:
+            conn.close()
 
         return {
             "id": feature[0],
@@ -337,7 +252,7 @@ class FeatureManager:
 
     def get_all_features(self) -> List[Dict]:
         """Get all features with their current status"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_db_connection(self.db_path, foreign_keys=False)
 
         features = conn.execute(
             """
@@ -368,7 +283,7 @@ class FeatureManager:
 
     def add_task(self, feature_id: str, description: str) -> int:
         """Add a task to a feature"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_db_connection(self.db_path, foreign_keys=False)
 
         cursor = conn.execute(
             """
@@ -386,7 +301,7 @@ class FeatureManager:
 
     def complete_task(self, task_id: int) -> bool:
         """Mark a task as complete"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_db_connection(self.db_path, foreign_keys=False)
 
         conn.execute(
             """
@@ -404,7 +319,7 @@ class FeatureManager:
 
     def _validate_acceptance(self, feature_id: str, evidence: Dict) -> bool:
         """Validate feature acceptance criteria"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_db_connection(self.db_path, foreign_keys=False)
 
         result = conn.execute("SELECT acceptance_criteria FROM features WHERE id = ?", (feature_id,)).fetchone()
 
@@ -447,7 +362,7 @@ class FeatureManager:
 
     def get_project_phases(self) -> List[Dict]:
         """Get project phases"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_db_connection(self.db_path, foreign_keys=False)
 
         phases = conn.execute(
             """
@@ -473,7 +388,7 @@ class FeatureManager:
 
     def create_phase(self, name: str, description: str, order: int = 0) -> int:
         """Create a new project phase"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_db_connection(self.db_path, foreign_keys=False)
 
         cursor = conn.execute(
             """
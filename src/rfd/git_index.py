@@ -0,0 +1,127 @@
+"""
+Staged-change access for RFD git hooks
+One `git diff --cached` for the change list and one `git cat-file --batch`
+process for every staged blob, however many files a commit touches
+"""
+
+import os
+import subprocess
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+# Gitlink entries (submodules) point at commits, not blobs
+_GITLINK_MODE = "160000"
+
+# Object ids per write: even 64-char SHA-256 ids keep a chunk under a 64KiB pipe buffer
+_REQUEST_CHUNK = 500
+
+
+class StagedChange(NamedTuple):
+    path: str
+    status: str  # A, C, M, T or D (renames are reported as delete + add)
+    blob: Optional[str]  # index object id, None for deletions and submodules
+
+
+def staged_changes(cwd: Optional[str] = None) -> List[StagedChange]:
+    """
+    Every staged path with its index blob id, from a single `git diff --cached --raw`.
+
+    Raises subprocess.CalledProcessError outside a git work tree.
+    """
+    output = subprocess.run(
+        ["git", "diff", "--cached", "--raw", "--no-renames", "--no-abbrev", "-z"],
+        capture_output=True,
+        check=True,
+        cwd=cwd,
+    ).stdout
+    fields = os.fsdecode(output).split("\0")
+
+    changes = []
+    # -z records are ":<old mode> <new mode> <old sha> <new sha> <status>\0<path>\0"
+    for meta, path in zip(fields[0::2], fields[1::2]):
+        if not meta.startswith(":"):
+            continue
+        _old_mode, new_mode, _old_sha, new_sha, status = meta[1:].split(" ")
+        status = status[0]
+        blob = None if status == "D" or new_mode == _GITLINK_MODE else new_sha
+        changes.append(StagedChange(path, status, blob))
+    return changes
+
+
+class BlobReader:
+    """
+    A long-lived `git cat-file --batch` process.
+
+    Object ids are written to its stdin and contents read back from its
+    stdout, so reading N blobs costs one fork instead of N `git show` calls.
+    Use as a context manager, or call close().
+    """
+
+    def __init__(self, cwd: Optional[str] = None):
+        self.process = subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=cwd,
+        )
+
+    def __enter__(self) -> "BlobReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self.process.poll() is None:
+            self.process.stdin.close()
+            self.process.wait()
+        self.process.stdout.close()
+
+    def read(self, object_id: str) -> Optional[bytes]:
+        """Contents of one object, or None if git doesn't have it"""
+        return self.read_many([object_id])[object_id]
+
+    def read_many(self, object_ids: Iterable[str]) -> Dict[str, Optional[bytes]]:
+        """
+        Contents of many objects in one round trip.
+
+        Requests are written in chunks small enough to fit the pipe buffer,
+        then the replies for the chunk are read back-to-back - git never
+        blocks on a full stdout while we are still blocked writing its stdin.
+        """
+        object_ids = list(dict.fromkeys(object_ids))
+        contents: Dict[str, Optional[bytes]] = {}
+        for start in range(0, len(object_ids), _REQUEST_CHUNK):
+            chunk = object_ids[start : start + _REQUEST_CHUNK]
+            self.process.stdin.write("".join(f"{oid}\n" for oid in chunk).encode())
+            self.process.stdin.flush()
+            for oid in chunk:
+                contents[oid] = self._read_reply()
+        return contents
+
+    def _read_reply(self) -> Optional[bytes]:
+        header = self.process.stdout.readline()
+        if not header:
+            raise RuntimeError("git cat-file exited unexpectedly")
+        parts = header.split()
+        if len(parts) != 3:
+            # "<object> missing" / "<object> ambiguous"
+            return None
+        size = int(parts[2])
+        data = self.process.stdout.read(size)
+        self.process.stdout.read(1)  # trailing newline
+        return data
+
+
+def read_staged(changes: Iterable[StagedChange], cwd: Optional[str] = None) -> Dict[str, str]:
+    """Decoded staged content for the given changes, keyed by path (deletions skipped)"""
+    wanted = [change for change in changes if change.blob]
+    if not wanted:
+        return {}
+    with BlobReader(cwd=cwd) as reader:
+        blobs = reader.read_many(change.blob for change in wanted)
+    return {
+        change.path: blobs[change.blob].decode("utf-8", errors="replace")
+        for change in wanted
+        if blobs[change.blob] is not None
+    }
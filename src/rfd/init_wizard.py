@@ -320,10 +320,11 @@ class InitWizard:
         }
 
         # Detect by file extensions
-        py_files = list(Path(".").rglob("*.py"))
-        js_files = list(Path(".").rglob("*.js")) + list(Path(".").rglob("*.ts"))
-        go_files = list(Path(".").rglob("*.go"))
-        rust_files = list(Path(".").rglob("*.rs"))
+        files = self.rfd.project_files
+        py_files = files.with_suffix(".py")
+        js_files = files.with_suffix(".js", ".ts")
+        go_files = files.with_suffix(".go")
+        rust_files = files.with_suffix(".rs")
 
         if py_files:
             detected["language"] = "python"
@@ -416,7 +417,7 @@ class InitWizard:
         import re
 
         for pattern in route_patterns:
-            for file in Path(".").rglob("*.py"):
+            for file in self.rfd.project_files.with_suffix(".py"):
                 with open(file) as f:
                     content = f.read()
                     matches = re.findall(pattern, content)
@@ -558,6 +559,7 @@ rfd spec generate   # Generate specifications
 .rfd/context/current.md
 .rfd/context/memory.json
 .rfd/context/snapshots/
+.rfd/cache/
 *.pyc
 __pycache__/
 .env
@@ -0,0 +1,185 @@
+"""
+Live checks for RFD (`rfd watch`)
+Feeds each batch of changed files from the watcher into validation, scope
+drift and the claim index, and stores the outcome in the live_checks table
+so `rfd status` can show current state without recomputing it
+"""
+
+import json
+import os
+import subprocess
+from datetime import datetime
+from typing import Any, Dict, Optional, Set
+
+from .db_utils import get_db_connection, transaction
+from .prevention import ScopeDriftPrevention
+from .watcher import ChangeSet
+
+# Changed paths kept in the watcher row, for a glance at what triggered the last update
+_MAX_LISTED_CHANGES = 20
+
+
+class LiveChecks:
+    """
+    Incremental checks driven by file-system events.
+
+    The inventory and symbol index are patched with just the changed paths.
+    Validation re-runs, but its per-rule and per-file caches mean only the
+    changed files are actually re-read. Scope state is carried across
+    batches, so a save elsewhere doesn't forget an earlier drift.
+    """
+
+    def __init__(self, rfd, backend: str = ""):
+        self.rfd = rfd
+        self.backend = backend
+        self.scope = ScopeDriftPrevention(str(rfd.db_path))
+        self._feature: Optional[str] = None
+        self._out_of_scope: Dict[str, str] = {}
+
+    def prime(self) -> Dict[str, Dict[str, Any]]:
+        """Full pass to establish the starting state"""
+        return self.process(ChangeSet(frozenset(), rescan=True))
+
+    def process(self, changes: ChangeSet) -> Dict[str, Dict[str, Any]]:
+        """Run the checks for one batch and store their results"""
+        paths: Optional[Set[str]] = None if changes.rescan else set(changes.paths)
+        if paths is None:
+            self.rfd.reset_subsystems()
+        else:
+            self.rfd.project_files.update(paths)
+            # Fresh spec for validation, same (patched) inventory and index
+            self.rfd.__dict__.pop("validator", None)
+
+        checks = {
+            "validation": self._validation(),
+            "scope": self._scope(paths),
+            "claims": self._claims(paths),
+        }
+        self._store(checks, changes)
+        return checks
+
+    def _validation(self) -> Dict[str, Any]:
+        # The live API is left to explicit `rfd validate` runs - dev servers restart on every save
+        result = self.rfd.validator.validate(api=False)
+        failing = [{"test": r["test"], "message": r["message"]} for r in result["results"] if not r["passed"]]
+        total = len(result["results"])
+        return {
+            "passed": result["passing"],
+            "summary": f"{total - len(failing)}/{total} checks passing",
+            "details": {"failing": failing},
+        }
+
+    def _scope(self, paths: Optional[Set[str]]) -> Dict[str, Any]:
+        feature = self.scope.current_feature()
+        if feature != self._feature or paths is None:
+            # New session (or lost events) - start again from what git says has changed
+            self._feature = feature
+            self._out_of_scope = {}
+            try:
+                paths = (paths or set()) | set(self.scope.changed_paths())
+            except (OSError, subprocess.CalledProcessError):
+                paths = paths or set()
+
+        if not feature:
+            return {"passed": True, "summary": "No active feature", "details": {}}
+
+        existing = [path for path in paths if os.path.isfile(os.path.join(self.rfd.root, path))]
+        results = self.scope.check_paths(existing, feature, record=False)
+        for path in paths - set(existing):
+            self._out_of_scope.pop(path, None)
+
+        new = []
+        for path, (in_scope, reason) in results.items():
+            if in_scope:
+                self._out_of_scope.pop(path, None)
+            elif path not in self._out_of_scope:
+                self._out_of_scope[path] = reason
+                new.append((path, reason))
+        # Only newly drifted files are logged - re-saving one isn't another attempt
+        self.scope.record_drift(feature, new)
+
+        count = len(self._out_of_scope)
+        return {
+            "passed": count == 0,
+            "summary": f"{count} out-of-scope file(s) for {feature}" if count else f"All changes within {feature}",
+            "details": {"out_of_scope": dict(sorted(self._out_of_scope.items()))},
+        }
+
+    def _claims(self, paths: Optional[Set[str]]) -> Dict[str, Any]:
+        # Keeps function/class claim verification a lookup in an up-to-date index
+        stats = self.rfd.symbol_index.refresh(paths)
+        return {
+            "passed": True,
+            "summary": f"Symbol index current ({stats['reparsed']} reindexed, {stats['removed']} removed)",
+            "details": stats,
+        }
+
+    def _store(self, checks: Dict[str, Dict[str, Any]], changes: ChangeSet) -> None:
+        now = datetime.now().isoformat()
+        trigger = "full rescan" if changes.rescan else f"{len(changes.paths)} file(s) changed"
+        watcher = {
+            "passed": True,
+            "summary": f"{self.backend or 'watching'}: {trigger}",
+            "details": {
+                "pid": os.getpid(),
+                "backend": self.backend,
+                "changed": sorted(changes.paths)[:_MAX_LISTED_CHANGES],
+            },
+        }
+        rows = [
+            (name, check["passed"], check["summary"], json.dumps(check["details"]), now)
+            for name, check in {**checks, "watcher": watcher}.items()
+        ]
+        with transaction(self.rfd.db_path) as conn:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO live_checks (name, passed, summary, details, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+            """,
+                rows,
+            )
+
+
+def read_live_checks(db_path) -> Optional[Dict[str, Any]]:
+    """
+    Stored live state: {"checks": [...], "updated_at": str, "running": bool},
+    or None if `rfd watch` has never run for this project.
+    """
+    conn = get_db_connection(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT name, passed, summary, details, updated_at FROM live_checks ORDER BY name"
+        ).fetchall()
+    finally:
+        conn.close()
+    if not rows:
+        return None
+
+    checks = [
+        {
+            "name": name,
+            "passed": bool(passed),
+            "summary": summary,
+            "details": json.loads(details or "{}"),
+            "updated_at": updated,
+        }
+        for name, passed, summary, details, updated in rows
+    ]
+    watcher = next((check for check in checks if check["name"] == "watcher"), None)
+    return {
+        "checks": [check for check in checks if check["name"] != "watcher"],
+        "updated_at": watcher["updated_at"] if watcher else max(check["updated_at"] for check in checks),
+        "running": bool(watcher) and _pid_alive(watcher["details"].get("pid")),
+    }
+
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -5,11 +5,12 @@ Handles updates to .rfd/ structure when RFD itself is upgraded
 
 import json
 import shutil
-import sqlite3
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict
 
+from .db_utils import get_db_connection, init_database
+
 
 class RFDMigration:
     """Handles migrations of .rfd/ directory structure across RFD versions"""
@@ -96,7 +97,7 @@ class RFDMigration:
         if not db_path.exists():
             return
 
-        conn = sqlite3.connect(db_path)
+        conn = get_db_connection(db_path, foreign_keys=False)
 
         # Add new tables/columns as RFD evolves
         # Example: Adding a new migrations table
@@ -201,97 +202,11 @@ class RFDMigration:
         if db_path is None:
             db_path = self.rfd_dir / "memory.db"
 
-        conn = sqlite3.connect(db_path)
-
-        # Create qa_cycles table
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS qa_cycles (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                feature_id TEXT NOT NULL,
-                cycle_number INTEGER NOT NULL,
-                status TEXT NOT NULL,
-                started_at DATETIME NOT NULL,
-                completed_at DATETIME,
-                FOREIGN KEY (feature_id) REFERENCES features(id)
-            )
-        """
-        )
-
-        # Create review_results table
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS review_results (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                cycle_id INTEGER NOT NULL,
-                review_type TEXT NOT NULL,
-                passed BOOLEAN NOT NULL,
-                issues TEXT,
-                suggestions TEXT,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (cycle_id) REFERENCES qa_cycles(id)
-            )
-        """
-        )
-
-        # Create agent_handoffs table
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS agent_handoffs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                from_agent TEXT,
-                to_agent TEXT,
-                task_description TEXT,
-                context TEXT,
-                status TEXT DEFAULT 'pending',
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                completed_at TEXT
-            )
-        """
-        )
+        init_database(db_path)
 
-        conn.commit()
-        conn.close()
-    
     def create_prevention_tables(self, db_path: Path = None):
         """Create tables for prevention system"""
         if db_path is None:
             db_path = self.rfd_dir / "memory.db"
-        
-        conn = sqlite3.connect(db_path)
-        
-        # Create workflows table for workflow specifications
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS workflows (
-                id TEXT PRIMARY KEY,
-                spec JSON,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                updated_at TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # Add missing columns to features table if they don't exist
-        try:
-            conn.execute("ALTER TABLE features ADD COLUMN name TEXT")
-        except sqlite3.OperationalError:
-            pass  # Column already exists
-        
-        try:
-            conn.execute("ALTER TABLE features ADD COLUMN scope_definition JSON")
-        except sqlite3.OperationalError:
-            pass  # Column already exists
-        
-        # Create prevention_stats table
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS prevention_stats (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                file_path TEXT,
-                validation_type TEXT,
-                violations JSON,
-                prevented BOOLEAN,
-                timestamp TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        conn.commit()
-        conn.close()
+
+        init_database(db_path)
@@ -3,12 +3,44 @@
 
 import ast
 import json
+import os
 import re
-import sqlite3
 import subprocess
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .db_utils import get_db_connection, transaction
+from .git_index import StagedChange, read_staged, staged_changes
+from .scope_matcher import MatcherCache, ScopeMatcher
+from .watcher import FileWatcher
+
+# Below this many files a batch is validated in-process - worker start-up would cost more
+_POOL_MIN_FILES = 8
+
+
+def staged_sources(suffixes: Tuple[str, ...] = (".py",)) -> Dict[str, str]:
+    """Staged (index) content of added/modified files, keyed by repository path."""
+    return read_staged(change for change in staged_changes() if change.path.endswith(suffixes))
+
+
+def _parallel_map(func: Callable, items: List, jobs: int = 0) -> List:
+    """func over items, on a process pool when there are enough of them to repay it."""
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    if jobs > 1 and len(items) >= _POOL_MIN_FILES:
+        workers = min(jobs, len(items))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(func, items, chunksize=max(len(items) // (workers * 4), 1)))
+    return [func(item) for item in items]
+
+
+def _forbidden_matches(item: Tuple[str, List[str]]) -> List[str]:
+    """Forbidden patterns found in one file's content."""
+    content, patterns = item
+    return [pattern for pattern in patterns if re.search(pattern, content)]
 
 
 class HallucinationPrevention:
@@ -37,6 +69,10 @@ class HallucinationPrevention:
         ("class", r"class\s+\w+.*:\s*pass"),
     ]
 
+    # Compiled once per process rather than on every validation
+    _MOCK_REGEXES = [re.compile(pattern, re.IGNORECASE) for pattern in MOCK_PATTERNS]
+    _STUB_REGEXES = [(stub_type, re.compile(pattern, re.MULTILINE)) for stub_type, pattern in STUB_INDICATORS]
+
     def __init__(self, db_path: str = ".rfd/memory.db"):
         self.db_path = db_path
         self.validations_performed = []
@@ -44,16 +80,58 @@ class HallucinationPrevention:
 
     def validate_code_before_write(self, file_path: str, code: str) -> Tuple[bool, List[str]]:
         """Validate code BEFORE it gets written to prevent hallucinations."""
+        violations = self.find_violations(code)
+        self._record(file_path, violations, datetime.now().isoformat())
+
+        # Save to database
+        self._save_validation_to_db(file_path, violations)
+
+        return (len(violations) == 0, violations)
+
+    def validate_batch(self, sources: Dict[str, str], jobs: int = 0) -> Dict[str, Tuple[bool, List[str]]]:
+        """
+        Validate many files at once: {file_path: code} -> {file_path: (valid, violations)}.
+
+        Files are checked on a process pool (jobs workers, 0 = one per CPU) and
+        all stats are written in a single transaction.
+        """
+        paths = list(sources)
+        found = _parallel_map(self.find_violations, [sources[path] for path in paths], jobs)
+
+        timestamp = datetime.now().isoformat()
+        for path, violations in zip(paths, found):
+            self._record(path, violations, timestamp)
+        self._save_validations_to_db(list(zip(paths, found)), timestamp)
+
+        return {path: (len(violations) == 0, violations) for path, violations in zip(paths, found)}
+
+    def validate_paths(self, paths: Iterable[str], jobs: int = 0) -> Dict[str, Tuple[bool, List[str]]]:
+        """Batch-validate files on disk; unreadable files fail without being recorded"""
+        paths = list(paths)
+        sources = {}
+        unreadable = {}
+        for path in paths:
+            try:
+                sources[path] = Path(path).read_text(encoding="utf-8")
+            except (OSError, UnicodeDecodeError) as e:
+                unreadable[path] = (False, [f"Cannot read file: {e}"])
+
+        results = self.validate_batch(sources, jobs=jobs) if sources else {}
+        return {path: results.get(path) or unreadable[path] for path in paths}
+
+    @classmethod
+    def find_violations(cls, code: str) -> List[str]:
+        """Mock, stub and unimplemented-code violations in Python source (no side effects)"""
         violations = []
 
         # Check for mock patterns
-        for pattern in self.MOCK_PATTERNS:
-            if re.search(pattern, code, re.IGNORECASE):
-                violations.append(f"Mock pattern detected: {pattern}")
+        for regex in cls._MOCK_REGEXES:
+            if regex.search(code):
+                violations.append(f"Mock pattern detected: {regex.pattern}")
 
         # Check for stub functions/classes
-        for stub_type, pattern in self.STUB_INDICATORS:
-            matches = re.findall(pattern, code, re.MULTILINE)
+        for stub_type, regex in cls._STUB_REGEXES:
+            matches = regex.findall(code)
             if matches:
                 violations.append(f"Stub {stub_type} detected: {matches[0][:50]}")
 
@@ -74,11 +152,14 @@ class HallucinationPrevention:
         except SyntaxError as e:
             violations.append(f"Syntax error in code: {e}")
 
-        # Log the validation attempt
+        return violations
+
+    def _record(self, file_path: str, violations: List[str], timestamp: str):
+        """Log the validation attempt for this session's stats."""
         self.validations_performed.append(
             {
                 "file": file_path,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": timestamp,
                 "violations": violations,
                 "prevented": len(violations) > 0,
             }
@@ -87,30 +168,26 @@ class HallucinationPrevention:
         if violations:
             self.violations_prevented.extend(violations)
 
-        # Save to database
-        self._save_validation_to_db(file_path, violations)
-
-        return (len(violations) == 0, violations)
-    
     def _save_validation_to_db(self, file_path: str, violations: List[str]):
         """Save validation results to database for persistence."""
+        self._save_validations_to_db([(file_path, violations)], datetime.now().isoformat())
+
+    def _save_validations_to_db(self, results: List[Tuple[str, List[str]]], timestamp: str):
+        """Save a batch of validation results in one transaction."""
+        if not results:
+            return
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT INTO prevention_stats (file_path, validation_type, violations, prevented, timestamp)
-                VALUES (?, ?, ?, ?, ?)
-            """, (
-                file_path,
-                'hallucination_check',
-                json.dumps(violations),
-                len(violations) > 0,
-                datetime.now().isoformat()
-            ))
-            
-            conn.commit()
-            conn.close()
+            with transaction(self.db_path) as conn:
+                conn.executemany(
+                    """
+                    INSERT INTO prevention_stats (file_path, validation_type, violations, prevented, timestamp)
+                    VALUES (?, ?, ?, ?, ?)
+                """,
+                    [
+                        (file_path, "hallucination_check", json.dumps(violations), len(violations) > 0, timestamp)
+                        for file_path, violations in results
+                    ],
+                )
         except Exception as e:
             # Log error but don't fail validation
             print(f"Warning: Could not persist stats: {e}")
@@ -164,6 +241,7 @@ class WorkflowEnforcement:
         self.db_path = db_path
         self.active_workflow = None
         self.workflow_violations = []
+        self._monitor: Optional[Tuple[threading.Thread, threading.Event]] = None
 
     def install_git_hooks(self) -> bool:
         """Install git hooks for real-time workflow enforcement."""
@@ -175,24 +253,11 @@ class WorkflowEnforcement:
         pre_commit_hook = """#!/bin/bash
 # RFD Workflow Enforcement Hook
 
-# Check if we're in an RFD workflow
-if [ -f .rfd/workflow.lock ]; then
-    workflow_id=$(cat .rfd/workflow.lock)
-
-    # Validate changes against workflow spec
-    rfd prevent validate-commit "$workflow_id"
-    if [ $? -ne 0 ]; then
-        echo "❌ Commit blocked: Workflow violation detected"
-        echo "Run 'rfd workflow status' for details"
-        exit 1
-    fi
-fi
-
-# Check for scope drift
-rfd prevent check-scope
+# Workflow rules and scope drift for everything staged, in one pass
+rfd prevent pre-commit
 if [ $? -ne 0 ]; then
-    echo "❌ Commit blocked: Scope drift detected"
-    echo "Run 'rfd prevent check-scope' for details"
+    echo "❌ Commit blocked: Workflow violation or scope drift detected"
+    echo "Run 'rfd prevent pre-commit' for details"
     exit 1
 fi
 
@@ -224,59 +289,83 @@ exit 0
 
         return True
 
-    def validate_commit(self, workflow_id: str) -> Tuple[bool, List[str]]:
+    def validate_commit(
+        self, workflow_id: str, changes: Optional[List[StagedChange]] = None, jobs: int = 0
+    ) -> Tuple[bool, List[str]]:
         """Validate a commit against the active workflow specification."""
         violations = []
 
         # Get workflow spec from database
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute(
-            """
-            SELECT spec, allowed_files, forbidden_patterns
-            FROM workflows
-            WHERE id = ?
-        """,
-            (workflow_id,),
-        )
+        conn = get_db_connection(self.db_path, foreign_keys=False)
+        try:
+            result = conn.execute("SELECT spec FROM workflows WHERE id = ?", (workflow_id,)).fetchone()
+        finally:
+            conn.close()
 
-        result = cursor.fetchone()
         if not result:
             violations.append(f"Unknown workflow: {workflow_id}")
             return False, violations
 
-        spec, allowed_files, forbidden_patterns = result
+        spec = json.loads(result[0]) if result[0] else {}
+        if not isinstance(spec, dict):
+            spec = {}
+        allowed = spec.get("allowed_files") or []
+        patterns = spec.get("forbidden_patterns") or []
 
-        # Get staged files
-        staged_files = (
-            subprocess.check_output(["git", "diff", "--cached", "--name-only"], text=True).strip().split("\n")
-        )
+        if changes is None:
+            changes = staged_changes()
 
         # Check if files are allowed
-        if allowed_files:
-            allowed = json.loads(allowed_files)
-            for file in staged_files:
-                if not any(file.startswith(prefix) for prefix in allowed):
-                    violations.append(f"File not in workflow scope: {file}")
-
-        # Check for forbidden patterns
-        if forbidden_patterns:
-            patterns = json.loads(forbidden_patterns)
-            for file in staged_files:
-                if file.endswith(".py"):
-                    content = subprocess.check_output(["git", "show", f":{file}"], text=True)
-                    for pattern in patterns:
-                        if re.search(pattern, content):
-                            violations.append(f"Forbidden pattern in {file}: {pattern}")
-
-        conn.close()
+        if allowed:
+            for change in changes:
+                if not any(change.path.startswith(prefix) for prefix in allowed):
+                    violations.append(f"File not in workflow scope: {change.path}")
+
+        # Check for forbidden patterns - all staged blobs come from one git cat-file process
+        if patterns:
+            sources = read_staged(change for change in changes if change.path.endswith(".py"))
+            found = _parallel_map(_forbidden_matches, [(content, patterns) for content in sources.values()], jobs)
+            for file, matches in zip(sources, found):
+                violations.extend(f"Forbidden pattern in {file}: {pattern}" for pattern in matches)
+
+        return len(violations) == 0, violations
+
+    def check_staged(
+        self, workflow_id: Optional[str] = None, feature_id: Optional[str] = None, jobs: int = 0
+    ) -> Tuple[bool, List[str]]:
+        """
+        Pre-commit fast path: workflow and scope checks for everything staged.
+
+        The staged list is read once and shared by every check; workflow rules
+        apply when workflow_id is given, scope boundaries when feature_id is.
+        """
+        changes = staged_changes()
+        violations = []
+
+        if workflow_id:
+            _, found = self.validate_workflow_compliance(workflow_id, [change.path for change in changes])
+            violations.extend(found)
+
+            conn = get_db_connection(self.db_path, foreign_keys=False)
+            try:
+                has_spec = conn.execute("SELECT 1 FROM workflows WHERE id = ?", (workflow_id,)).fetchone()
+            finally:
+                conn.close()
+            if has_spec:
+                _, found = self.validate_commit(workflow_id, changes, jobs=jobs)
+                violations.extend(found)
+
+        if feature_id:
+            scope = ScopeDriftPrevention(self.db_path)
+            paths = [change.path for change in changes if change.status != "D"]
+            for in_scope, reason in scope.check_paths(paths, feature_id).values():
+                if not in_scope:
+                    violations.append(reason)
+
         return len(violations) == 0, violations
 
     def monitor_file_changes(self, callback=None):
         """Monitor file system for unauthorized changes."""
-        # This would use inotify on Linux or FSEvents on macOS
-        # For now, provide the structure
         return {
             "start_monitoring": lambda: self._start_monitor(callback),
             "stop_monitoring": lambda: self._stop_monitor(),
@@ -284,49 +373,84 @@ exit 0
         }
 
     def _start_monitor(self, callback):
-        """Start file system monitoring."""
-        # Implementation would use watchdog or similar
-        pass
+        """Start file system monitoring on a background thread."""
+        if self._monitor is not None:
+            return
+
+        # inotify on Linux, fingerprint polling elsewhere; bursts of writes arrive as one batch
+        watcher = FileWatcher(".")
+        stop = threading.Event()
+        thread = threading.Thread(
+            target=self._monitor_loop, args=(watcher, stop, callback), name="rfd-monitor", daemon=True
+        )
+        self._monitor = (thread, stop)
+        thread.start()
+
+    def _monitor_loop(self, watcher: FileWatcher, stop: threading.Event, callback):
+        scope = ScopeDriftPrevention(self.db_path)
+        try:
+            for changes in watcher.batches(stop):
+                lock = Path(".rfd/workflow.lock")
+                feature_id = (lock.read_text().strip() if lock.exists() else None) or scope.current_feature()
+
+                violations = []
+                if feature_id:
+                    existing = [path for path in changes.paths if Path(path).is_file()]
+                    for in_scope, reason in scope.check_paths(existing, feature_id).values():
+                        if not in_scope:
+                            violations.append(reason)
+                    self.workflow_violations.extend(violations)
+
+                if callback:
+                    callback(set(changes.paths), violations)
+        finally:
+            watcher.close()
 
     def _stop_monitor(self):
         """Stop file system monitoring."""
-        pass
-
-    def validate_workflow_compliance(self, workflow_id: str) -> Tuple[bool, List[str]]:
+        if self._monitor is None:
+            return
+        thread, stop = self._monitor
+        stop.set()
+        thread.join()
+        self._monitor = None
+
+    def validate_workflow_compliance(
+        self, workflow_id: str, changed_files: Optional[List[str]] = None
+    ) -> Tuple[bool, List[str]]:
         """Validate current changes against workflow specifications."""
         violations = []
 
         # Get current git changes
-        try:
-            result = subprocess.run(
-                ["git", "diff", "--name-only", "--cached"], capture_output=True, text=True, check=True
-            )
-            changed_files = result.stdout.strip().split("\n") if result.stdout.strip() else []
-        except subprocess.CalledProcessError:
-            changed_files = []
+        if changed_files is None:
+            try:
+                changed_files = [change.path for change in staged_changes()]
+            except subprocess.CalledProcessError:
+                changed_files = []
 
         # For now, just check that changes are related to the feature
         # Since we don't have a workflows table with specs
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Check if feature exists
-        cursor.execute(
-            "SELECT id, description FROM features WHERE id = ?",
-            (workflow_id,),
-        )
+        conn = get_db_connection(self.db_path, foreign_keys=False)
+        try:
+            cursor = conn.cursor()
 
-        result = cursor.fetchone()
-        if not result:
-            violations.append(f"Feature {workflow_id} not found")
-        else:
-            # Basic validation: ensure we're not modifying unrelated system files
-            system_files = [".git/", ".venv/", "__pycache__", ".pyc"]
-            for file in changed_files:
-                if any(sys_file in file for sys_file in system_files):
-                    violations.append(f"System file modified: {file}")
+            # Check if feature exists
+            cursor.execute(
+                "SELECT id, description FROM features WHERE id = ?",
+                (workflow_id,),
+            )
 
-        conn.close()
+            result = cursor.fetchone()
+            if not result:
+                violations.append(f"Feature {workflow_id} not found")
+            else:
+                # Basic validation: ensure we're not modifying unrelated system files
+                system_files = [".git/", ".venv/", "__pycache__", ".pyc"]
+                for file in changed_files:
+                    if any(sys_file in file for sys_file in system_files):
+                        violations.append(f"System file modified: {file}")
+        finally:
+            conn.close()
 
         if violations:
             self.workflow_violations.extend(violations)
@@ -381,119 +505,188 @@ class WorkflowLockManager:
 class ScopeDriftPrevention:
     """Prevent scope drift in real-time using file watchers and boundaries."""
 
+    # Build/test artifacts are allowed wherever they appear in a path
+    ARTIFACT_PATTERNS = ["coverage", ".coverage", "*.pyc", "__pycache__", "*.egg-info"]
+
     def __init__(self, db_path: str = ".rfd/memory.db"):
         self.db_path = db_path
         self.scope_boundaries = {}
         self.drift_attempts = []
 
+        rfd_dir = Path(db_path).parent
+        self._matchers = MatcherCache(rfd_dir / "cache" / "scope.json" if rfd_dir.is_dir() else None)
+
     def define_scope_boundaries(self, feature_id: str) -> Dict[str, List[str]]:
         """Define allowed scope for a feature."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Get feature details - features table has id, not name
-        cursor.execute(
-            """
-            SELECT id, description, acceptance_criteria
-            FROM features
-            WHERE id = ?
-        """,
-            (feature_id,),
-        )
+        conn = get_db_connection(self.db_path, foreign_keys=False)
+        try:
+            cursor = conn.cursor()
 
-        result = cursor.fetchone()
-        if not result:
-            return {}
+            # Get feature details - features table has id, not name
+            cursor.execute(
+                """
+                SELECT id, description, acceptance_criteria
+                FROM features
+                WHERE id = ?
+            """,
+                (feature_id,),
+            )
 
-        feature_id_db, description, criteria = result
+            result = cursor.fetchone()
+            if not result:
+                return {}
 
-        # Auto-detect scope based on feature
-        scope = {
-            "allowed_dirs": [],
-            "allowed_files": [],
-            "forbidden_patterns": [],
-            "max_file_changes": 10,
-        }
+            feature_id_db, description, criteria = result
 
-        # Infer scope from feature id and description
-        # Always allow main source directory for features
-        scope["allowed_dirs"].extend([
-            "src/",
-            "tests/",
-            ".rfd/",
-            "scripts/",
-            "docs/",  # Documentation
-            "./",  # Root files (pyproject.toml, etc.)
-        ])
-        
-        # Allow specific root config files
-        scope["allowed_files"].extend([
-            "pyproject.toml",
-            "setup.py",
-            "setup.cfg",
-            "requirements.txt",
-            "README.md",
-            "CHANGELOG.md",
-            ".gitignore",
-            ".pre-commit-config.yaml",
-            "CLAUDE.md",
-            "LICENSE",
-            "Makefile",
-            "tox.ini",
-            ".env",
-            ".env.example",
-        ])
-
-        # Store boundaries
-        self.scope_boundaries[feature_id] = scope
-
-        # Save to database now that column exists
-        cursor.execute(
-            """
-            UPDATE features
-            SET scope_definition = ?
-            WHERE id = ?
-        """,
-            (json.dumps(scope), feature_id),
-        )
+            # Auto-detect scope based on feature
+            scope = {
+                "allowed_dirs": [],
+                "allowed_files": [],
+                "forbidden_patterns": [],
+                "max_file_changes": 10,
+            }
 
-        conn.commit()
-        conn.close()
+            # Infer scope from feature id and description
+            # Always allow main source directory for features
+            scope["allowed_dirs"].extend([
+                "src/",
+                "tests/",
+                ".rfd/",
+                "scripts/",
+                "docs/",  # Documentation
+                "./",  # Root files (pyproject.toml, etc.)
+            ])
+
+            # Allow specific root config files
+            scope["allowed_files"].extend([
+                "pyproject.toml",
+                "setup.py",
+                "setup.cfg",
+                "requirements.txt",
+                "README.md",
+                "CHANGELOG.md",
+                ".gitignore",
+                ".pre-commit-config.yaml",
+                "CLAUDE.md",
+                "LICENSE",
+                "Makefile",
+                "tox.ini",
+                ".env",
+                ".env.example",
+            ])
+
+            # Store boundaries
+            self.scope_boundaries[feature_id] = scope
+
+            # Save to database now that column exists
+            cursor.execute(
+                """
+                UPDATE features
+                SET scope_definition = ?
+                WHERE id = ?
+            """,
+                (json.dumps(scope), feature_id),
+            )
+
+            conn.commit()
+        finally:
+            conn.close()
 
         return scope
 
     def check_file_in_scope(self, file_path: str, feature_id: str) -> Tuple[bool, str]:
         """Check if a file change is within feature scope."""
+        return self._classify(self._matcher(feature_id), file_path)
+
+    def check_paths(self, paths: Iterable[str], feature_id: str, record: bool = True) -> Dict[str, Tuple[bool, str]]:
+        """
+        Scope check for many files in one call: {path: (in_scope, reason)}.
+
+        The feature's boundaries are compiled once into a matcher (cached in
+        .rfd/cache/scope.json) and, with record, every out-of-scope path is
+        logged as a drift attempt in a single transaction.
+        """
+        matcher = self._matcher(feature_id)
+        results = {path: self._classify(matcher, path) for path in paths}
+
+        if record:
+            self.record_drift(feature_id, [(path, reason) for path, (ok, reason) in results.items() if not ok])
+        return results
+
+    def _scope(self, feature_id: str) -> Dict[str, Any]:
+        """Feature boundaries - the stored definition when there is one, else defined now."""
         if feature_id not in self.scope_boundaries:
-            self.define_scope_boundaries(feature_id)
+            conn = get_db_connection(self.db_path, foreign_keys=False)
+            try:
+                stored = conn.execute("SELECT scope_definition FROM features WHERE id = ?", (feature_id,)).fetchone()
+            finally:
+                conn.close()
+
+            if stored and stored[0]:
+                self.scope_boundaries[feature_id] = json.loads(stored[0])
+            elif not self.define_scope_boundaries(feature_id):
+                # Unknown feature - remember that instead of asking again for every path
+                self.scope_boundaries[feature_id] = {}
+
+        return self.scope_boundaries[feature_id]
+
+    def _matcher(self, feature_id: str) -> ScopeMatcher:
+        scope = self._scope(feature_id)
+        return self._matchers.get(
+            prefixes=scope.get("allowed_dirs", []),
+            exact=scope.get("allowed_files", []),
+            substrings=self.ARTIFACT_PATTERNS,
+        )
 
-        scope = self.scope_boundaries.get(feature_id, {})
+    @staticmethod
+    def _classify(matcher: ScopeMatcher, file_path: str) -> Tuple[bool, str]:
+        kind = matcher.match(file_path)
 
         # Always allow certain files
-        allowed_patterns = ["coverage", ".coverage", "*.pyc", "__pycache__", "*.egg-info"]
-        if any(pattern in file_path for pattern in allowed_patterns):
+        if kind == "substring":
             return True, "Build/test artifact allowed"
-        
-        # Check allowed directories
-        allowed_dirs = scope.get("allowed_dirs", [])
-        if allowed_dirs:
-            # If file is in an allowed directory, it's allowed
-            in_allowed_dir = any(file_path.startswith(dir_path) for dir_path in allowed_dirs)
-            if in_allowed_dir:
-                return True, "File is in allowed directory"
-        
-        # Check allowed files (for root-level files)
-        allowed_files = scope.get("allowed_files", [])
-        if allowed_files and file_path in allowed_files:
+        if kind == "prefix":
+            return True, "File is in allowed directory"
+        if kind == "exact":
             return True, "File is in allowed files list"
-        
+
         # If we have scope rules but file doesn't match any, it's out of scope
-        if allowed_dirs or allowed_files:
+        if not matcher.empty:
             return False, f"File {file_path} not in allowed scope"
-        
+
         # No scope rules defined, allow by default
         return True, "No scope restrictions defined"
 
+    def record_drift(self, feature_id: str, violations: List[Tuple[str, str]]):
+        """Log prevented drift attempts, all in one transaction."""
+        if not violations:
+            return
+        for file_path, reason in violations:
+            self.report_drift_attempt(file_path, reason)
+        try:
+            with transaction(self.db_path) as conn:
+                conn.executemany(
+                    """
+                    INSERT INTO violations (feature_id, violation_type, description, file_path, prevented)
+                    VALUES (?, 'scope_drift', ?, ?, 1)
+                """,
+                    [(feature_id, reason, file_path) for file_path, reason in violations],
+                )
+        except Exception as e:
+            # Log error but don't fail the check
+            print(f"Warning: Could not persist drift attempts: {e}")
+
+    def current_feature(self) -> Optional[str]:
+        """Feature of the active session, if any."""
+        session_file = Path(".rfd/context/current.md")
+        if not session_file.exists():
+            return None
+
+        for line in session_file.read_text().split("\n"):
+            if line.startswith("feature:"):
+                return line.split(":")[1].strip() or None
+        return None
+
     def install_scope_guards(self) -> Dict[str, Any]:
         """Install scope guards to prevent drift."""
         # Create scope check script
@@ -524,13 +717,8 @@ modified_files = subprocess.check_output(
 ).strip().split('\\n')
 
 prevention = ScopeDriftPrevention()
-violations = []
-
-for file in modified_files:
-    if file:  # Skip empty lines
-        in_scope, message = prevention.check_file_in_scope(file, feature_id)
-        if not in_scope:
-            violations.append(message)
+results = prevention.check_paths([f for f in modified_files if f], feature_id)
+violations = [message for in_scope, message in results.values() if not in_scope]
 
 if violations:
     print("❌ Scope violations detected:")
@@ -559,41 +747,33 @@ sys.exit(0)
         violations = []
 
         # Get current feature from session
-        session_file = Path(".rfd/context/current.md")
-        if not session_file.exists():
-            return True, []  # No active session
-
-        # Parse session file
-        content = session_file.read_text()
-        feature_id = None
-        for line in content.split("\n"):
-            if line.startswith("feature:"):
-                feature_id = line.split(":")[1].strip()
-                break
-
+        feature_id = self.current_feature()
         if not feature_id:
-            return True, []  # No feature in session
+            return True, []  # No active session or no feature in session
 
         # Get changed files, excluding deletions
         try:
-            # Use --diff-filter to exclude Deleted files
-            result = subprocess.run(
-                ["git", "diff", "--name-only", "--diff-filter=ACMRUXB", "HEAD"], 
-                capture_output=True, text=True, check=True
-            )
-            changed_files = result.stdout.strip().split("\n") if result.stdout.strip() else []
+            changed_files = self.changed_paths()
         except subprocess.CalledProcessError:
             return True, []
 
         # Check each file
-        for file in changed_files:
-            if file:  # Skip empty lines
-                valid, reason = self.check_file_in_scope(file, feature_id)
-                if not valid:
-                    violations.append(reason)
+        for valid, reason in self.check_paths(filter(None, changed_files), feature_id).values():
+            if not valid:
+                violations.append(reason)
 
         return (len(violations) == 0, violations)
 
+    @staticmethod
+    def changed_paths() -> List[str]:
+        """Files changed against HEAD (staged or not), excluding deletions."""
+        # Use --diff-filter to exclude Deleted files
+        result = subprocess.run(
+            ["git", "diff", "--name-only", "--diff-filter=ACMRUXB", "HEAD"],
+            capture_output=True, text=True, check=True
+        )
+        return result.stdout.strip().split("\n") if result.stdout.strip() else []
+
     def report_drift_attempt(self, file_path: str, reason: str):
         """Record a scope drift attempt that was prevented."""
         self.drift_attempts.append(
@@ -0,0 +1,165 @@
+"""
+Project file inventory for RFD
+One prune-aware walk of the project tree, shared by every scanner in a command
+"""
+
+import fnmatch
+import os
+import re
+import subprocess
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+# Directories never worth descending into - pruned before the walk enters them
+EXCLUDED_DIRS = frozenset(
+    {
+        ".git",
+        ".hg",
+        ".svn",
+        ".rfd",
+        ".venv",
+        "venv",
+        "env",
+        ".env",
+        "node_modules",
+        "__pycache__",
+        "build",
+        "dist",
+        ".eggs",
+        ".tox",
+        ".nox",
+        ".mypy_cache",
+        ".pytest_cache",
+        ".ruff_cache",
+    }
+)
+
+
+class ProjectFiles:
+    """
+    Lazily built list of the files in a project.
+
+    The tree is walked once, on first use, with os.scandir - excluded
+    directories are skipped without being listed. With respect_gitignore the
+    inventory comes from `git ls-files` instead (tracked + untracked, minus
+    ignored), falling back to the walk outside a git work tree.
+
+    Paths are returned as ``root / relative_path``, so for the default root "."
+    they look exactly like the results of ``Path(".").glob("**/*")``.
+    """
+
+    def __init__(
+        self,
+        root: str | Path = ".",
+        exclude_dirs: Iterable[str] = EXCLUDED_DIRS,
+        respect_gitignore: bool = False,
+    ):
+        self.root = Path(root)
+        self.exclude_dirs = frozenset(exclude_dirs)
+        self.respect_gitignore = respect_gitignore
+        self._relative: Optional[List[str]] = None
+        self._paths: List[Path] = []
+
+    def _load(self) -> List[str]:
+        if self._relative is None:
+            relative = self._git_files() if self.respect_gitignore else None
+            if relative is None:
+                relative = self._walk()
+            relative.sort()
+            self._relative = relative
+            self._paths = [self.root / rel for rel in relative]
+        return self._relative
+
+    def _walk(self) -> List[str]:
+        files = []
+        pending = [""]
+        while pending:
+            prefix = pending.pop()
+            try:
+                with os.scandir(os.path.join(self.root, prefix)) as entries:
+                    for entry in entries:
+                        try:
+                            # Don't follow directory symlinks - avoids cycles and walking out of the project
+                            if entry.is_dir(follow_symlinks=False):
+                                if entry.name not in self.exclude_dirs:
+                                    pending.append(f"{prefix}{entry.name}/")
+                            elif entry.is_file():
+                                files.append(prefix + entry.name)
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+        return files
+
+    def _git_files(self) -> Optional[List[str]]:
+        try:
+            result = subprocess.run(
+                ["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard"],
+                cwd=self.root,
+                capture_output=True,
+                timeout=30,
+            )
+        except (OSError, subprocess.SubprocessError):
+            return None
+        if result.returncode != 0:
+            return None
+
+        files = []
+        for rel in os.fsdecode(result.stdout).split("\0"):
+            if not rel or any(part in self.exclude_dirs for part in rel.split("/")[:-1]):
+                continue
+            # --cached still lists files deleted from the work tree (and submodule roots)
+            if os.path.isfile(os.path.join(self.root, rel)):
+                files.append(rel)
+        return files
+
+    def update(self, changed: Iterable[str]) -> None:
+        """
+        Apply changes reported by a file watcher (project-relative paths).
+
+        Existing files are added and missing ones dropped, without a rewalk.
+        A gitignore-aware inventory is simply rebuilt on next use, since git
+        decides what belongs in it.
+        """
+        if self._relative is None:
+            return
+        if self.respect_gitignore:
+            self._relative = None
+            return
+
+        relative = set(self._relative)
+        for rel in changed:
+            if any(part in self.exclude_dirs for part in rel.split("/")[:-1]):
+                continue
+            if os.path.isfile(os.path.join(self.root, rel)):
+                relative.add(rel)
+            else:
+                relative.discard(rel)
+        self._relative = sorted(relative)
+        self._paths = [self.root / rel for rel in self._relative]
+
+    def files(self) -> List[Path]:
+        """Every file in the inventory"""
+        self._load()
+        return list(self._paths)
+
+    def with_suffix(self, *suffixes: str) -> List[Path]:
+        """Files whose name ends with one of the suffixes (e.g. ".py", ".test.js")"""
+        relative = self._load()
+        return [path for rel, path in zip(relative, self._paths) if rel.endswith(suffixes)]
+
+    def matching(self, *patterns: str) -> List[Path]:
+        """Files whose name matches one of the glob patterns (e.g. "test_*.py")"""
+        regex = re.compile("|".join(fnmatch.translate(pattern) for pattern in patterns))
+        relative = self._load()
+        return [path for rel, path in zip(relative, self._paths) if regex.match(rel.rpartition("/")[2])]
+
+    def under(self, directory: str, *suffixes: str) -> List[Path]:
+        """Files below a top-level directory, optionally filtered by suffix"""
+        prefix = directory.rstrip("/") + "/"
+        relative = self._load()
+        return [
+            path
+            for rel, path in zip(relative, self._paths)
+            if rel.startswith(prefix) and (not suffixes or rel.endswith(suffixes))
+        ]
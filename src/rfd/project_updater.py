@@ -3,13 +3,14 @@ PROJECT.md Auto-Updater for RFD
 Maintains PROJECT.md as single source of truth
 """
 
-import sqlite3
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict
 
 import frontmatter
 
+from .db_utils import get_db_connection
+
 
 class ProjectUpdater:
     """Updates PROJECT.md automatically while preserving user content"""
@@ -57,7 +58,7 @@ class ProjectUpdater:
             post = frontmatter.load(f)
 
         # Calculate metrics from database
-        conn = sqlite3.connect(self.rfd.db_path)
+        conn = get_db_connection(self.rfd.db_path, foreign_keys=False)
 
         # Total checkpoints
         total_checkpoints = conn.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0]
@@ -261,7 +262,7 @@ class ProjectUpdater:
         with open(self.project_file) as f:
             post = frontmatter.load(f)
 
-        conn = sqlite3.connect(self.rfd.db_path)
+        conn = get_db_connection(self.rfd.db_path, foreign_keys=False)
         changes = []
 
         # Sync features
@@ -4,19 +4,27 @@ RFD: Reality-First Development System
 Single entry point for all development operations
 """
 
+import copy
 import json
-import sqlite3
+import os
 import subprocess
 from datetime import datetime
+from functools import cached_property
 from pathlib import Path
-from typing import Any, Dict
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
 
-from .build import BuildEngine
 from .db_utils import get_db_connection, init_database
-from .project_updater import ProjectUpdater
-from .session import SessionManager
-from .spec import SpecEngine
-from .validation import ValidationEngine
+
+if TYPE_CHECKING:
+    from .build import BuildEngine
+    from .project_files import ProjectFiles
+    from .project_updater import ProjectUpdater
+    from .session import SessionManager
+    from .spec import SpecEngine
+    from .symbol_index import SymbolIndex
+    from .speckit_integration import SpecKitIntegration
+    from .validation import ValidationEngine
+    from .workflow_engine import GatedWorkflow
 
 
 class RFD:
@@ -27,26 +35,85 @@ class RFD:
         self.rfd_dir = self.root / ".rfd"
         self.db_path = self.rfd_dir / "memory.db"
 
-        # Initialize subsystems
+        # (signature, spec) from the last load_project_spec call
+        self._spec_snapshot: Optional[Tuple[tuple, Dict[str, Any]]] = None
+
+        # Initialize storage; subsystems are built on first access (see properties below)
         self._init_structure()
         self._init_database()
 
-        # Load modules with proper imports
-        self.builder = BuildEngine(self)
-        self.validator = ValidationEngine(self)
-        self.spec = SpecEngine(self)
-        self.session = SessionManager(self)
-        self.project_updater = ProjectUpdater(self)
+    # Subsystems are lazy so each command only pays for what it touches.
+    # cached_property keeps plain attribute assignment working (e.g. rfd.spec = {...}).
+
+    @cached_property
+    def builder(self) -> "BuildEngine":
+        """Build engine - loads the project spec on creation"""
+        from .build import BuildEngine
+
+        return BuildEngine(self)
+
+    @cached_property
+    def validator(self) -> "ValidationEngine":
+        """Validation engine - loads the project spec on creation"""
+        from .validation import ValidationEngine
+
+        return ValidationEngine(self)
+
+    @cached_property
+    def spec(self) -> "SpecEngine":
+        """Spec engine for spec-driven design"""
+        from .spec import SpecEngine
+
+        return SpecEngine(self)
+
+    @cached_property
+    def session(self) -> "SessionManager":
+        """Session manager - loads the active session on creation"""
+        from .session import SessionManager
+
+        return SessionManager(self)
 
-        # Add workflow engine for gated progression
+    @cached_property
+    def project_updater(self) -> "ProjectUpdater":
+        """PROJECT.md updater"""
+        from .project_updater import ProjectUpdater
+
+        return ProjectUpdater(self)
+
+    @cached_property
+    def workflow(self) -> "GatedWorkflow":
+        """Workflow engine for gated progression"""
         from .workflow_engine import GatedWorkflow
 
-        self.workflow = GatedWorkflow(self)
+        return GatedWorkflow(self)
 
-        # Add spec-kit integration
+    @cached_property
+    def speckit(self) -> "SpecKitIntegration":
+        """Spec-kit integration"""
         from .speckit_integration import SpecKitIntegration
 
-        self.speckit = SpecKitIntegration(self)
+        return SpecKitIntegration(self)
+
+    @cached_property
+    def project_files(self) -> "ProjectFiles":
+        """Shared file inventory - the tree is walked once, on first use"""
+        from .project_files import ProjectFiles
+
+        rules = self.load_project_spec().get("rules", {})
+        return ProjectFiles(self.root, respect_gitignore=bool(rules.get("respect_gitignore", False)))
+
+    @cached_property
+    def symbol_index(self) -> "SymbolIndex":
+        """Definitions index over the shared inventory, persisted in .rfd/cache"""
+        from .symbol_index import SymbolIndex
+
+        return SymbolIndex(self.project_files, self.rfd_dir / "cache" / "symbols.db")
+
+    def reset_subsystems(self):
+        """Drop built subsystems so the next access rebuilds them from current state"""
+        for name, attr in vars(type(self)).items():
+            if isinstance(attr, cached_property):
+                self.__dict__.pop(name, None)
 
     def _init_structure(self):
         """Create RFD directory structure"""
@@ -56,85 +123,54 @@ class RFD:
 
     def _init_database(self):
         """Initialize SQLite with WAL mode for state management"""
-        # Use new database utilities for WAL mode and proper setup
+        # Versioned migrations - a single PRAGMA user_version read once the schema is current
         init_database(self.db_path)
-        # migrate_to_wal is already handled in get_db_connection calls
 
-        # Get connection with WAL mode
+    def load_project_spec(self) -> Dict[str, Any]:
+        """
+        Load project spec from database and config.yaml
+
+        The parsed snapshot is reused until config.yaml changes on disk (mtime/size)
+        or the database may have changed - PRAGMA data_version catches commits from
+        other connections, total_changes catches our own writes. Callers get a copy.
+        """
         conn = get_db_connection(self.db_path)
         try:
-            # Core tables
-            conn.executescript(
-                """
-            CREATE TABLE IF NOT EXISTS features (
-                id TEXT PRIMARY KEY,
-                description TEXT,
-                acceptance_criteria TEXT,
-                status TEXT DEFAULT 'pending',
-                created_at TEXT,
-                completed_at TEXT,
-                started_at TEXT,
-                assigned_to TEXT,
-                priority INTEGER DEFAULT 0,
-                tags JSON,
-                metadata JSON
-            );
-
-            CREATE TABLE IF NOT EXISTS checkpoints (
-                id INTEGER PRIMARY KEY,
-                feature_id TEXT,
-                timestamp TEXT,
-                validation_passed BOOLEAN,
-                build_passed BOOLEAN,
-                git_hash TEXT,
-                evidence JSON
-            );
-
-            CREATE TABLE IF NOT EXISTS sessions (
-                id INTEGER PRIMARY KEY,
-                started_at TEXT,
-                ended_at TEXT,
-                feature_id TEXT,
-                success BOOLEAN,
-                changes JSON,
-                errors JSON
-            );
-
-            CREATE TABLE IF NOT EXISTS memory (
-                key TEXT PRIMARY KEY,
-                value JSON,
-                updated_at TEXT
-            );
-        """
-            )
-            conn.commit()
+            data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+            signature = (self._config_signature(), conn, data_version, conn.total_changes)
+
+            if self._spec_snapshot is None or self._spec_snapshot[0] != signature:
+                self._spec_snapshot = (signature, self._read_project_spec(conn))
         finally:
             conn.close()
 
-    def load_project_spec(self) -> Dict[str, Any]:
-        """Load project spec from database and config.yaml"""
+        return _copy_spec(self._spec_snapshot[1])
+
+    def _config_signature(self) -> Optional[Tuple[int, int]]:
+        """(mtime_ns, size) of config.yaml, or None if it does not exist"""
+        try:
+            stat = os.stat(self.rfd_dir / "config.yaml")
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _read_project_spec(self, conn) -> Dict[str, Any]:
+        """Parse config.yaml and read features - the uncached part of load_project_spec"""
         from .config_manager import ConfigManager
-        from .db_utils import get_db_connection
 
         # Get config from config.yaml
         config_mgr = ConfigManager(self.rfd_dir)
         config = config_mgr.load_config() or {}
 
         # Get features from database
-        conn = get_db_connection(self.db_path)
-        features = []
-
-        try:
-            cursor = conn.execute(
-                """SELECT id, description, acceptance_criteria, status
-                   FROM features ORDER BY created_at"""
-            )
-            for row in cursor.fetchall():
-                features.append(
-                    {"id": row[0], "description": row[1], "acceptance": row[2] or "Not specified", "status": row[3]}
-                )
-        finally:
-            conn.close()
+        cursor = conn.execute(
+            """SELECT id, description, acceptance_criteria, status
+               FROM features ORDER BY created_at"""
+        )
+        features = [
+            {"id": row[0], "description": row[1], "acceptance": row[2] or "Not specified", "status": row[3]}
+            for row in cursor.fetchall()
+        ]
 
         # Combine config and features
         spec = {
@@ -149,12 +185,14 @@ class RFD:
 
         return spec
 
-    def get_current_state(self) -> Dict[str, Any]:
-        """Get complete current project state"""
+    def get_current_state(
+        self, use_cache: bool = True, test_jobs: int = 1, test_echo: Optional[Callable[[str], None]] = None
+    ) -> Dict[str, Any]:
+        """Get complete current project state (use_cache=False re-runs the test suite; test_echo shows its output)"""
         return {
             "spec": self.load_project_spec(),
             "validation": self.validator.get_status(),
-            "build": self.builder.get_status(),
+            "build": self.builder.get_status(use_cache, jobs=test_jobs, echo=test_echo),
             "session": self.session.get_current(),
             "features": self.get_features_status(),
         }
@@ -187,7 +225,7 @@ class RFD:
 
     def get_features_status(self) -> list:
         """Get status of all features"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_db_connection(self.db_path, foreign_keys=False)
         try:
             return conn.execute(
                 """
@@ -202,11 +240,11 @@ class RFD:
         finally:
             conn.close()
 
-    def checkpoint(self, message: str):
+    def checkpoint(self, message: str, use_cache: bool = True):
         """Save checkpoint with current state"""
         # Get current state
         validation = self.validator.validate()
-        build = self.builder.get_status()
+        build = self.builder.get_status(use_cache)
 
         # Git commit
         try:
@@ -215,7 +253,7 @@ class RFD:
             git_hash = "no-git"
 
         # Save checkpoint
-        conn = sqlite3.connect(self.db_path)
+        conn = get_db_connection(self.db_path, foreign_keys=False)
         try:
             conn.execute(
                 """
@@ -240,7 +278,7 @@ class RFD:
 
     def revert_to_last_checkpoint(self):
         """Revert to last working checkpoint"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_db_connection(self.db_path, foreign_keys=False)
         try:
             # CRITICAL FIX: Allow revert with validation-only checkpoints
             # Try to find a checkpoint with both validation AND build passing
@@ -279,3 +317,11 @@ class RFD:
                 return False, "Git revert failed"
         finally:
             conn.close()
+
+
+def _copy_spec(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a cached spec so callers can't mutate the snapshot"""
+    result = {key: copy.deepcopy(value) for key, value in spec.items() if key != "features"}
+    # Feature entries are flat dicts of strings - a shallow copy each is enough
+    result["features"] = [dict(feature) for feature in spec["features"]]
+    return result
@@ -0,0 +1,227 @@
+"""
+Compiled scope matching for RFD
+Scope rules compiled once into a prefix trie, an exact-path set and one
+combined glob regex, so drift checks classify thousands of paths cheaply
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+# Bump when the compiled form changes - older cache entries are ignored
+MATCHER_VERSION = 1
+
+# Compiled matchers kept in the cache file; oldest are dropped beyond this
+_MAX_CACHED = 64
+
+# Trie key marking "a prefix ends here" (paths never contain NUL)
+_END = "\0"
+
+
+def glob_to_regex(pattern: str) -> str:
+    """
+    Regex for a glob with pathlib.PurePath.match semantics.
+
+    Relative patterns match from the right ("*.py" matches "a/b.py"), and
+    wildcards never cross a path separator. The result is meant for fullmatch.
+    """
+    pattern = pattern.strip("/")
+    parts = [_glob_part(part) for part in pattern.split("/") if part not in ("", ".")]
+    return "(?:.*/)?" + "/".join(parts)
+
+
+def _glob_part(part: str) -> str:
+    regex = []
+    index = 0
+    while index < len(part):
+        char = part[index]
+        index += 1
+        if char == "*":
+            regex.append("[^/]*")
+        elif char == "?":
+            regex.append("[^/]")
+        elif char == "[":
+            start = index + 1 if part[index : index + 1] == "!" else index
+            start += 1 if part[start : start + 1] == "]" else 0
+            end = part.find("]", start)
+            if end == -1:
+                regex.append(re.escape(char))
+                continue
+            body = re.sub(r"([&~|\[])", r"\\\1", part[index:end].replace("\\", "\\\\"))
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            elif body.startswith("^"):
+                body = "\\" + body
+            regex.append(f"[{body}]")
+            index = end + 1
+        else:
+            regex.append(re.escape(char))
+    return "".join(regex)
+
+
+class ScopeMatcher:
+    """
+    Classifies paths against a scope's rules.
+
+    Rules are checked in a fixed order and match() reports the first kind
+    that applies: "substring" (e.g. build artifacts anywhere in the path),
+    "prefix" (plain startswith, via a character trie), "exact", then "glob".
+    """
+
+    def __init__(
+        self,
+        prefixes: Iterable[str] = (),
+        exact: Iterable[str] = (),
+        globs: Iterable[str] = (),
+        substrings: Iterable[str] = (),
+    ):
+        self.prefixes = sorted(set(prefixes))
+        self.exact = frozenset(exact)
+        self.globs = sorted({glob for glob in globs if glob.strip("/.")})
+        self.substrings = sorted(set(substrings))
+
+        self._trie: Dict[str, Any] = {}
+        for prefix in self.prefixes:
+            node = self._trie
+            for char in prefix:
+                node = node.setdefault(char, {})
+            node[_END] = True
+        self._compile()
+
+    def _compile(self) -> None:
+        self._substring_regex = re.compile("|".join(re.escape(s) for s in self.substrings)) if self.substrings else None
+        self._glob_regex = (
+            re.compile("|".join(f"(?:{glob_to_regex(glob)})" for glob in self.globs)) if self.globs else None
+        )
+
+    @property
+    def empty(self) -> bool:
+        """Whether there are no allow rules at all (substrings don't count)"""
+        return not (self.prefixes or self.exact or self.globs)
+
+    def has_prefix(self, path: str) -> bool:
+        node = self._trie
+        if _END in node:
+            return True
+        for char in path:
+            node = node.get(char)
+            if node is None:
+                return False
+            if _END in node:
+                return True
+        return False
+
+    def match(self, path: str) -> Optional[str]:
+        """Kind of the first rule the path satisfies, or None"""
+        if self._substring_regex is not None and self._substring_regex.search(path):
+            return "substring"
+        if self._trie and self.has_prefix(path):
+            return "prefix"
+        if path in self.exact:
+            return "exact"
+        if self._glob_regex is not None and self._glob_regex.fullmatch(path):
+            return "glob"
+        return None
+
+    # -- persistence -----------------------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "prefixes": self.prefixes,
+            "exact": sorted(self.exact),
+            "globs": self.globs,
+            "substrings": self.substrings,
+            "trie": self._trie,
+            "substring_regex": self._substring_regex.pattern if self._substring_regex else None,
+            "glob_regex": self._glob_regex.pattern if self._glob_regex else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ScopeMatcher":
+        matcher = cls.__new__(cls)
+        matcher.prefixes = data["prefixes"]
+        matcher.exact = frozenset(data["exact"])
+        matcher.globs = data["globs"]
+        matcher.substrings = data["substrings"]
+        matcher._trie = data["trie"]
+        matcher._substring_regex = re.compile(data["substring_regex"]) if data["substring_regex"] else None
+        matcher._glob_regex = re.compile(data["glob_regex"]) if data["glob_regex"] else None
+        return matcher
+
+
+def rules_key(**rules: Iterable[str]) -> str:
+    """Stable cache key for a set of scope rules"""
+    canonical = {kind: sorted(set(values)) for kind, values in rules.items()}
+    return hashlib.sha1(json.dumps(canonical, sort_keys=True).encode()).hexdigest()
+
+
+class MatcherCache:
+    """
+    Compiled matchers persisted in .rfd/cache/scope.json, keyed by their rules.
+
+    A process that checks scope for rules it has seen before loads the trie
+    and regex sources instead of rebuilding them; the file is only rewritten
+    when a new set of rules is compiled.
+    """
+
+    def __init__(self, path: Optional[Path]):
+        self.path = path
+        self._entries: Optional[Dict[str, Any]] = None
+        self._compiled: Dict[str, ScopeMatcher] = {}
+
+    def _load(self) -> Dict[str, Any]:
+        if self._entries is None:
+            self._entries = {}
+            if self.path is not None:
+                try:
+                    data = json.loads(self.path.read_text())
+                    if data.get("version") == MATCHER_VERSION:
+                        self._entries = data.get("matchers", {})
+                except (OSError, ValueError, AttributeError):
+                    pass
+        return self._entries
+
+    def get(
+        self,
+        prefixes: Iterable[str] = (),
+        exact: Iterable[str] = (),
+        globs: Iterable[str] = (),
+        substrings: Iterable[str] = (),
+    ) -> ScopeMatcher:
+        prefixes, exact, globs, substrings = list(prefixes), list(exact), list(globs), list(substrings)
+        key = rules_key(prefixes=prefixes, exact=exact, globs=globs, substrings=substrings)
+        if key in self._compiled:
+            return self._compiled[key]
+
+        entries = self._load()
+        matcher = None
+        if key in entries:
+            try:
+                matcher = ScopeMatcher.from_dict(entries[key])
+            except (KeyError, TypeError, re.error):
+                matcher = None
+        if matcher is None:
+            matcher = ScopeMatcher(prefixes, exact, globs, substrings)
+            entries.pop(key, None)
+            entries[key] = matcher.to_dict()
+            while len(entries) > _MAX_CACHED:
+                entries.pop(next(iter(entries)))
+            self._save(entries)
+
+        self._compiled[key] = matcher
+        return matcher
+
+    def _save(self, entries: Dict[str, Any]) -> None:
+        if self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps({"version": MATCHER_VERSION, "matchers": entries}))
+            os.replace(tmp, self.path)
+        except OSError:
+            # The cache is an optimisation - a read-only .rfd just means recompiling next time
+            pass
@@ -0,0 +1,239 @@
+"""
+Service supervisor for RFD
+Keeps the project's dev service running between rfd commands - started once,
+health-polled with backoff, and restarted only when its sources change
+"""
+
+import json
+import os
+import signal
+import subprocess
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .streaming import rotate_log
+
+# Bump when the recorded state changes shape
+SERVICE_STATE_VERSION = 1
+
+# How long a fresh service gets to pass its health check
+STARTUP_TIMEOUT = 60.0
+
+# Health polling backs off from the first interval, doubling up to the cap
+_FIRST_POLL = 0.05
+_MAX_POLL = 1.0
+
+# SIGTERM grace period before the process group is killed
+_STOP_TIMEOUT = 5.0
+
+# Cold-start durations kept, newest last
+_HISTORY = 10
+
+
+class ServiceSupervisor:
+    """
+    Runs the project's service as a detached process group that outlives the
+    rfd command that started it.
+
+    The pid, command and a fingerprint of the sources it was started from
+    are kept in .rfd/cache/service.json. ensure() reuses a live service
+    started from the same sources, and otherwise (re)starts it and polls the
+    health check with exponential backoff, recording the cold-start time.
+    A healthy service rfd didn't start (e.g. one run by hand) is used as is
+    and never stopped.
+    """
+
+    def __init__(
+        self,
+        command: List[str],
+        cwd: Path,
+        healthy: Callable[[], bool],
+        fingerprint: Callable[[], str],
+        state_path: Path,
+        log_path: Optional[Path] = None,
+        startup_timeout: float = STARTUP_TIMEOUT,
+    ):
+        self.command = list(command)
+        self.cwd = cwd
+        self.healthy = healthy
+        self.fingerprint = fingerprint
+        self.state_path = state_path
+        self.log_path = log_path
+        self.startup_timeout = startup_timeout
+        # Started by this process - kept so it can be reaped
+        self._process: Optional[subprocess.Popen] = None
+
+    def ensure(self, healthy: Optional[Callable[[], bool]] = None) -> Dict[str, Any]:
+        """
+        Make sure the service is up and healthy (by the given health check,
+        or the supervisor's own); returns {"pid", "started", "cold_start",
+        "reason"}. Raises OSError when the command can't be run and
+        RuntimeError when the service exits or never becomes healthy.
+        """
+        healthy = healthy or self.healthy
+        state = self._load_state()
+        fingerprint = self.fingerprint()
+        if state and self._alive(state.get("pid")):
+            if state["command"] != self.command:
+                reason = "start command changed"
+            elif state["fingerprint"] != fingerprint:
+                reason = "sources changed"
+            else:
+                # Possibly still booting from another rfd command - give it the rest of its startup time
+                remaining = self.startup_timeout - (time.time() - state["started"])
+                if self._wait_healthy(state["pid"], max(remaining, _MAX_POLL), healthy):
+                    return {"pid": state["pid"], "started": False, "cold_start": None, "reason": "already running"}
+                reason = "not healthy"
+            self._stop_pid(state["pid"])
+        elif healthy():
+            return {"pid": None, "started": False, "cold_start": None, "reason": "already running (not managed by rfd)"}
+        else:
+            reason = "not running"
+        return self._start(fingerprint, reason, state, healthy)
+
+    def check(self) -> bool:
+        """
+        Whether the service is healthy. A managed service that is still
+        booting is polled (with backoff) until its startup time runs out;
+        anything else gets a single probe.
+        """
+        state = self._load_state()
+        if state and self._alive(state.get("pid")):
+            remaining = self.startup_timeout - (time.time() - state["started"])
+            return self._wait_healthy(state["pid"], max(remaining, 0), self.healthy)
+        return self.healthy()
+
+    def status(self) -> Optional[Dict[str, Any]]:
+        """The managed service's last recorded state plus "running", or None if rfd never started one"""
+        state = self._load_state()
+        if state is None:
+            return None
+        return {**state, "running": self._alive(state.get("pid"))}
+
+    def stop(self) -> bool:
+        """Stop the managed service; False if there was none running"""
+        state = self._load_state()
+        if not state or not state.get("pid"):
+            return False
+        running = self._alive(state["pid"])
+        if running:
+            self._stop_pid(state["pid"])
+        state["pid"] = None
+        self._save_state(state)
+        return running
+
+    # -- process management ---------------------------------------------
+
+    def _start(
+        self, fingerprint: str, reason: str, previous: Optional[Dict[str, Any]], healthy: Callable[[], bool]
+    ) -> Dict[str, Any]:
+        if not self.command:
+            raise RuntimeError("Service is not running and no start command is known for this stack")
+
+        output = subprocess.DEVNULL
+        if self.log_path is not None:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            rotate_log(self.log_path)
+            output = open(self.log_path, "w")
+        start = time.monotonic()
+        try:
+            # Its own session: it survives this command, and the whole group (reloaders, workers) can be stopped
+            self._process = subprocess.Popen(
+                self.command,
+                cwd=self.cwd,
+                stdin=subprocess.DEVNULL,
+                stdout=output,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+        finally:
+            if output is not subprocess.DEVNULL:
+                output.close()
+
+        pid = self._process.pid
+        # Recorded before the wait, so a concurrent rfd command sees it booting rather than starting another
+        state = {
+            "version": SERVICE_STATE_VERSION,
+            "pid": pid,
+            "command": self.command,
+            "fingerprint": fingerprint,
+            "started": time.time(),
+            "started_at": datetime.now().isoformat(),
+            "cold_starts": (previous or {}).get("cold_starts", []),
+        }
+        self._save_state(state)
+
+        if not self._wait_healthy(pid, self.startup_timeout, healthy):
+            returncode = self._process.poll()
+            self._stop_pid(pid)
+            state["pid"] = None
+            self._save_state(state)
+            if returncode is not None:
+                raise RuntimeError(f"{' '.join(self.command)} exited with {returncode}")
+            raise RuntimeError(f"Service not healthy after {self.startup_timeout:.0f}s")
+
+        cold_start = round(time.monotonic() - start, 3)
+        state["cold_starts"] = (state["cold_starts"] + [cold_start])[-_HISTORY:]
+        self._save_state(state)
+        return {"pid": pid, "started": True, "cold_start": cold_start, "reason": reason}
+
+    def _wait_healthy(self, pid: int, timeout: float, healthy: Callable[[], bool]) -> bool:
+        deadline = time.monotonic() + timeout
+        interval = _FIRST_POLL
+        while True:
+            if healthy():
+                return True
+            if not self._alive(pid) or time.monotonic() >= deadline:
+                return False
+            time.sleep(min(interval, max(deadline - time.monotonic(), 0)))
+            interval = min(interval * 2, _MAX_POLL)
+
+    def _alive(self, pid: Optional[int]) -> bool:
+        if not pid:
+            return False
+        if self._process is not None and self._process.pid == pid:
+            return self._process.poll() is None
+        try:
+            # Started as a session leader - a pid reused by another process won't lead its own group
+            return os.getpgid(pid) == pid
+        except OSError:
+            return False
+
+    def _stop_pid(self, pid: int) -> None:
+        try:
+            os.killpg(pid, signal.SIGTERM)
+        except OSError:
+            return
+        deadline = time.monotonic() + _STOP_TIMEOUT
+        while self._alive(pid) and time.monotonic() < deadline:
+            time.sleep(_FIRST_POLL)
+        if self._alive(pid):
+            try:
+                os.killpg(pid, signal.SIGKILL)
+            except OSError:
+                pass
+        if self._process is not None and self._process.pid == pid:
+            self._process.wait()
+            self._process = None
+
+    # -- state ----------------------------------------------------------
+
+    def _load_state(self) -> Optional[Dict[str, Any]]:
+        try:
+            state = json.loads(self.state_path.read_text())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(state, dict) or state.get("version") != SERVICE_STATE_VERSION:
+            return None
+        return state
+
+    def _save_state(self, state: Dict[str, Any]) -> None:
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.state_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(state))
+            os.replace(tmp, self.state_path)
+        except OSError:
+            pass  # the service still runs - the next command just won't find it
@@ -100,17 +100,20 @@ class SessionManager:
         """Start new development session"""
         # Check if feature exists in database (not markdown!)
         conn = get_db_connection(self.rfd.db_path)
+        try:
+            # First check if feature exists in database
+            feature = conn.execute(
+                "SELECT id, description, status FROM features WHERE id = ?", (feature_id,)
+            ).fetchone()
 
-        # First check if feature exists in database
-        feature = conn.execute("SELECT id, description, status FROM features WHERE id = ?", (feature_id,)).fetchone()
-
-        if not feature:
-            # Get all available features from database for error message
-            all_features = conn.execute("SELECT id FROM features ORDER BY created_at DESC").fetchall()
-            available = [f[0] for f in all_features]
-
+            if not feature:
+                # Get all available features from database for error message
+                all_features = conn.execute("SELECT id FROM features ORDER BY created_at DESC").fetchall()
+                available = [f[0] for f in all_features]
+        finally:
             conn.close()
 
+        if not feature:
             # Always raise error for undefined features
             if not available:
                 raise ValueError(
@@ -169,10 +172,12 @@ class SessionManager:
 
         # Get feature data from database
         conn = get_db_connection(self.rfd.db_path)
-        feature_data = conn.execute(
-            "SELECT id, description, acceptance_criteria, status FROM features WHERE id = ?", (feature_id,)
-        ).fetchone()
-        conn.close()
+        try:
+            feature_data = conn.execute(
+                "SELECT id, description, acceptance_criteria, status FROM features WHERE id = ?", (feature_id,)
+            ).fetchone()
+        finally:
+            conn.close()
 
         if feature_data:
             context_mgr.update_current_session(
@@ -197,33 +202,38 @@ class SessionManager:
 
         # Update session record
         conn = get_db_connection(self.rfd.db_path)
-        conn.execute(
-            """
-            UPDATE sessions
-            SET ended_at = ?, success = ?
-            WHERE id = ?
-        """,
-            (datetime.now().isoformat(), success, session_id),
-        )
-
-        # Update feature status if successful
-        if success:
+        try:
             conn.execute(
                 """
-                UPDATE features SET status = 'complete', completed_at = ?
+                UPDATE sessions
+                SET ended_at = ?, success = ?
                 WHERE id = ?
             """,
-                (datetime.now().isoformat(), self.current_session["feature_id"]),
+                (datetime.now().isoformat(), success, session_id),
             )
 
-            # Update PROJECT.md status
-            from .project_updater import ProjectUpdater
+            # Update feature status if successful
+            if success:
+                conn.execute(
+                    """
+                    UPDATE features SET status = 'complete', completed_at = ?
+                    WHERE id = ?
+                """,
+                    (datetime.now().isoformat(), self.current_session["feature_id"]),
+                )
 
-            updater = ProjectUpdater(self.rfd)
-            updater.update_feature_status(self.current_session["feature_id"], "complete")
+                # Update PROJECT.md status
+                from .project_updater import ProjectUpdater
 
-        conn.commit()
-        conn.close()
+                updater = ProjectUpdater(self.rfd)
+                updater.update_feature_status(self.current_session["feature_id"], "complete")
+
+            conn.commit()
+        finally:
+            conn.close()
+
+        # The service was kept running for this session's builds and validations
+        self.rfd.builder.service.stop()
 
         self.current_session = None
         return session_id
@@ -237,16 +247,18 @@ class SessionManager:
         # Otherwise, check database for any active sessions
         try:
             conn = get_db_connection(self.rfd.db_path)
-            result = conn.execute(
+            try:
+                result = conn.execute(
+                    """
+                    SELECT id, started_at, feature_id
+                    FROM sessions
+                    WHERE ended_at IS NULL
+                    ORDER BY started_at DESC
+                    LIMIT 1
                 """
-                SELECT id, started_at, feature_id
-                FROM sessions
-                WHERE ended_at IS NULL
-                ORDER BY started_at DESC
-                LIMIT 1
-            """
-            ).fetchone()
-            conn.close()
+                ).fetchone()
+            finally:
+                conn.close()
 
             if result:
                 session_id, started_at, feature_id = result
@@ -344,13 +356,16 @@ class SessionManager:
 
         # Check for any in-progress features
         conn = get_db_connection(self.rfd.db_path)
-        result = conn.execute(
+        try:
+            result = conn.execute(
+                """
+                SELECT id FROM features
+                WHERE status = 'building'
+                ORDER BY created_at DESC LIMIT 1
             """
-            SELECT id FROM features
-            WHERE status = 'building'
-            ORDER BY created_at DESC LIMIT 1
-        """
-        ).fetchone()
+            ).fetchone()
+        finally:
+            conn.close()
 
         return result[0] if result else None
 
@@ -368,13 +383,16 @@ class SessionManager:
 
         # Check for pending features
         conn = get_db_connection(self.rfd.db_path)
-        pending = conn.execute(
+        try:
+            pending = conn.execute(
+                """
+                SELECT id FROM features
+                WHERE status = 'pending'
+                ORDER BY created_at LIMIT 1
             """
-            SELECT id FROM features
-            WHERE status = 'pending'
-            ORDER BY created_at LIMIT 1
-        """
-        ).fetchone()
+            ).fetchone()
+        finally:
+            conn.close()
 
         if pending:
             return f"rfd session start {pending[0]}"
@@ -437,16 +455,19 @@ class SessionManager:
 
         # Add checkpoints from this session
         conn = get_db_connection(self.rfd.db_path)
-        checkpoints = conn.execute(
-            """
-            SELECT timestamp, validation_passed, build_passed, git_hash, evidence
-            FROM checkpoints
-            WHERE feature_id = ?
-            ORDER BY timestamp DESC
-            LIMIT 10
-        """,
-            (feature_id,),
-        ).fetchall()
+        try:
+            checkpoints = conn.execute(
+                """
+                SELECT timestamp, validation_passed, build_passed, git_hash, evidence
+                FROM checkpoints
+                WHERE feature_id = ?
+                ORDER BY timestamp DESC
+                LIMIT 10
+            """,
+                (feature_id,),
+            ).fetchall()
+        finally:
+            conn.close()
 
         snapshot_data["checkpoints"] = [
             {
@@ -479,14 +500,17 @@ class SessionManager:
     def store_context(self, key: str, value: Any):
         """Store context value for persistence"""
         conn = get_db_connection(self.rfd.db_path)
-        conn.execute(
-            """
-            INSERT OR REPLACE INTO memory (key, value, updated_at)
-            VALUES (?, ?, ?)
-        """,
-            (key, json.dumps(value), datetime.now().isoformat()),
-        )
-        conn.commit()
+        try:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO memory (key, value, updated_at)
+                VALUES (?, ?, ?)
+            """,
+                (key, json.dumps(value), datetime.now().isoformat()),
+            )
+            conn.commit()
+        finally:
+            conn.close()
 
     def get_context(self, key: Optional[str] = None) -> Optional[Any]:
         """Retrieve stored context value or full context if no key"""
@@ -501,12 +525,15 @@ class SessionManager:
 
         # Original implementation with key
         conn = get_db_connection(self.rfd.db_path)
-        result = conn.execute(
-            """
-            SELECT value FROM memory WHERE key = ?
-        """,
-            (key,),
-        ).fetchone()
+        try:
+            result = conn.execute(
+                """
+                SELECT value FROM memory WHERE key = ?
+            """,
+                (key,),
+            ).fetchone()
+        finally:
+            conn.close()
 
         if result:
             return json.loads(result[0])
@@ -515,13 +542,16 @@ class SessionManager:
     def get_session_history(self) -> list:
         """Get history of all sessions"""
         conn = get_db_connection(self.rfd.db_path)
-        sessions = conn.execute(
+        try:
+            sessions = conn.execute(
+                """
+                SELECT id, feature_id, started_at, ended_at, success
+                FROM sessions
+                ORDER BY started_at DESC
             """
-            SELECT id, feature_id, started_at, ended_at, success
-            FROM sessions
-            ORDER BY started_at DESC
-        """
-        ).fetchall()
+            ).fetchall()
+        finally:
+            conn.close()
 
         return [
             {
@@ -537,17 +567,19 @@ class SessionManager:
     def _load_active_session(self):
         """Load active session on initialization"""
         conn = get_db_connection(self.rfd.db_path)
-
-        # Find active session (started but not ended)
-        result = conn.execute(
-            """
-            SELECT id, feature_id, started_at
-            FROM sessions
-            WHERE ended_at IS NULL
-            ORDER BY started_at DESC
-            LIMIT 1
-            """
-        ).fetchone()
+        try:
+            # Find active session (started but not ended)
+            result = conn.execute(
+                """
+                SELECT id, feature_id, started_at
+                FROM sessions
+                WHERE ended_at IS NULL
+                ORDER BY started_at DESC
+                LIMIT 1
+                """
+            ).fetchone()
+        finally:
+            conn.close()
 
         if result:
             self.current_session = {
@@ -555,5 +587,3 @@ class SessionManager:
                 "feature_id": result[1],
                 "started_at": result[2],
             }
-
-        conn.close()
@@ -9,6 +9,8 @@ from typing import Dict
 import frontmatter
 import questionary
 
+from .db_utils import get_db_connection
+
 
 class SpecEngine:
     def __init__(self, rfd):
@@ -139,26 +141,26 @@ class SpecEngine:
 
     def _init_features(self, features: list):
         """Initialize features in database"""
-        import sqlite3
-
-        conn = sqlite3.connect(self.rfd.db_path)
-
-        for feature in features:
-            conn.execute(
-                """
-                INSERT OR REPLACE INTO features (id, description, acceptance_criteria, status, created_at)
-                VALUES (?, ?, ?, ?, ?)
-            """,
-                (
-                    feature["id"],
-                    feature["description"],
-                    feature.get("acceptance", ""),
-                    "pending",
-                    datetime.now().isoformat(),
-                ),
-            )
+        conn = get_db_connection(self.rfd.db_path, foreign_keys=False)
+        try:
+            for feature in features:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO features (id, description, acceptance_criteria, status, created_at)
+                    VALUES (?, ?, ?, ?, ?)
+                """,
+                    (
+                        feature["id"],
+                        feature["description"],
+                        feature.get("acceptance", ""),
+                        "pending",
+                        datetime.now().isoformat(),
+                    ),
+                )
 
-        conn.commit()
+            conn.commit()
+        finally:
+            conn.close()
 
     def validate(self, spec=None) -> bool:
         """Validate spec against Spec Kit standards"""
@@ -3,11 +3,12 @@ Spec-Kit Style Integration for RFD
 Brings the best of GitHub's spec-kit into RFD
 """
 
-import sqlite3
 from datetime import datetime
 from pathlib import Path
 from typing import List
 
+from .db_utils import get_db_connection
+
 
 class SpecKitIntegration:
     """Integrates spec-kit style workflow into RFD"""
@@ -28,8 +29,6 @@ class SpecKitIntegration:
         Store project constitution in database (immutable principles)
         No more file-based constitution!
         """
-        from .db_utils import get_db_connection
-
         conn = get_db_connection(self.rfd.db_path)
         try:
             # Check if constitution already exists
@@ -372,7 +371,7 @@ rfd complete {feature_id}
 
     def _store_tasks_in_db(self, feature_id: str, tasks: List[str]):
         """Store tasks in database for tracking"""
-        conn = sqlite3.connect(self.rfd.db_path)
+        conn = get_db_connection(self.rfd.db_path, foreign_keys=False)
 
         # Clear existing tasks for this feature
         conn.execute("DELETE FROM tasks WHERE feature_id = ?", (feature_id,))
@@ -418,7 +417,7 @@ rfd complete {feature_id}
         Like spec-kit's /implement command
         """
         # Load tasks
-        conn = sqlite3.connect(self.rfd.db_path)
+        conn = get_db_connection(self.rfd.db_path, foreign_keys=False)
         tasks = conn.execute(
             """
             SELECT id, description, status FROM tasks
@@ -449,7 +448,7 @@ rfd complete {feature_id}
 
             if validation_result["passing"]:
                 # Mark task complete
-                conn = sqlite3.connect(self.rfd.db_path)
+                conn = get_db_connection(self.rfd.db_path, foreign_keys=False)
                 conn.execute(
                     """
                     UPDATE tasks SET status = 'complete', completed_at = ?
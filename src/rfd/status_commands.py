@@ -2,10 +2,10 @@
 Status and dashboard commands extracted from CLI to reduce line count
 """
 
-import sqlite3
-
 import click
 
+from .db_utils import get_db_connection
+
 
 def show_project_status(rfd):
     """Comprehensive project status with phases, tasks, and next actions"""
@@ -33,15 +33,18 @@ def show_project_status(rfd):
         click.echo(f"   {data['current_focus']['id']}: {data['current_focus']['description']}")
 
         # Show tasks for current feature
-        conn = sqlite3.connect(rfd.db_path)
-        tasks = conn.execute(
-            """
-            SELECT description, status FROM tasks
-            WHERE feature_id = ?
-            ORDER BY created_at
-        """,
-            (data["current_focus"]["id"],),
-        ).fetchall()
+        conn = get_db_connection(rfd.db_path, foreign_keys=False)
+        try:
+            tasks = conn.execute(
+                """
+                SELECT description, status FROM tasks
+                WHERE feature_id = ?
+                ORDER BY created_at
+            """,
+                (data["current_focus"]["id"],),
+            ).fetchall()
+        finally:
+            conn.close()
 
         if tasks:
             click.echo("\n📝 Current Tasks:")
@@ -51,8 +54,18 @@ def show_project_status(rfd):
 
     # Phase Status
     click.echo("\n🔄 Project Phases:")
-    conn = sqlite3.connect(rfd.db_path)
-    phases = conn.execute("SELECT name, status, order_index FROM project_phases ORDER BY order_index").fetchall()
+    conn = get_db_connection(rfd.db_path, foreign_keys=False)
+    try:
+        phases = conn.execute("SELECT name, status, order_index FROM project_phases ORDER BY order_index").fetchall()
+        checkpoints = conn.execute(
+            """
+            SELECT c.timestamp, c.feature_id, c.validation_passed, c.build_passed
+            FROM checkpoints c
+            ORDER BY c.timestamp DESC LIMIT 3
+        """
+        ).fetchall()
+    finally:
+        conn.close()
 
     if phases:
         for name, status, _ in phases:
@@ -62,14 +75,6 @@ def show_project_status(rfd):
         click.echo("   No phases configured")
 
     # Recent Activity
-    checkpoints = conn.execute(
-        """
-        SELECT c.timestamp, c.feature_id, c.validation_passed, c.build_passed
-        FROM checkpoints c
-        ORDER BY c.timestamp DESC LIMIT 3
-    """
-    ).fetchall()
-
     if checkpoints:
         click.echo("\n📈 Recent Activity:")
         for timestamp, feature_id, val, build in checkpoints:
@@ -96,8 +101,6 @@ def show_project_status(rfd):
         else:
             click.echo(f"   rfd checkpoint 'Progress on {current_id}'")
 
-    conn.close()
-
 
 def show_dashboard(rfd):
     """Show project dashboard with all features and progress"""
@@ -0,0 +1,230 @@
+"""
+Streaming subprocess output for RFD
+Runs a command with its output handed on line by line as it arrives - to the
+terminal, to a size-rotated log under .rfd/logs and to incremental parsers -
+keeping only a bounded tail of it in memory
+"""
+
+import os
+import re
+import subprocess
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable, List, NamedTuple, Optional
+
+from .test_reports import FAILED, PASSED, SKIPPED, TestCase, parse_go_json, parse_libtest
+
+# Output kept in memory per stream (whole lines, newest last); longer lines are split at this size
+TAIL_BYTES = 64 * 1024
+
+# A log rolls over to name.1, name.2, ... at this size; older parts beyond LOG_BACKUPS are dropped
+LOG_MAX_BYTES = 20 * 1024 * 1024
+LOG_BACKUPS = 4
+
+# After a kill, how long to wait for the pipes to drain (a grandchild may still hold them)
+_DRAIN_TIMEOUT = 5
+
+
+class OutputTail:
+    """The last max_bytes of a stream, in whole lines"""
+
+    def __init__(self, max_bytes: int = TAIL_BYTES):
+        self.max_bytes = max_bytes
+        self.dropped = 0
+        self._lines: deque = deque()
+        self._size = 0
+
+    def append(self, line: str) -> None:
+        self._lines.append(line)
+        self._size += len(line)
+        while self._size > self.max_bytes and len(self._lines) > 1:
+            self._size -= len(self._lines.popleft())
+            self.dropped += 1
+
+    def text(self) -> str:
+        prefix = f"[... {self.dropped} earlier line(s) only in the log]\n" if self.dropped else ""
+        return prefix + "".join(self._lines)
+
+
+class RotatingLog:
+    """
+    A log file that starts fresh for every run - the previous run's log
+    becomes name.1 - and rolls over the same way once it passes max_bytes.
+    """
+
+    def __init__(self, path: Path, max_bytes: int = LOG_MAX_BYTES, backups: int = LOG_BACKUPS):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._rotate()
+        self._file = open(self.path, "w", encoding="utf-8", errors="replace")
+        self._size = 0
+
+    def write(self, line: str) -> None:
+        if self._file.closed:
+            return  # a reader still draining after the run was given up on
+        if self._size + len(line) > self.max_bytes and self._size:
+            self._file.close()
+            self._rotate()
+            self._file = open(self.path, "w", encoding="utf-8", errors="replace")
+            self._size = 0
+        self._file.write(line)
+        self._size += len(line)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def _rotate(self) -> None:
+        rotate_log(self.path, self.backups)
+
+
+def rotate_log(path: Path, backups: int = LOG_BACKUPS) -> None:
+    """Move path to path.1 (path.1 to path.2, ...), keeping at most backups old logs"""
+    if not path.exists():
+        return
+    for index in range(backups, 0, -1):
+        older = path.with_name(f"{path.name}.{index}")
+        newer = path.with_name(f"{path.name}.{index - 1}") if index > 1 else path
+        if newer.exists():
+            os.replace(newer, older)
+
+
+class StreamResult(NamedTuple):
+    returncode: Optional[int]  # None when the command timed out
+    seconds: float
+    output: str  # tail of stdout
+    errors: str  # tail of stderr
+    log: Optional[Path]
+
+    @property
+    def timed_out(self) -> bool:
+        return self.returncode is None
+
+
+def run_streaming(
+    command: List[str],
+    cwd=None,
+    log_path: Optional[Path] = None,
+    echo: Optional[Callable[[str], None]] = None,
+    on_line: Optional[Callable[[str], None]] = None,
+    timeout: Optional[float] = None,
+    tail_bytes: int = TAIL_BYTES,
+) -> StreamResult:
+    """
+    Run command, passing each line of its output to echo (without the newline)
+    and on_line as it arrives, and appending it to the log at log_path.
+
+    stdout and stderr are read by one thread each, so neither can block the
+    process on a full pipe. Raises OSError when the command can't be started,
+    as subprocess.run does.
+    """
+    start = time.monotonic()
+    process = subprocess.Popen(
+        command,
+        cwd=cwd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors="replace",
+    )
+    log = RotatingLog(log_path) if log_path is not None else None
+    tails = (OutputTail(tail_bytes), OutputTail(tail_bytes))
+    lock = threading.Lock()
+
+    def pump(stream, tail: OutputTail) -> None:
+        with stream:
+            while True:
+                line = stream.readline(tail_bytes)
+                if not line:
+                    break
+                # One line at a time across both streams, as a terminal would show them
+                with lock:
+                    tail.append(line)
+                    if log is not None:
+                        log.write(line)
+                    if echo is not None:
+                        echo(line.rstrip("\n"))
+                    if on_line is not None:
+                        on_line(line)
+
+    readers = [
+        threading.Thread(target=pump, args=(process.stdout, tails[0]), daemon=True),
+        threading.Thread(target=pump, args=(process.stderr, tails[1]), daemon=True),
+    ]
+    try:
+        for reader in readers:
+            reader.start()
+        try:
+            returncode: Optional[int] = process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            returncode = None
+        for reader in readers:
+            reader.join(_DRAIN_TIMEOUT if returncode is None else None)
+    finally:
+        if log is not None:
+            with lock:
+                log.close()
+    return StreamResult(returncode, time.monotonic() - start, tails[0].text(), tails[1].text(), log_path)
+
+
+class TestProgress:
+    """
+    Test outcomes parsed from a runner's output as it streams: per-test cases
+    for runners that print them (go test -json, cargo's libtest), running
+    counts, and pytest's completion percentage.
+    """
+
+    __test__ = False  # not a pytest test class
+
+    # pytest's progress lines: "tests/test_a.py ..F.s    [ 40%]", or with -v "tests/test_a.py::test_b PASSED   [ 40%]"
+    _PYTEST_PROGRESS = re.compile(r"^(?:\S+ )?([.FEsxX]+)\s+\[\s*(\d+)%\]\s*$")
+    _PYTEST_VERBOSE = re.compile(r"^\S+::\S+ (PASSED|FAILED|ERROR|SKIPPED|XFAIL|XPASS)\s+\[\s*(\d+)%\]\s*$")
+    _PYTEST_MARKS = {"PASSED": ".", "FAILED": "F", "ERROR": "E", "SKIPPED": "s", "XFAIL": "x", "XPASS": "X"}
+
+    def __init__(self, runner: str):
+        self.runner = runner
+        self.counts = {PASSED: 0, FAILED: 0, SKIPPED: 0}
+        self.percent: Optional[int] = None
+        self._json_cases: List[TestCase] = []
+        self._text_cases: List[TestCase] = []
+
+    @property
+    def cases(self) -> List[TestCase]:
+        # libtest's JSON events, when present, supersede its plain lines
+        return self._json_cases or self._text_cases
+
+    def feed(self, line: str) -> None:
+        if self.runner == "go":
+            self._add(parse_go_json([line]), self._json_cases)
+        elif self.runner == "cargo":
+            self._add(parse_libtest(line), self._json_cases if line.startswith("{") else self._text_cases)
+        elif self.runner == "pytest":
+            match = self._PYTEST_PROGRESS.match(line)
+            if match:
+                marks, percent = match.groups()
+            else:
+                match = self._PYTEST_VERBOSE.match(line)
+                if not match:
+                    return
+                marks, percent = self._PYTEST_MARKS[match.group(1)], match.group(2)
+            self.counts[PASSED] += marks.count(".")
+            self.counts[FAILED] += marks.count("F") + marks.count("E")
+            self.counts[SKIPPED] += len(marks) - marks.count(".") - marks.count("F") - marks.count("E")
+            self.percent = int(percent)
+
+    def summary(self) -> str:
+        parts = [f"{count} {outcome}" for outcome, count in self.counts.items() if count]
+        if self.percent is not None:
+            parts.append(f"{self.percent}%")
+        return ", ".join(parts)
+
+    def _add(self, cases, into: List[TestCase]) -> None:
+        for case in cases:
+            into.append(case)
+            self.counts[case.outcome] += 1
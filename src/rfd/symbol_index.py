@@ -0,0 +1,311 @@
+"""
+Symbol index for RFD
+Persistent map of file -> defined functions/classes/methods, so AI claim
+verification is a lookup instead of a re-scan of every source file.
+"""
+
+import ast
+import bisect
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from .db_utils import get_db_connection, transaction
+from .project_files import ProjectFiles
+
+# Bump when extraction changes - the cache is rebuilt from scratch on mismatch
+INDEX_VERSION = 1
+
+_NAME = r"(?P<name>[A-Za-z_$][\w$]*)"
+
+# Same definitions AIClaimValidator._check_function_in_file recognises, with the name captured
+_PATTERNS: Dict[str, List[Tuple[str, "re.Pattern[str]"]]] = {
+    ".js": [
+        ("function", re.compile(rf"^\s*function\s+{_NAME}\s*\(", re.MULTILINE)),
+        ("function", re.compile(rf"^\s*async\s+function\s+{_NAME}\s*\(", re.MULTILINE)),
+        ("function", re.compile(rf"^\s*const\s+{_NAME}\s*=\s*(?:async\s+)?(?:\([^)]*\)|[^=]+)\s*=>", re.MULTILINE)),
+        ("class", re.compile(rf"^\s*(?:export\s+)?(?:default\s+)?class\s+{_NAME}\s*{{", re.MULTILINE)),
+    ],
+    ".go": [
+        ("function", re.compile(rf"^\s*func\s+{_NAME}\s*\(", re.MULTILINE)),
+        ("method", re.compile(rf"^\s*func\s+\([^)]+\)\s+{_NAME}\s*\(", re.MULTILINE)),
+        ("struct", re.compile(rf"^\s*type\s+{_NAME}\s+struct\s*{{", re.MULTILINE)),
+    ],
+    ".rs": [
+        ("function", re.compile(rf"^\s*(?:pub\s+)?(?:async\s+)?fn\s+{_NAME}\s*[<\(]", re.MULTILINE)),
+        ("struct", re.compile(rf"^\s*(?:pub\s+)?struct\s+{_NAME}\s*[{{<\s]", re.MULTILINE)),
+        ("enum", re.compile(rf"^\s*(?:pub\s+)?enum\s+{_NAME}\s*[{{<\s]", re.MULTILINE)),
+    ],
+}
+_PATTERNS[".ts"] = _PATTERNS[".js"]
+
+# Regex fallback for Python files that don't parse
+_PYTHON_PATTERNS = [
+    ("function", re.compile(rf"^\s*(?:async\s+)?def\s+{_NAME}\s*\(", re.MULTILINE)),
+    ("class", re.compile(rf"^\s*class\s+{_NAME}\s*[:\(]", re.MULTILINE)),
+]
+
+INDEXED_SUFFIXES = (".py",) + tuple(_PATTERNS)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS symbol_files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER,
+    size INTEGER,
+    sha1 TEXT,
+    indexed_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS symbols (
+    path TEXT NOT NULL,
+    name TEXT NOT NULL,
+    kind TEXT,
+    start_line INTEGER,
+    end_line INTEGER,
+    FOREIGN KEY (path) REFERENCES symbol_files (path) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_symbols_name ON symbols(name);
+CREATE INDEX IF NOT EXISTS idx_symbols_path ON symbols(path);
+"""
+
+
+class Symbol(NamedTuple):
+    path: str
+    name: str
+    kind: str
+    start_line: int
+    end_line: int
+
+
+def extract_symbols(path: str, content: str) -> List[Tuple[str, str, int, int]]:
+    """(name, kind, start_line, end_line) for every definition in a source file"""
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix == ".py":
+        try:
+            return _python_symbols(ast.parse(content))
+        except (SyntaxError, ValueError):
+            return _regex_symbols(content, _PYTHON_PATTERNS, braces=False)
+    if suffix in _PATTERNS:
+        return _regex_symbols(content, _PATTERNS[suffix], braces=True)
+    return []
+
+
+def _python_symbols(tree: ast.AST) -> List[Tuple[str, str, int, int]]:
+    symbols = []
+
+    def visit(node: ast.AST, in_class: bool) -> None:
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, ast.ClassDef):
+                symbols.append((child.name, "class", child.lineno, child.end_lineno or child.lineno))
+                visit(child, True)
+            elif isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                kind = "method" if in_class else "function"
+                symbols.append((child.name, kind, child.lineno, child.end_lineno or child.lineno))
+                visit(child, False)
+            else:
+                visit(child, in_class)
+
+    visit(tree, False)
+    return symbols
+
+
+def _regex_symbols(content: str, patterns, braces: bool) -> List[Tuple[str, str, int, int]]:
+    line_starts = [0] + [m.end() for m in re.finditer("\n", content)]
+
+    def line_of(offset: int) -> int:
+        return bisect.bisect_right(line_starts, offset)
+
+    symbols = []
+    for kind, pattern in patterns:
+        for match in pattern.finditer(content):
+            start = line_of(match.start("name"))
+            end = _block_end_line(content, match.end(), line_of) if braces else start
+            symbols.append((match.group("name"), kind, start, max(end, start)))
+    return symbols
+
+
+def _block_end_line(content: str, offset: int, line_of) -> int:
+    """Line of the brace closing the block opened on the definition line (best effort)"""
+    line_end = content.find("\n", offset)
+    opening = content.find("{", offset - 1)
+    if opening == -1 or (line_end != -1 and opening > line_end):
+        return line_of(offset)
+
+    depth = 0
+    for index in range(opening, len(content)):
+        char = content[index]
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return line_of(index)
+    return line_of(len(content))
+
+
+class SymbolIndex:
+    """
+    Incrementally maintained symbol index.
+
+    Lives in .rfd/cache/symbols.db (a disposable cache, separate from
+    memory.db). Files are re-read only when mtime/size change, and re-parsed
+    only when their content hash changes too. The first lookup in a process
+    brings the index up to date with the project inventory.
+    """
+
+    def __init__(self, files: Optional[ProjectFiles] = None, cache_path: Optional[Path] = None):
+        self.files = files if files is not None else ProjectFiles()
+        if cache_path is None and (self.files.root / ".rfd").is_dir():
+            cache_path = self.files.root / ".rfd" / "cache" / "symbols.db"
+        self.cache_path = cache_path
+
+        self._lock = threading.Lock()
+        self._refreshed = False
+        self._memory: Optional[sqlite3.Connection] = None
+
+    # -- storage -------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.cache_path is None:
+            # No project directory to persist into - keep the index for this process only
+            if self._memory is None:
+                self._memory = sqlite3.connect(":memory:", check_same_thread=False)
+                self._memory.execute("PRAGMA foreign_keys=ON")
+                self._memory.executescript(_SCHEMA)
+                self._memory.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+            return self._memory
+
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = get_db_connection(self.cache_path)
+        if conn.execute("PRAGMA user_version").fetchone()[0] != INDEX_VERSION:
+            conn.executescript("DROP TABLE IF EXISTS symbols; DROP TABLE IF EXISTS symbol_files;" + _SCHEMA)
+            conn.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+        return conn
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        if conn is not self._memory:
+            conn.close()
+
+    # -- maintenance ---------------------------------------------------
+
+    def refresh(self, paths: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """
+        Bring the index up to date with the file inventory.
+
+        With paths (project-relative, e.g. from a file watcher) only those
+        files are re-checked; the rest of the index is trusted as is.
+        """
+        with self._lock:
+            if paths is not None:
+                return self._refresh(set(paths))
+            stats = self._refresh()
+            self._refreshed = True
+            return stats
+
+    def _ensure_fresh(self) -> None:
+        if not self._refreshed:
+            self.refresh()
+
+    def _refresh(self, only: Optional[Set[str]] = None) -> Dict[str, int]:
+        stats = {"files": 0, "reparsed": 0, "removed": 0}
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT path, mtime_ns, size, sha1 FROM symbol_files")
+            known = {row[0]: (row[1], row[2], row[3]) for row in rows}
+
+            root = str(self.files.root)
+            if only is None:
+                candidates = self.files.with_suffix(*INDEXED_SUFFIXES)
+            else:
+                candidates = [
+                    self.files.root / key
+                    for key in sorted(only)
+                    if key.endswith(INDEXED_SUFFIXES) and os.path.isfile(os.path.join(root, key))
+                ]
+                known = {key: value for key, value in known.items() if key in only}
+
+            updates = []
+            seen = set()
+            for path in candidates:
+                key = os.path.relpath(path, root)
+                seen.add(key)
+                stats["files"] += 1
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+
+                previous = known.get(key)
+                if previous and previous[0] == stat.st_mtime_ns and previous[1] == stat.st_size:
+                    continue
+                updates.append((key, path, stat, previous[2] if previous else None))
+
+            removed = [key for key in known if key not in seen]
+
+            if updates or removed:
+                # A plain sqlite3 connection commits/rolls back as a context manager
+                with conn if conn is self._memory else transaction(self.cache_path) as db:
+                    for key in removed:
+                        db.execute("DELETE FROM symbol_files WHERE path = ?", (key,))
+                    stats["removed"] = len(removed)
+
+                    now = datetime.now().isoformat()
+                    for key, path, stat, old_hash in updates:
+                        try:
+                            data = Path(path).read_bytes()
+                        except OSError:
+                            continue
+                        digest = hashlib.sha1(data).hexdigest()
+
+                        if digest == old_hash:
+                            # Touched but unchanged - just record the new stat
+                            db.execute(
+                                "UPDATE symbol_files SET mtime_ns = ?, size = ?, indexed_at = ? WHERE path = ?",
+                                (stat.st_mtime_ns, stat.st_size, now, key),
+                            )
+                            continue
+
+                        stats["reparsed"] += 1
+                        db.execute(
+                            "INSERT OR REPLACE INTO symbol_files (path, mtime_ns, size, sha1, indexed_at)"
+                            " VALUES (?, ?, ?, ?, ?)",
+                            (key, stat.st_mtime_ns, stat.st_size, digest, now),
+                        )
+                        db.execute("DELETE FROM symbols WHERE path = ?", (key,))
+                        symbols = extract_symbols(key, data.decode("utf-8", errors="ignore"))
+                        db.executemany(
+                            "INSERT INTO symbols (path, name, kind, start_line, end_line) VALUES (?, ?, ?, ?, ?)",
+                            [(key, name, kind, start, end) for name, kind, start, end in symbols],
+                        )
+        finally:
+            self._release(conn)
+        return stats
+
+    # -- lookups -------------------------------------------------------
+
+    def find(self, name: str, suffixes: Tuple[str, ...] = INDEXED_SUFFIXES) -> List[Symbol]:
+        """All definitions of a name, optionally limited to some file types"""
+        self._ensure_fresh()
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT path, name, kind, start_line, end_line FROM symbols WHERE name = ? ORDER BY path, start_line",
+                (name,),
+            ).fetchall()
+        finally:
+            self._release(conn)
+        return [Symbol(*row) for row in rows if row[0].lower().endswith(suffixes)]
+
+    def defines(self, name: str, suffixes: Tuple[str, ...] = INDEXED_SUFFIXES) -> bool:
+        """Whether any indexed file defines the name"""
+        return bool(self.find(name, suffixes))
+
+    def path_of(self, symbol: Symbol) -> Path:
+        """Filesystem path for a symbol's file"""
+        return self.files.root / symbol.path
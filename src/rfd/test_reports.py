@@ -0,0 +1,282 @@
+"""
+Test reports for RFD
+Stream-parses each runner's machine-readable output (JUnit XML, go test -json,
+libtest, jest --json) into per-test outcomes and durations, stores them in the
+test_runs/test_results tables and answers `rfd perf tests` from them
+"""
+
+import json
+import re
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from .db_utils import get_db_connection, transaction
+
+PASSED, FAILED, SKIPPED = "passed", "failed", "skipped"
+
+# libtest's plain output: "test module::name ... ok" (FAILED / ignored)
+_LIBTEST_LINE = re.compile(r"^test (\S+) \.\.\. (ok|FAILED|ignored)", re.MULTILINE)
+_LIBTEST_OUTCOMES = {"ok": PASSED, "FAILED": FAILED, "ignored": SKIPPED}
+
+_GO_OUTCOMES = {"pass": PASSED, "fail": FAILED, "skip": SKIPPED}
+_JEST_OUTCOMES = {"passed": PASSED, "failed": FAILED, "pending": SKIPPED, "skipped": SKIPPED, "todo": SKIPPED}
+
+
+class TestCase(NamedTuple):
+    """One test's outcome; group is its class/module (pytest), package (go) or file (jest)"""
+
+    __test__ = False  # not a pytest test class
+
+    test_id: str
+    group: str
+    outcome: str
+    seconds: Optional[float]
+    file: Optional[str] = None
+
+
+def parse_junit(path: Path) -> Iterator[TestCase]:
+    """Testcases from a JUnit XML report, parsed incrementally so big reports stay cheap"""
+    try:
+        for _event, element in ET.iterparse(str(path), events=("end",)):
+            if element.tag != "testcase":
+                continue
+            classname = element.get("classname", "")
+            outcome = PASSED
+            for child in element:
+                if child.tag in ("failure", "error"):
+                    outcome = FAILED
+                elif child.tag == "skipped" and outcome == PASSED:
+                    outcome = SKIPPED
+            try:
+                seconds: Optional[float] = float(element.get("time") or 0)
+            except ValueError:
+                seconds = None
+            name = element.get("name", "")
+            test_id = f"{classname}::{name}" if classname else name
+            yield TestCase(test_id, classname, outcome, seconds, element.get("file"))
+            element.clear()
+    except (OSError, ET.ParseError):
+        return
+
+
+def parse_go_json(lines: Iterable[str]) -> Iterator[TestCase]:
+    """Test events from `go test -json` (one JSON object per line)"""
+    for line in lines:
+        if not line.startswith("{"):
+            continue
+        try:
+            event = json.loads(line)
+        except ValueError:
+            continue
+        outcome = _GO_OUTCOMES.get(event.get("Action"))
+        if outcome is None or not event.get("Test"):
+            continue
+        package = event.get("Package", "")
+        yield TestCase(f"{package}::{event['Test']}", package, outcome, event.get("Elapsed"))
+
+
+def parse_libtest(output: str) -> Iterator[TestCase]:
+    """
+    Tests from cargo test: libtest's JSON events when the project enables them
+    (`--format json --report-time`), otherwise its "test x ... ok" lines.
+    """
+    json_seen = False
+    for line in output.splitlines():
+        if not line.startswith("{"):
+            continue
+        try:
+            event = json.loads(line)
+        except ValueError:
+            continue
+        if event.get("type") != "test" or event.get("event") not in ("ok", "failed", "ignored"):
+            continue
+        json_seen = True
+        name = event.get("name", "")
+        outcome = {"ok": PASSED, "failed": FAILED, "ignored": SKIPPED}[event["event"]]
+        yield TestCase(name, name.rpartition("::")[0], outcome, event.get("exec_time"))
+    if json_seen:
+        return
+    for name, status in _LIBTEST_LINE.findall(output):
+        yield TestCase(name, name.rpartition("::")[0], _LIBTEST_OUTCOMES[status], None)
+
+
+def parse_jest_json(path: Path, root: Optional[Path] = None) -> Iterator[TestCase]:
+    """Assertions from a jest --json report"""
+    try:
+        report = json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return
+    for suite in report.get("testResults") or []:
+        file = suite.get("name") or suite.get("testFilePath") or ""
+        if root is not None and file.startswith(str(root)):
+            file = Path(file).relative_to(root).as_posix()
+        for assertion in suite.get("assertionResults") or []:
+            outcome = _JEST_OUTCOMES.get(assertion.get("status"), FAILED)
+            duration = assertion.get("duration")
+            name = assertion.get("fullName") or assertion.get("title", "")
+            yield TestCase(f"{file}::{name}", file, outcome, duration / 1000 if duration is not None else None, file)
+
+
+# -- storage ----------------------------------------------------------------
+
+
+def record_run(
+    db_path,
+    runner: str,
+    cases: List[TestCase],
+    passed: bool,
+    seconds: float,
+    scope: str = "full",
+    git_hash: Optional[str] = None,
+    fingerprint: Optional[str] = None,
+) -> int:
+    """Store one run and its per-test results; returns the run id"""
+    failed = sum(1 for case in cases if case.outcome == FAILED)
+    skipped = sum(1 for case in cases if case.outcome == SKIPPED)
+    with transaction(db_path) as conn:
+        # Runs belong to the checkpoint they follow, so durations can be compared across checkpoints
+        checkpoint = conn.execute("SELECT MAX(id) FROM checkpoints").fetchone()[0]
+        cursor = conn.execute(
+            """
+            INSERT INTO test_runs (started_at, runner, scope, git_hash, fingerprint, checkpoint_id,
+                                   passed, total, failed, skipped, seconds)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+            (
+                datetime.now().isoformat(),
+                runner,
+                scope,
+                git_hash,
+                fingerprint,
+                checkpoint,
+                passed,
+                len(cases),
+                failed,
+                skipped,
+                round(seconds, 3),
+            ),
+        )
+        run_id = cursor.lastrowid
+        conn.executemany(
+            "INSERT INTO test_results (run_id, test_id, file, outcome, seconds) VALUES (?, ?, ?, ?, ?)",
+            [(run_id, case.test_id, case.file or case.group, case.outcome, case.seconds) for case in cases],
+        )
+    return run_id
+
+
+# -- reports ----------------------------------------------------------------
+
+
+def slowest_tests(db_path, limit: int = 10, runs: int = 20) -> List[Dict[str, Any]]:
+    """Tests with the highest average duration over the most recent runs"""
+    conn = get_db_connection(db_path)
+    try:
+        rows = conn.execute(
+            """
+            SELECT test_id, AVG(seconds), MAX(seconds), COUNT(*)
+            FROM test_results
+            WHERE seconds IS NOT NULL
+              AND run_id IN (SELECT id FROM test_runs ORDER BY id DESC LIMIT ?)
+            GROUP BY test_id
+            ORDER BY AVG(seconds) DESC
+            LIMIT ?
+        """,
+            (runs, limit),
+        ).fetchall()
+    finally:
+        conn.close()
+    return [{"test": test, "average": avg, "max": peak, "runs": count} for test, avg, peak, count in rows]
+
+
+def checkpoints_with_runs(db_path) -> List[int]:
+    """Checkpoint ids that have test runs after them, oldest first"""
+    conn = get_db_connection(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT DISTINCT checkpoint_id FROM test_runs WHERE checkpoint_id IS NOT NULL ORDER BY checkpoint_id"
+        ).fetchall()
+    finally:
+        conn.close()
+    return [row[0] for row in rows]
+
+
+def duration_regressions(
+    db_path,
+    before: Optional[int] = None,
+    after: Optional[int] = None,
+    threshold: float = 1.5,
+    min_seconds: float = 0.1,
+) -> Dict[str, Any]:
+    """
+    Tests whose average duration grew by threshold x or more between the runs
+    following two checkpoints (default: the last two that have runs).
+    Changes smaller than min_seconds are ignored as noise.
+    """
+    if before is None or after is None:
+        known = checkpoints_with_runs(db_path)
+        if len(known) < 2:
+            return {"before": before, "after": after, "regressions": []}
+        before = known[-2] if before is None else before
+        after = known[-1] if after is None else after
+
+    conn = get_db_connection(db_path)
+    try:
+        rows = conn.execute(
+            """
+            WITH durations AS (
+                SELECT r.test_id, t.checkpoint_id, AVG(r.seconds) AS seconds
+                FROM test_results r JOIN test_runs t ON t.id = r.run_id
+                WHERE r.seconds IS NOT NULL AND r.outcome = 'passed' AND t.checkpoint_id IN (?, ?)
+                GROUP BY r.test_id, t.checkpoint_id
+            )
+            SELECT old.test_id, old.seconds, new.seconds
+            FROM durations old JOIN durations new ON new.test_id = old.test_id
+            WHERE old.checkpoint_id = ? AND new.checkpoint_id = ?
+              AND new.seconds - old.seconds >= ? AND new.seconds >= old.seconds * ?
+            ORDER BY new.seconds - old.seconds DESC
+        """,
+            (before, after, before, after, min_seconds, threshold),
+        ).fetchall()
+    finally:
+        conn.close()
+    return {
+        "before": before,
+        "after": after,
+        "regressions": [{"test": test, "before": old, "after": new} for test, old, new in rows],
+    }
+
+
+def flaky_tests(db_path, runs: int = 50) -> List[Dict[str, Any]]:
+    """
+    Tests that both passed and failed on the same source tree (same fingerprint)
+    within the most recent runs - the outcome changed without the code changing.
+    """
+    conn = get_db_connection(db_path)
+    try:
+        rows = conn.execute(
+            """
+            SELECT r.test_id,
+                   SUM(r.outcome = 'passed'),
+                   SUM(r.outcome = 'failed'),
+                   COUNT(DISTINCT t.fingerprint)
+            FROM test_results r JOIN test_runs t ON t.id = r.run_id
+            WHERE t.fingerprint IS NOT NULL
+              AND t.id IN (SELECT id FROM test_runs ORDER BY id DESC LIMIT ?)
+              AND r.test_id IN (
+                  SELECT r2.test_id
+                  FROM test_results r2 JOIN test_runs t2 ON t2.id = r2.run_id
+                  WHERE t2.fingerprint IS NOT NULL
+                    AND t2.id IN (SELECT id FROM test_runs ORDER BY id DESC LIMIT ?)
+                  GROUP BY r2.test_id, t2.fingerprint
+                  HAVING SUM(r2.outcome = 'passed') > 0 AND SUM(r2.outcome = 'failed') > 0
+              )
+            GROUP BY r.test_id
+            ORDER BY SUM(r.outcome = 'failed') DESC, r.test_id
+        """,
+            (runs, runs),
+        ).fetchall()
+    finally:
+        conn.close()
+    return [{"test": test, "passed": passes, "failed": fails, "trees": trees} for test, passes, fails, trees in rows]
@@ -0,0 +1,267 @@
+"""
+Affected-test selection for RFD
+Maps changed files to the tests that exercise them - through a Python import
+graph, plus coverage.json contexts when the project records them - with a
+periodic full run as the safety net
+"""
+
+import ast
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set
+
+# Bump when the cached import data changes shape
+SELECTION_CACHE_VERSION = 1
+
+# Safety net: a full run after this many selective runs, or when the last one is this old
+FULL_RUN_EVERY = 10
+FULL_RUN_INTERVAL = 24 * 3600
+
+# Changing any of these can affect every test
+CONFIG_FILES = frozenset(
+    {
+        "conftest.py",
+        "pytest.ini",
+        "tox.ini",
+        "setup.cfg",
+        "setup.py",
+        "pyproject.toml",
+        ".coveragerc",
+        "requirements.txt",
+        "requirements-dev.txt",
+    }
+)
+
+# Changes to these never affect test outcomes
+DOC_SUFFIXES = (".md", ".rst", ".txt", ".png", ".jpg", ".svg")
+
+# Written by rfd itself and by the test runs (coverage reports) - they change on every
+# command, so they are left out of the changed set rather than forcing a full run
+GENERATED_PATHS = (".rfd/", "htmlcov/")
+GENERATED_FILES = frozenset({".coverage", "coverage.json", "coverage.xml"})
+
+# Directories that are import roots rather than packages (src layout)
+SOURCE_ROOTS = ("src/", "lib/")
+
+
+class Selection(NamedTuple):
+    """Which tests to run: tests is None for the full suite"""
+
+    tests: Optional[List[str]]
+    reason: str
+
+    @property
+    def full(self) -> bool:
+        return self.tests is None
+
+
+def is_test_file(rel: str) -> bool:
+    name = rel.rpartition("/")[2]
+    return name.endswith(".py") and (name.startswith("test_") or name.endswith("_test.py"))
+
+
+def module_names(rel: str) -> List[str]:
+    """Dotted names a project-relative .py file can be imported as"""
+    stem = rel[:-3]
+    if stem.endswith("/__init__"):
+        stem = stem[: -len("/__init__")]
+    names = [stem.replace("/", ".")]
+    for root in SOURCE_ROOTS:
+        if stem.startswith(root):
+            names.append(stem[len(root) :].replace("/", "."))
+    return names
+
+
+def _imported_modules(source: str, rel: str) -> List[str]:
+    """Absolute names of every module an import statement in the file might load"""
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return []
+
+    package = module_names(rel)[-1].split(".")
+    if not rel.endswith("__init__.py"):
+        package = package[:-1]
+
+    found: Set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            targets = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                base = package[: len(package) - node.level + 1] if node.level <= len(package) + 1 else []
+                base = ".".join(base + ([node.module] if node.module else []))
+            else:
+                base = node.module or ""
+            # "from a import b" may name a submodule b or an attribute of a
+            targets = [base] + [f"{base}.{alias.name}" if base else alias.name for alias in node.names]
+        else:
+            continue
+        for target in targets:
+            parts = target.split(".")
+            # Importing a.b.c runs a/__init__.py and a/b/__init__.py too
+            found.update(".".join(parts[:index]) for index in range(1, len(parts) + 1) if parts[0])
+    return sorted(found)
+
+
+class TestSelector:
+    """
+    Chooses the tests affected by a set of changed files.
+
+    A test is affected when it changed itself, imports a changed module
+    (directly or transitively), or - with a coverage.json recorded using
+    per-test contexts - executed a line of a changed file. Config changes,
+    unknown file types, and every FULL_RUN_EVERY-th or day-old run fall back
+    to the full suite. Parsed imports are cached per file by mtime and size.
+    """
+
+    __test__ = False  # not a pytest test class
+
+    def __init__(self, root: Path, python_files: Iterable[Path], cache_path: Optional[Path] = None):
+        self.root = Path(root)
+        self.cache_path = cache_path
+        self._python_files = [path.relative_to(self.root).as_posix() for path in python_files]
+        self._cache: Optional[Dict[str, Any]] = None
+
+    # -- selection ------------------------------------------------------
+
+    def select(self, changed: Optional[Iterable[str]]) -> Selection:
+        """Tests to run for the changed project-relative paths (None = unknown, run everything)"""
+        if changed is None:
+            return Selection(None, "no passing checkpoint to compare against")
+
+        state = self._load_cache()
+        if state["selective_runs"] >= FULL_RUN_EVERY:
+            return Selection(None, f"periodic full run (every {FULL_RUN_EVERY} runs)")
+        if time.time() - state["last_full_run"] > FULL_RUN_INTERVAL:
+            return Selection(None, "periodic full run (last one over a day ago)")
+
+        changed = {rel for rel in changed if not rel.startswith(GENERATED_PATHS) and rel not in GENERATED_FILES}
+        python_changed = set()
+        for rel in changed:
+            name = rel.rpartition("/")[2]
+            if name in CONFIG_FILES or name.startswith("requirements"):
+                return Selection(None, f"{rel} changed")
+            if rel.endswith(".py"):
+                python_changed.add(rel)
+            elif not rel.endswith(DOC_SUFFIXES):
+                return Selection(None, f"{rel} may be test data")
+
+        tests = {rel for rel in python_changed if is_test_file(rel) and os.path.isfile(self.root / rel)}
+        tests |= self._importers(python_changed)
+        tests |= self._covering(python_changed)
+        tests = {rel for rel in tests if os.path.isfile(self.root / rel)}
+        return Selection(sorted(tests), f"{len(tests)} test file(s) affected by {len(changed)} changed file(s)")
+
+    def record(self, selection: Selection) -> None:
+        """Count a completed run towards the next periodic full run"""
+        state = self._load_cache()
+        if selection.full:
+            state["selective_runs"] = 0
+            state["last_full_run"] = time.time()
+        else:
+            state["selective_runs"] += 1
+        self._save_cache()
+
+    def _importers(self, changed: Set[str]) -> Set[str]:
+        """Test files that import any of the changed files, directly or transitively"""
+        modules: Dict[str, str] = {}
+        for rel in set(self._python_files) | changed:
+            for name in module_names(rel):
+                modules.setdefault(name, rel)
+
+        importers: Dict[str, Set[str]] = {}
+        for rel, imported in self._imports().items():
+            for name in imported:
+                target = modules.get(name)
+                if target is not None and target != rel:
+                    importers.setdefault(target, set()).add(rel)
+
+        reached = set(changed)
+        pending = list(changed)
+        while pending:
+            for importer in importers.get(pending.pop(), ()):
+                if importer not in reached:
+                    reached.add(importer)
+                    pending.append(importer)
+        return {rel for rel in reached if is_test_file(rel)}
+
+    def _covering(self, changed: Set[str]) -> Set[str]:
+        """Test files whose recorded coverage contexts touch a changed file"""
+        try:
+            data = json.loads((self.root / "coverage.json").read_text())
+            files = data["files"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return set()
+
+        tests = set()
+        for filename, info in files.items():
+            rel = Path(filename)
+            if rel.is_absolute():
+                try:
+                    rel = rel.relative_to(self.root)
+                except ValueError:
+                    continue
+            if rel.as_posix() not in changed:
+                continue
+            for contexts in (info.get("contexts") or {}).values():
+                for context in contexts:
+                    # pytest-cov --cov-context=test: "tests/test_x.py::TestA::test_b|run"
+                    test = context.partition("::")[0]
+                    if is_test_file(test):
+                        tests.add(test)
+        return tests
+
+    # -- import cache ---------------------------------------------------
+
+    def _imports(self) -> Dict[str, List[str]]:
+        entries = self._load_cache()["imports"]
+        fresh = {}
+        dirty = False
+        for rel in self._python_files:
+            try:
+                stat = os.stat(self.root / rel)
+            except OSError:
+                continue
+            entry = entries.get(rel)
+            if not entry or entry[:2] != [stat.st_mtime_ns, stat.st_size]:
+                try:
+                    source = (self.root / rel).read_text(encoding="utf-8", errors="replace")
+                except OSError:
+                    continue
+                entry = [stat.st_mtime_ns, stat.st_size, _imported_modules(source, rel)]
+                dirty = True
+            fresh[rel] = entry
+        if dirty or len(fresh) != len(entries):
+            self._cache["imports"] = fresh
+            self._save_cache()
+        return {rel: entry[2] for rel, entry in fresh.items()}
+
+    def _load_cache(self) -> Dict[str, Any]:
+        if self._cache is None:
+            cache = None
+            if self.cache_path is not None:
+                try:
+                    cache = json.loads(self.cache_path.read_text())
+                except (OSError, ValueError):
+                    cache = None
+            if not isinstance(cache, dict) or cache.get("version") != SELECTION_CACHE_VERSION:
+                cache = {"version": SELECTION_CACHE_VERSION}
+            cache.setdefault("imports", {})
+            cache.setdefault("selective_runs", 0)
+            cache.setdefault("last_full_run", 0)
+            self._cache = cache
+        return self._cache
+
+    def _save_cache(self) -> None:
+        if self.cache_path is None:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(self._cache))
+            os.replace(tmp, self.cache_path)
+        except OSError:
+            pass  # caching is an optimisation - selection itself succeeded
@@ -0,0 +1,223 @@
+"""
+Sharded test execution for RFD
+Splits a suite into N balanced shards by historical per-unit durations, runs
+them as concurrent worker processes, and merges their results
+"""
+
+import heapq
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from .streaming import TestProgress, run_streaming
+from .test_reports import TestCase
+
+# Bump when the stored durations change meaning
+DURATIONS_VERSION = 1
+
+# Estimate for a unit (test file, go package) that has never been timed
+DEFAULT_UNIT_SECONDS = 2.0
+
+# A shard's timeout: this base, plus a multiple of the work it is expected to do
+BASE_TIMEOUT = 30
+TIMEOUT_FACTOR = 3
+
+# pytest exit code for "no tests collected" - an empty shard isn't a failure
+_PYTEST_NO_TESTS = 5
+
+
+def scaled_timeout(estimate: float) -> float:
+    """Timeout for work expected to take estimate seconds"""
+    return BASE_TIMEOUT + TIMEOUT_FACTOR * estimate
+
+
+class ShardResult(NamedTuple):
+    index: int
+    units: List[str]
+    returncode: Optional[int]  # None when the shard timed out
+    seconds: float
+    estimate: float
+    output: str  # tail of stdout
+    errors: str  # tail of stderr
+    log: Optional[Path] = None
+    cases: Sequence[TestCase] = ()  # parsed from the output as it streamed (go, cargo)
+
+    @property
+    def timed_out(self) -> bool:
+        return self.returncode is None
+
+
+class DurationHistory:
+    """
+    Per-unit test durations in .rfd/cache/test_durations.json, keyed by
+    runner. New measurements are blended into the old ones so one slow run
+    (a cold cache, a busy machine) doesn't skew the next plan much.
+    """
+
+    def __init__(self, path: Optional[Path], runner: str):
+        self.path = path
+        self.runner = runner
+        self._data: Optional[Dict[str, Any]] = None
+
+    def _load(self) -> Dict[str, Any]:
+        if self._data is None:
+            data = None
+            if self.path is not None:
+                try:
+                    data = json.loads(self.path.read_text())
+                except (OSError, ValueError):
+                    data = None
+            if not isinstance(data, dict) or data.get("version") != DURATIONS_VERSION:
+                data = {"version": DURATIONS_VERSION}
+            data.setdefault("runners", {})
+            self._data = data
+        return self._data
+
+    @property
+    def durations(self) -> Dict[str, float]:
+        return self._load()["runners"].setdefault(self.runner, {})
+
+    def estimate(self, unit: str) -> float:
+        durations = self.durations
+        if unit in durations:
+            return durations[unit]
+        if durations:
+            # Unknown units are assumed typical for this suite
+            known = sorted(durations.values())
+            return known[len(known) // 2]
+        return DEFAULT_UNIT_SECONDS
+
+    def update(self, measured: Dict[str, float]) -> None:
+        durations = self.durations
+        for unit, seconds in measured.items():
+            previous = durations.get(unit)
+            durations[unit] = round(seconds if previous is None else 0.5 * previous + 0.5 * seconds, 4)
+        self._save()
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(self._data))
+            os.replace(tmp, self.path)
+        except OSError:
+            pass  # caching is an optimisation - the tests themselves ran
+
+
+def plan_shards(units: List[str], history: DurationHistory, count: int) -> List[List[str]]:
+    """
+    Split units into at most count shards of similar expected duration.
+
+    Longest units are placed first, each onto the currently lightest shard
+    (LPT scheduling), which keeps the slowest shard close to the optimum.
+    """
+    count = max(min(count, len(units)), 1)
+    heap = [(0.0, index, []) for index in range(count)]
+    for unit in sorted(units, key=lambda unit: (-history.estimate(unit), unit)):
+        total, index, shard = heapq.heappop(heap)
+        shard.append(unit)
+        heapq.heappush(heap, (total + history.estimate(unit), index, shard))
+    return [shard for _, _, shard in sorted(heap, key=lambda entry: entry[1]) if shard]
+
+
+def run_shards(
+    commands: List[List[str]],
+    units: List[List[str]],
+    estimates: List[float],
+    cwd,
+    runner: str = "",
+    log_dir: Optional[Path] = None,
+    echo: Optional[Callable[[str], None]] = None,
+) -> List[ShardResult]:
+    """
+    Run one command per shard concurrently; each gets a timeout scaled to its estimate.
+
+    Output is streamed (see run_streaming): each shard's goes to
+    log_dir/tests-<n>.log and, with echo, to the terminal as it arrives,
+    prefixed with the shard number when there is more than one. Only the
+    tail of it is kept in memory; per-test results the runner prints are
+    parsed as they stream past.
+    """
+    lock = threading.Lock()
+
+    def terminal(index: int) -> Optional[Callable[[str], None]]:
+        if echo is None:
+            return None
+
+        def show(line: str) -> None:
+            # Whole lines from one shard at a time
+            with lock:
+                echo(f"[{index + 1}] {line}" if len(commands) > 1 else line)
+
+        return show
+
+    def run(index: int) -> ShardResult:
+        progress = TestProgress(runner)
+        result = run_streaming(
+            commands[index],
+            cwd=cwd,
+            log_path=log_dir / f"tests-{index + 1}.log" if log_dir is not None else None,
+            echo=terminal(index),
+            on_line=progress.feed,
+            timeout=scaled_timeout(estimates[index]),
+        )
+        return ShardResult(
+            index,
+            units[index],
+            result.returncode,
+            result.seconds,
+            estimates[index],
+            result.output,
+            result.errors,
+            result.log,
+            progress.cases,
+        )
+
+    with ThreadPoolExecutor(max_workers=max(len(commands), 1), thread_name_prefix="rfd-shard") as pool:
+        futures = [pool.submit(run, index) for index in range(len(commands))]
+    # Raises OSError (runner missing) once every shard has finished
+    return [future.result() for future in futures]
+
+
+def shard_passed(runner: str, result: ShardResult) -> bool:
+    if result.timed_out:
+        return False
+    return result.returncode == 0 or (runner == "pytest" and result.returncode == _PYTEST_NO_TESTS)
+
+
+def measured_durations(runner: str, result: ShardResult, cases: Iterable[TestCase] = ()) -> Dict[str, float]:
+    """
+    Per-unit durations from one shard: its parsed per-test timings summed by
+    unit (pytest's dotted classnames mapped back to files, go packages), or
+    else the shard's wall time split evenly over its units. A shard that
+    timed out took at least twice its share, so the next plan (and timeout)
+    gives those units more room.
+    """
+    if not result.units:
+        return {}
+    if result.timed_out:
+        return {unit: 2 * result.seconds / len(result.units) for unit in result.units}
+
+    # Longest module first, so "tests.test_a_b" isn't claimed by "tests.test_a"
+    modules = sorted(((unit[:-3].replace("/", "."), unit) for unit in result.units), key=lambda pair: -len(pair[0]))
+
+    def owner(group: str) -> Optional[str]:
+        if runner != "pytest":
+            return group if group in result.units else None
+        return next((unit for module, unit in modules if group == module or group.startswith(module + ".")), None)
+
+    durations: Dict[str, float] = {}
+    for case in cases:
+        unit = owner(case.group) if case.seconds is not None else None
+        if unit is not None:
+            durations[unit] = durations.get(unit, 0.0) + case.seconds
+    if durations:
+        return durations
+
+    share = result.seconds / len(result.units)
+    return {unit: share for unit in result.units}
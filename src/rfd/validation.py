@@ -3,11 +3,25 @@ Validation Engine for RFD
 Tests that code actually works as specified
 """
 
-import sqlite3
+import hashlib
+import json
+import os
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
-
-import requests
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .contract_runner import (
+    DEFAULT_CONCURRENCY,
+    DEFAULT_LOAD_REQUESTS,
+    DEFAULT_TIMEOUT,
+    ContractRunner,
+    check_budget,
+    is_local_url,
+)
+from .db_utils import get_db_connection
+from .project_files import ProjectFiles
 
 try:
     from .ai_validator import AIClaimValidator
@@ -15,39 +29,243 @@ except ImportError:
     from ai_validator import AIClaimValidator
 
 
+# Bump when a rule's checks change - older cached results are discarded
+RULE_CACHE_VERSION = 1
+
+
 class ValidationEngine:
     def __init__(self, rfd):
         self.rfd = rfd
         self.spec = rfd.load_project_spec()
+        self._local = threading.local()
+        # Why the service for the API checks couldn't be brought up, if it couldn't
+        self._service_error: Optional[str] = None
         self.results = []
-        self.ai_validator = AIClaimValidator()
-
-    def validate(self, feature: Optional[str] = None, full: bool = False) -> Dict[str, Any]:
-        """Run validation tests"""
+        self.ai_validator = AIClaimValidator(files=rfd.project_files, symbols=rfd.symbol_index)
+
+        # Per-rule results keyed on input fingerprints, persisted in .rfd/cache
+        self.cache_path = Path(rfd.rfd_dir) / "cache" / "validation.json"
+        self._cache: Optional[Dict[str, Any]] = None
+        self._cache_dirty = False
+        self._changed: Optional[Set[str]] = None
+
+    @property
+    def results(self) -> List[Dict[str, Any]]:
+        # Checks append to self.results; under --jobs each worker thread gets its own list
+        return getattr(self._local, "results", self._results)
+
+    @results.setter
+    def results(self, value: List[Dict[str, Any]]) -> None:
+        self._results = value
+
+    def validate(
+        self,
+        feature: Optional[str] = None,
+        full: bool = False,
+        changed_since: Optional[str] = None,
+        jobs: int = 1,
+        perf: bool = False,
+        api: bool = True,
+        start_service: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Run validation tests.
+
+        Rules whose inputs (files, database state, config) are unchanged since
+        their last run replay their cached results. With changed_since (a
+        checkpoint id, "last" or a git ref) per-file checks only look at files
+        changed since then. With jobs > 1 independent checks run on a thread
+        pool; results are still reported in the sequential order. Endpoint
+        performance budgets are load-tested with perf (or full); api=False
+        skips the live API checks altogether. The API checks only probe a
+        service that is already running unless start_service is set (rfd
+        validate) - then a local one is started or reused first.
+        """
         self.results = []
+        self._service_error = None
+        self._changed = self.changed_files_since(changed_since) if changed_since else None
 
         # Structural validation
-        self._validate_structure()
-
-        # API validation
-        if "api_contract" in self.spec:
-            self._validate_api()
+        checks: List[Callable[[], None]] = [self._validate_structure]
+
+        # API validation - a live service, never cached
+        service = None
+        if "api_contract" in self.spec and api:
+            if start_service:
+                service = self._ensure_service()
+            checks.append(self._validate_api)
+            # Load tests take seconds - only on request
+            if perf or full:
+                checks.append(self._validate_performance)
 
         # Feature validation
+        features = []
         if feature:
-            self._validate_feature(feature)
+            features = [feature]
         elif full:
-            for f in self.spec.get("features", []):
-                self._validate_feature(f["id"])
+            features = [f["id"] for f in self.spec.get("features", [])]
+        for feature_id in features:
+            checks.append(
+                lambda feature_id=feature_id: self._run_rule(
+                    f"feature:{feature_id}",
+                    self._feature_inputs(feature_id),
+                    lambda: self._validate_feature(feature_id),
+                )
+            )
 
         # Database validation
-        self._validate_database()
+        checks.append(lambda: self._run_rule("database", self._database_inputs(), self._validate_database))
+
+        try:
+            if jobs <= 0:
+                jobs = os.cpu_count() or 1
+            if jobs == 1 or len(checks) == 1:
+                for check in checks:
+                    check()
+            else:
+                # Shared lazy state is built up front rather than raced for by the workers
+                self._load_cache()
+                self.rfd.project_files.files()
+                with ThreadPoolExecutor(max_workers=min(jobs, len(checks))) as pool:
+                    for results in pool.map(self._isolated, checks):
+                        self.results.extend(results)
+        finally:
+            self._changed = None
+            self._save_cache()
+            # Kept running for the next validation only while a session is active
+            if service and service["started"] and not self.rfd.session.get_current():
+                self.rfd.builder.service.stop()
 
         return {
             "passing": all(r["passed"] for r in self.results),
             "results": self.results,
         }
 
+    def _isolated(self, check: Callable[[], None]) -> List[Dict[str, Any]]:
+        """Run one check on a worker thread, collecting into a list of its own"""
+        self._local.results = []
+        try:
+            check()
+            return self._local.results
+        finally:
+            del self._local.results
+
+    # -- result cache --------------------------------------------------
+
+    def _load_cache(self) -> Dict[str, Any]:
+        if self._cache is None:
+            try:
+                cache = json.loads(self.cache_path.read_text())
+            except (OSError, ValueError):
+                cache = {}
+            if not isinstance(cache, dict) or cache.get("version") != RULE_CACHE_VERSION:
+                cache = {"version": RULE_CACHE_VERSION}
+            cache.setdefault("rules", {})
+            cache.setdefault("loc", {})
+            self._cache = cache
+        return self._cache
+
+    def _save_cache(self) -> None:
+        if not self._cache_dirty:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(self._cache))
+            os.replace(tmp, self.cache_path)
+            self._cache_dirty = False
+        except OSError:
+            pass  # caching is an optimisation - validation itself succeeded
+
+    def _run_rule(self, rule: str, inputs: Any, check: Callable[[], None]) -> None:
+        """Run a check, or replay its cached results if its inputs are unchanged"""
+        fingerprint = hashlib.sha1(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+        rules = self._load_cache()["rules"]
+
+        cached = rules.get(rule)
+        if cached and cached["fingerprint"] == fingerprint:
+            self.results.extend(dict(result) for result in cached["results"])
+            return
+
+        start = len(self.results)
+        check()
+        rules[rule] = {"fingerprint": fingerprint, "results": [dict(result) for result in self.results[start:]]}
+        self._cache_dirty = True
+
+    @staticmethod
+    def _stat_inputs(paths) -> List[Tuple[str, int, int]]:
+        """(path, mtime_ns, size) for the paths that exist"""
+        inputs = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            inputs.append((str(path), stat.st_mtime_ns, stat.st_size))
+        return inputs
+
+    def _feature_inputs(self, feature_id: str) -> Dict[str, Any]:
+        """A feature rule reads its spec entry, its DB status and its test files"""
+        feature = next((f for f in self.spec.get("features", []) if f["id"] == feature_id), None)
+        inputs: Dict[str, Any] = {"feature": feature}
+        if not feature:
+            return inputs
+
+        inputs["test_files"] = [(path, Path(path).exists()) for path in feature.get("test_files", [])]
+        if feature_id == "mock_detection":
+            inputs["sources"] = self._stat_inputs(ProjectFiles("src/rfd").files())
+        else:
+            conn = get_db_connection(self.rfd.db_path, foreign_keys=False)
+            row = conn.execute("SELECT status FROM features WHERE id = ?", (feature_id,)).fetchone()
+            conn.close()
+            inputs["status"] = row[0] if row else None
+        return inputs
+
+    def _database_inputs(self) -> Dict[str, Any]:
+        """The database rule reads stack/database config, database files and memory.db's schema"""
+        inputs: Dict[str, Any] = {
+            "stack": self.spec.get("stack", {}).get("database"),
+            "database": self.spec.get("database"),
+        }
+        if inputs["stack"] != "sqlite":
+            return inputs
+
+        db_files = self.rfd.project_files.with_suffix(".db", ".sqlite")
+        inputs["files"] = self._stat_inputs([*db_files, *(f"{path}-wal" for path in db_files)])
+        if not db_files and Path(".rfd/memory.db").exists():
+            conn = get_db_connection(".rfd/memory.db", foreign_keys=False)
+            inputs["schema_version"] = conn.execute("PRAGMA schema_version").fetchone()[0]
+            conn.close()
+        return inputs
+
+    def changed_files_since(self, since: str) -> Set[str]:
+        """
+        Project-relative paths changed since a checkpoint (id or "last") or git ref,
+        including uncommitted and untracked files.
+        """
+        ref = since
+        if since == "last" or since.isdigit():
+            conn = get_db_connection(self.rfd.db_path, foreign_keys=False)
+            if since == "last":
+                row = conn.execute("SELECT git_hash FROM checkpoints ORDER BY id DESC LIMIT 1").fetchone()
+            else:
+                row = conn.execute("SELECT git_hash FROM checkpoints WHERE id = ?", (int(since),)).fetchone()
+            conn.close()
+            if not row or not row[0] or row[0] == "no-git":
+                raise ValueError(f"Checkpoint {since} has no git commit to compare against")
+            ref = row[0]
+
+        changed: Set[str] = set()
+        for command in (
+            ["git", "diff", "--name-only", "--relative", "-z", ref, "--"],
+            ["git", "ls-files", "--others", "--exclude-standard", "-z"],
+        ):
+            result = subprocess.run(command, cwd=self.rfd.root, capture_output=True)
+            if result.returncode != 0:
+                raise ValueError(f"Cannot diff against {since}: {os.fsdecode(result.stderr).strip()}")
+            changed.update(path for path in os.fsdecode(result.stdout).split("\0") if path)
+        return changed
+
     def get_status(self) -> Dict[str, Any]:
         """Quick validation status"""
         results = self.validate()
@@ -78,45 +296,39 @@ class ValidationEngine:
                 }
             )
 
-        # Original rule-based validation
+        # Original rule-based validation (the shared inventory already prunes venvs/build dirs)
         if "max_files" in rules:
-            # Exclude virtual environments and common build directories
-            exclude_dirs = {
-                ".venv",
-                "venv",
-                "env",
-                ".env",
-                "build",
-                "dist",
-                "__pycache__",
-            }
-            files = [f for f in Path(".").glob("**/*.py") if not any(part in exclude_dirs for part in f.parts)]
-            passed = len(files) <= rules["max_files"]
+            py_files = self.rfd.project_files.with_suffix(".py")
+            passed = len(py_files) <= rules["max_files"]
             self.results.append(
                 {
                     "test": "max_files",
                     "passed": passed,
-                    "message": f"{len(files)} files (max: {rules['max_files']})",
+                    "message": f"{len(py_files)} files (max: {rules['max_files']})",
                 }
             )
 
-        # Lines per file
+        # Lines per file - counts are cached per file on (mtime, size), so only edited files are read.
+        # With changed_since, files outside the changed set replay their cached entry without a stat.
         if "max_loc_per_file" in rules:
-            # Exclude virtual environments and common build directories
-            exclude_dirs = {
-                ".venv",
-                "venv",
-                "env",
-                ".env",
-                "build",
-                "dist",
-                "__pycache__",
-            }
-            for f in Path(".").glob("**/*.py"):
-                if ".rfd" in str(f) or any(part in exclude_dirs for part in f.parts):
-                    continue
+            previous = self._load_cache()["loc"]
+            counts = {}
+            for f in self.rfd.project_files.with_suffix(".py"):
+                key = os.path.relpath(f, self.rfd.root)
                 try:
-                    lines = len(open(f).readlines())
+                    entry = previous.get(key)
+                    if entry and self._changed is not None and key not in self._changed:
+                        counts[key] = entry
+                        lines = entry[2]
+                    else:
+                        stat = f.stat()
+                        if entry and entry[:2] == [stat.st_mtime_ns, stat.st_size]:
+                            lines = entry[2]
+                        else:
+                            lines = len(open(f).readlines())
+                            self._cache_dirty = True
+                        counts[key] = [stat.st_mtime_ns, stat.st_size, lines]
+
                     passed = lines <= rules["max_loc_per_file"]
                     if not passed:
                         self.results.append(
@@ -129,73 +341,120 @@ class ValidationEngine:
                 except Exception:
                     pass
 
-    def _validate_api(self):
-        """Validate API endpoints against contract"""
-        contract = self.spec["api_contract"]
-        base_url = contract["base_url"]
-
-        # Check health endpoint first
-        try:
-            r = requests.get(f"{base_url}{contract['health_check']}", timeout=2)
-            self.results.append(
-                {
-                    "test": "api_health",
-                    "passed": r.status_code == 200,
-                    "message": f"Health check: {r.status_code}",
-                }
-            )
-        except Exception as e:
-            self.results.append(
-                {
-                    "test": "api_health",
-                    "passed": False,
-                    "message": f"API not reachable: {e}",
-                }
-            )
-            return  # Skip other tests if API is down
+            # Every current file has an entry, so entries for deleted files drop out
+            self._cache_dirty |= len(counts) != len(previous)
+            self._cache["loc"] = counts
 
-        # Test each endpoint
-        for endpoint in contract.get("endpoints", []):
-            self._test_endpoint(base_url, endpoint)
+    def _ensure_service(self) -> Optional[Dict[str, Any]]:
+        """
+        Bring up the local service for the API checks, reusing the one left
+        running by an earlier build or validation when its sources are
+        unchanged. None when the service is remote or can't be started (the
+        reason is kept for the checks to report).
+        """
+        contract = self.spec["api_contract"]
+        if not is_local_url(contract["base_url"]):
+            return None
 
-    def _test_endpoint(self, base_url: str, endpoint: Dict):
-        """Test single endpoint"""
-        url = f"{base_url}{endpoint['path']}"
-        method = endpoint["method"]
+        def healthy() -> bool:
+            import requests
 
-        # Generate test data
-        test_data = self._generate_test_data(endpoint["path"])
+            try:
+                return requests.get(f"{contract['base_url']}{contract['health_check']}", timeout=2).status_code == 200
+            except Exception:
+                return False
 
         try:
-            if method == "GET":
-                r = requests.get(url)
-            elif method == "POST":
-                r = requests.post(url, json=test_data)
-            elif method == "PUT":
-                r = requests.put(url, json=test_data)
-            elif method == "DELETE":
-                r = requests.delete(url)
-            else:
-                r = None
+            return self.rfd.builder.service.ensure(healthy)
+        except (OSError, RuntimeError) as e:
+            self._service_error = str(e)
+            return None
+
+    def _validate_api(self):
+        """Validate API endpoints against contract"""
+        contract = self.spec["api_contract"]
 
-            if r:
-                expected = endpoint.get("expected_status", 200)
-                passed = self._check_response(r, expected)
+        with ContractRunner(
+            contract["base_url"],
+            concurrency=contract.get("concurrency", DEFAULT_CONCURRENCY),
+            timeout=contract.get("timeout", DEFAULT_TIMEOUT),
+            samples=contract.get("samples", 1),
+        ) as runner:
+            # Check health endpoint first
+            try:
+                r = runner.get(contract["health_check"], timeout=2)
+                self.results.append(
+                    {
+                        "test": "api_health",
+                        "passed": r.status_code == 200,
+                        "message": f"Health check: {r.status_code}",
+                    }
+                )
+            except Exception as e:
                 self.results.append(
                     {
-                        "test": f"endpoint_{method}_{endpoint['path']}",
-                        "passed": passed,
-                        "message": f"{method} {endpoint['path']}: {r.status_code}",
+                        "test": "api_health",
+                        "passed": False,
+                        "message": f"API not reachable: {e}",
                     }
                 )
-        except Exception as e:
+                return  # Skip other tests if API is down
+
+            # Test every endpoint concurrently, reported in contract order
+            self.results.extend(
+                runner.run(contract.get("endpoints", []), self._generate_test_data, self._check_response)
+            )
+
+    def _validate_performance(self):
+        """Load-test endpoints that declare a budget (p95_ms, min_rps, max_error_rate)"""
+        contract = self.spec["api_contract"]
+        budgeted = [e for e in contract.get("endpoints", []) if e.get("budget")]
+        if not budgeted:
+            return
+
+        base_url = contract["base_url"]
+        if not is_local_url(base_url):
             self.results.append(
                 {
-                    "test": f"endpoint_{method}_{endpoint['path']}",
+                    "test": "perf_budgets",
                     "passed": False,
-                    "message": f"{method} {endpoint['path']}: {str(e)}",
+                    "message": f"Refusing to load-test non-local {base_url} - point base_url at the local service",
                 }
             )
+            return
+
+        with ContractRunner(
+            base_url,
+            concurrency=contract.get("concurrency", DEFAULT_CONCURRENCY),
+            timeout=contract.get("timeout", DEFAULT_TIMEOUT),
+        ) as runner:
+            if self._service_error:
+                self.results.append(
+                    {"test": "perf_budgets", "passed": False, "message": f"Cannot load-test: {self._service_error}"}
+                )
+                return
+
+            for endpoint in budgeted:
+                budget = endpoint["budget"]
+                stats = runner.load(
+                    endpoint,
+                    budget.get("requests", DEFAULT_LOAD_REQUESTS),
+                    self._generate_test_data,
+                    self._check_response,
+                )
+                violations = check_budget(stats, budget)
+                summary = f"p95 {stats['p95']}ms, {stats['rps']} rps, {stats['error_rate']:.1%} errors"
+                self.results.append(
+                    {
+                        "test": f"perf_{endpoint['method'].upper()}_{endpoint['path']}",
+                        "passed": not violations,
+                        "message": (
+                            f"{endpoint['method'].upper()} {endpoint['path']}: "
+                            + (f"over budget - {'; '.join(violations)}" if violations else summary)
+                        ),
+                        "load": stats,
+                    }
+                )
 
     def _verify_function_exists(self, function_name: str, file_hint: Optional[str] = None) -> bool:
         """Verify a function exists in the codebase"""
@@ -215,20 +474,7 @@ class ValidationEngine:
                 return False
 
         # Search across Python files
-        for py_file in Path(".").glob("**/*.py"):
-            if ".rfd" in str(py_file) or "__pycache__" in str(py_file):
-                continue
-            try:
-                with open(py_file, "r") as f:
-                    tree = ast.parse(f.read())
-                    for node in ast.walk(tree):
-                        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
-                            if node.name == function_name:
-                                return True
-            except Exception:
-                continue
-
-        return False
+        return self.rfd.symbol_index.defines(function_name, suffixes=(".py",))
 
     def _check_response(self, response, expected: str) -> bool:
         """Check if response matches expected status"""
@@ -315,9 +561,7 @@ class ValidationEngine:
             return
 
         # Get status from DATABASE, not spec (database-first!)
-        import sqlite3
-
-        conn = sqlite3.connect(self.rfd.db_path)
+        conn = get_db_connection(self.rfd.db_path, foreign_keys=False)
         cursor = conn.execute("SELECT status FROM features WHERE id = ?", (feature_id,))
         result = cursor.fetchone()
         conn.close()
@@ -345,7 +589,7 @@ class ValidationEngine:
 
         if db_type == "sqlite":
             # Check for SQLite database file
-            db_files = list(Path(".").glob("**/*.db")) + list(Path(".").glob("**/*.sqlite"))
+            db_files = self.rfd.project_files.with_suffix(".db", ".sqlite")
             if db_files:
                 # Validate schema if specified
                 if "schema" in self.spec.get("database", {}):
@@ -356,14 +600,14 @@ class ValidationEngine:
                         {
                             "test": "database",
                             "passed": True,
-                            "message": f"Database found: {db_files[0]}",
+                            "message": f"Database found: {db_files[0].relative_to(self.rfd.root)}",
                         }
                     )
             else:
                 # Check if .rfd/memory.db exists as fallback
                 if Path(".rfd/memory.db").exists():
                     try:
-                        conn = sqlite3.connect(".rfd/memory.db")
+                        conn = get_db_connection(".rfd/memory.db", foreign_keys=False)
                         cursor = conn.cursor()
                         cursor.execute("SELECT count(*) FROM sqlite_master WHERE type='table'")
                         table_count = cursor.fetchone()[0]
@@ -0,0 +1,301 @@
+"""
+File watcher for RFD
+Turns file-system activity into debounced batches of changed paths - inotify
+on Linux, scandir fingerprint polling everywhere else
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from .project_files import EXCLUDED_DIRS
+
+# inotify(7) constants
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_ONLYDIR = 0x01000000
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+
+_WATCH_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF
+
+# struct inotify_event header: wd, mask, cookie, len
+_EVENT = struct.Struct("iIII")
+
+DEFAULT_DEBOUNCE = 0.25
+DEFAULT_POLL_INTERVAL = 1.0
+
+# A steady stream of writes still gets processed at least this often
+_MAX_BATCH_DELAY = 5.0
+
+
+class ChangeSet(NamedTuple):
+    """Project-relative paths changed in one debounced burst"""
+
+    paths: FrozenSet[str]
+    # Events were lost (e.g. inotify queue overflow) - treat everything as changed
+    rescan: bool = False
+
+
+def _scan(root: Path, exclude_dirs: FrozenSet[str]) -> Tuple[Dict[str, Tuple[int, int]], List[str]]:
+    """(file -> (mtime_ns, size), directories) below root, pruning excluded directories"""
+    files: Dict[str, Tuple[int, int]] = {}
+    directories: List[str] = []
+    pending = [""]
+    while pending:
+        prefix = pending.pop()
+        directories.append(prefix)
+        try:
+            with os.scandir(os.path.join(root, prefix)) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in exclude_dirs:
+                                pending.append(f"{prefix}{entry.name}/")
+                        elif entry.is_file():
+                            stat = entry.stat()
+                            files[prefix + entry.name] = (stat.st_mtime_ns, stat.st_size)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return files, directories
+
+
+class PollingBackend:
+    """Detects changes by comparing scandir fingerprints (mtime, size) between polls"""
+
+    name = "polling"
+
+    def __init__(self, root: Path, exclude_dirs: FrozenSet[str], interval: float = DEFAULT_POLL_INTERVAL):
+        self.root = root
+        self.exclude_dirs = exclude_dirs
+        self.interval = interval
+        self._fingerprints, _ = _scan(root, exclude_dirs)
+        self._next_poll = time.monotonic() + interval
+
+    def read(self, timeout: float) -> Optional[Set[str]]:
+        """Changed paths, waiting at most timeout seconds for the next poll"""
+        wait = self._next_poll - time.monotonic()
+        if wait > timeout:
+            time.sleep(max(timeout, 0))
+            return set()
+        if wait > 0:
+            time.sleep(wait)
+        self._next_poll = time.monotonic() + self.interval
+
+        current, _ = _scan(self.root, self.exclude_dirs)
+        previous, self._fingerprints = self._fingerprints, current
+        changed = {path for path, fingerprint in current.items() if previous.get(path) != fingerprint}
+        changed.update(path for path in previous if path not in current)
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyBackend:
+    """
+    Linux inotify via libc - one watch per directory, added as directories appear.
+
+    read() returns None when events were lost (kernel queue overflow, or a
+    directory moved away without per-file events) and a rescan is needed.
+    """
+
+    name = "inotify"
+
+    def __init__(self, root: Path, exclude_dirs: FrozenSet[str]):
+        self.root = root
+        self.exclude_dirs = exclude_dirs
+        self._libc = _libc()
+        if self._libc is None:
+            raise OSError("inotify is not available on this platform")
+
+        self.fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._directories: Dict[int, str] = {}
+        try:
+            self._watch_tree("")
+        except OSError:
+            self.close()
+            raise
+
+    @classmethod
+    def available(cls) -> bool:
+        return _libc() is not None
+
+    def _watch(self, relative: str) -> None:
+        wd = self._libc.inotify_add_watch(
+            self.fd, os.fsencode(os.path.join(self.root, relative)), _WATCH_MASK | _IN_ONLYDIR
+        )
+        if wd < 0:
+            errno = ctypes.get_errno()
+            if errno == 28:  # ENOSPC - fs.inotify.max_user_watches exhausted
+                raise OSError(errno, "inotify watch limit reached (fs.inotify.max_user_watches)")
+            return  # directory vanished or is unreadable
+        self._directories[wd] = relative
+
+    def _watch_tree(self, relative: str) -> List[str]:
+        """Watch a directory and everything below it; returns the files already there"""
+        files, directories = _scan(self.root / relative if relative else self.root, self.exclude_dirs)
+        for directory in directories:
+            self._watch(relative + directory)
+        return [relative + path for path in files]
+
+    def read(self, timeout: float) -> Optional[Set[str]]:
+        """Changed paths from the events that arrive within timeout seconds"""
+        ready, _, _ = select.select([self.fd], [], [], max(timeout, 0))
+        if not ready:
+            return set()
+        try:
+            data = os.read(self.fd, 256 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed: Set[str] = set()
+        lost = False
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+            name = os.fsdecode(data[offset + _EVENT.size : offset + _EVENT.size + length].rstrip(b"\0"))
+            offset += _EVENT.size + length
+
+            if mask & _IN_Q_OVERFLOW:
+                lost = True
+                continue
+            if mask & _IN_IGNORED:
+                self._directories.pop(wd, None)
+                continue
+
+            directory = self._directories.get(wd)
+            if directory is None or not name:
+                continue
+            path = directory + name
+
+            if mask & _IN_ISDIR:
+                if name in self.exclude_dirs:
+                    continue
+                if mask & (_IN_CREATE | _IN_MOVED_TO):
+                    # Files can land in a new directory before its watch exists - report them too
+                    changed.update(self._watch_tree(path + "/"))
+                elif mask & _IN_MOVED_FROM:
+                    # No per-file events for what was below a moved-away directory
+                    lost = True
+                continue
+            changed.add(path)
+
+        return None if lost else changed
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+_LIBC = None
+
+
+def _libc():
+    """libc with the inotify calls, or None where they don't exist"""
+    global _LIBC
+    if _LIBC is None:
+        _LIBC = False
+        if sys.platform.startswith("linux"):
+            try:
+                libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+                libc.inotify_init1.argtypes = [ctypes.c_int]
+                libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+                _LIBC = libc
+            except (OSError, AttributeError):
+                pass
+    return _LIBC or None
+
+
+class FileWatcher:
+    """
+    Debounced change batches for a project tree.
+
+    Events are collected until the tree has been quiet for `debounce`
+    seconds (or _MAX_BATCH_DELAY has passed), so an editor save or a
+    `git checkout` arrives as one batch rather than hundreds of events.
+    Excluded directories (.git, .rfd, node_modules, ...) are never watched.
+    """
+
+    def __init__(
+        self,
+        root: str | Path = ".",
+        exclude_dirs: Iterable[str] = EXCLUDED_DIRS,
+        debounce: float = DEFAULT_DEBOUNCE,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        polling: bool = False,
+    ):
+        self.root = Path(root)
+        self.debounce = debounce
+        exclude = frozenset(exclude_dirs)
+
+        self.backend = None
+        if not polling and InotifyBackend.available():
+            try:
+                self.backend = InotifyBackend(self.root, exclude)
+            except OSError:
+                self.backend = None
+        if self.backend is None:
+            self.backend = PollingBackend(self.root, exclude, poll_interval)
+
+    @property
+    def backend_name(self) -> str:
+        return self.backend.name
+
+    def batches(self, stop: threading.Event) -> Iterator[ChangeSet]:
+        """Yield change batches until stop is set"""
+        pending: Set[str] = set()
+        rescan = False
+        first_at = last_at = 0.0
+
+        while not stop.is_set():
+            now = time.monotonic()
+            if pending or rescan:
+                timeout = min(last_at + self.debounce, first_at + _MAX_BATCH_DELAY) - now
+            else:
+                timeout = 0.5  # wake up regularly to notice stop
+
+            changed = self.backend.read(max(timeout, 0))
+            now = time.monotonic()
+            if changed is None or changed:
+                if not (pending or rescan):
+                    first_at = now
+                last_at = now
+                if changed is None:
+                    rescan = True
+                else:
+                    pending.update(changed)
+
+            if (pending or rescan) and (now >= last_at + self.debounce or now >= first_at + _MAX_BATCH_DELAY):
+                yield ChangeSet(frozenset(pending), rescan)
+                pending = set()
+                rescan = False
+
+    def close(self) -> None:
+        self.backend.close()
+
+    def __enter__(self) -> "FileWatcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
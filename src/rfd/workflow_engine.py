@@ -3,13 +3,12 @@ Workflow Engine: Query-Driven Gated Linear Flow
 Enforces progression through checkpoints with validation gates
 """
 
-import sqlite3
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
-from .db_utils import get_db_connection
+from .db_utils import get_db_connection, init_database
 
 
 class WorkflowState(Enum):
@@ -62,68 +61,14 @@ class GatedWorkflow:
 
     def _init_workflow_tables(self):
         """Create workflow tracking tables"""
-        conn = sqlite3.connect(self.db_path)
-
-        conn.executescript(
-            """
-            CREATE TABLE IF NOT EXISTS workflow_state (
-                feature_id TEXT PRIMARY KEY,
-                current_state TEXT NOT NULL,
-                locked_by TEXT,  -- Session/user that has lock
-                locked_at TEXT,
-                created_at TEXT,
-                updated_at TEXT
-            );
-
-            CREATE TABLE IF NOT EXISTS workflow_checkpoints (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                feature_id TEXT NOT NULL,
-                state TEXT NOT NULL,
-                passed BOOLEAN DEFAULT 0,
-                validation_data JSON,
-                timestamp TEXT,
-                FOREIGN KEY (feature_id) REFERENCES features(id)
-            );
-
-            CREATE TABLE IF NOT EXISTS workflow_queries (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                feature_id TEXT NOT NULL,
-                state TEXT NOT NULL,
-                query TEXT NOT NULL,
-                answer TEXT,
-                resolved BOOLEAN DEFAULT 0,
-                timestamp TEXT,
-                FOREIGN KEY (feature_id) REFERENCES features(id)
-            );
-
-            CREATE TABLE IF NOT EXISTS drift_log (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                feature_id TEXT,
-                session_id TEXT,
-                attempted_action TEXT,
-                blocked_reason TEXT,
-                timestamp TEXT
-            );
-
-            CREATE TABLE IF NOT EXISTS hallucination_log (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT,
-                claim_type TEXT,
-                claim TEXT,
-                reason TEXT
-            );
-        """
-        )
-
-        conn.commit()
-        conn.close()
+        init_database(self.db_path)
 
     def start_feature(self, feature_id: str, session_id: str) -> Tuple[bool, str]:
         """
         Start or resume a feature with session locking
         Returns (success, message)
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = get_db_connection(self.db_path, foreign_keys=False)
 
         # Check if feature exists
         feature = conn.execute("SELECT id FROM features WHERE id = ?", (feature_id,)).fetchone()
@@ -195,7 +140,7 @@ class GatedWorkflow:
 
     def get_current_state(self, feature_id: str) -> Optional[WorkflowState]:
         """Get current workflow state for a feature"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_db_connection(self.db_path, foreign_keys=False)
         result = conn.execute(
             "SELECT current_state FROM workflow_state WHERE feature_id = ?",
             (feature_id,),
@@ -230,7 +175,7 @@ class GatedWorkflow:
         Returns (success, message)
         """
         # Check lock
-        conn = sqlite3.connect(self.db_path)
+        conn = get_db_connection(self.db_path, foreign_keys=False)
         lock = conn.execute("SELECT locked_by FROM workflow_state WHERE feature_id = ?", (feature_id,)).fetchone()
 
         if not lock or lock[0] != session_id:
@@ -289,7 +234,7 @@ class GatedWorkflow:
         Add a query that needs resolution before proceeding
         Returns query ID
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = get_db_connection(self.db_path, foreign_keys=False)
         current = self.get_current_state(feature_id)
 
         cursor = conn.execute(
@@ -311,7 +256,7 @@ class GatedWorkflow:
 
     def resolve_query(self, query_id: int, answer: str):
         """Resolve a query with an answer"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_db_connection(self.db_path, foreign_keys=False)
         conn.execute(
             "UPDATE workflow_queries SET answer = ?, resolved = 1 WHERE id = ?",
             (answer, query_id),
@@ -321,7 +266,7 @@ class GatedWorkflow:
 
     def get_unresolved_queries(self, feature_id: str) -> List[Dict]:
         """Get all unresolved queries for a feature"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_db_connection(self.db_path, foreign_keys=False)
         queries = conn.execute(
             """SELECT id, query, state, timestamp
                FROM workflow_queries
@@ -350,7 +295,7 @@ class GatedWorkflow:
         ]
 
         if action in drift_actions:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_db_connection(self.db_path, foreign_keys=False)
             conn.execute(
                 """INSERT INTO drift_log (feature_id, session_id, attempted_action, blocked_reason, timestamp)
                    VALUES (?, ?, ?, ?, ?)""",
@@ -403,7 +348,7 @@ class GatedWorkflow:
 
     def _validate_tasks(self, feature_id: str) -> Tuple[bool, str]:
         """Validate tasks are generated"""
-        conn = sqlite3.connect(self.db_path)
+        conn = get_db_connection(self.db_path, foreign_keys=False)
         tasks = conn.execute("SELECT COUNT(*) FROM tasks WHERE feature_id = ?", (feature_id,)).fetchone()
         conn.close()
 
@@ -417,7 +362,7 @@ class GatedWorkflow:
         # This is where AI hallucination detection happens
         from .ai_validator import AIClaimValidator
 
-        validator = AIClaimValidator()
+        validator = AIClaimValidator(files=self.rfd.project_files, symbols=self.rfd.symbol_index)
 
         # Check for common implementation claims
         test_claims = [
@@ -462,7 +407,7 @@ class GatedWorkflow:
         if not current:
             return {"error": "No workflow found"}
 
-        conn = sqlite3.connect(self.db_path)
+        conn = get_db_connection(self.db_path, foreign_keys=False)
 
         # Get checkpoints
         checkpoints = conn.execute(
@@ -559,7 +504,8 @@ class GatedWorkflow:
             if review_results["passed"]:
                 # Phase 2: Build validation
                 print("✅ Review passed, checking build...")
-                build_review = enforcer.trigger_review("post_build", feature_id)
+                # Fix iterations usually touch a few modules - rerun just the tests that reach them
+                build_review = enforcer.trigger_review("post_build", feature_id, affected_only=True)
                 results["reviews"].append(build_review)
 
                 if build_review["passed"]:
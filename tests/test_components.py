@@ -123,6 +123,138 @@ constraints:
             # The spec loader returns a flattened structure
             self.assertEqual(spec.get("name"), "test-project")
 
+    def test_rfd_subsystems_are_lazy(self):
+        """Test subsystems are only built on first access"""
+        from rfd import RFD
+
+        rfd = RFD()
+
+        # Nothing built yet
+        self.assertNotIn("builder", rfd.__dict__)
+        self.assertNotIn("validator", rfd.__dict__)
+        self.assertNotIn("workflow", rfd.__dict__)
+
+        # First access builds and caches the subsystem
+        validator = rfd.validator
+        self.assertIs(rfd.validator, validator)
+        self.assertNotIn("builder", rfd.__dict__)
+
+        # Plain assignment still overrides a subsystem
+        rfd.spec = {"name": "override"}
+        self.assertEqual(rfd.spec, {"name": "override"})
+
+    def test_rfd_schema_versioned(self):
+        """Test schema migrations are recorded and applied only once"""
+        from rfd import RFD
+        from rfd.db_utils import SCHEMA_VERSION, init_database
+
+        rfd = RFD()
+
+        conn = sqlite3.connect(rfd.db_path)
+        self.assertEqual(conn.execute("PRAGMA user_version").fetchone()[0], SCHEMA_VERSION)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(features)")}
+        self.assertIn("scope_definition", columns)
+
+        # Current database: no DDL runs, so the schema is untouched
+        schema_before = conn.execute("SELECT sql FROM sqlite_master ORDER BY name").fetchall()
+        conn.close()
+        self.assertEqual(init_database(rfd.db_path), SCHEMA_VERSION)
+
+        conn = sqlite3.connect(rfd.db_path)
+        self.assertEqual(conn.execute("SELECT sql FROM sqlite_master ORDER BY name").fetchall(), schema_before)
+        conn.close()
+
+    def test_rfd_connection_pool(self):
+        """Test connections are pooled per thread and released on close"""
+        from rfd import RFD
+        from rfd.db_utils import db_connection, get_db_connection, transaction
+
+        rfd = RFD()
+
+        conn = get_db_connection(rfd.db_path)
+        self.assertIs(get_db_connection(rfd.db_path), conn)
+        conn.close()
+
+        # Releasing the last user discards uncommitted work, like a real close
+        conn.execute("INSERT INTO memory (key, value) VALUES ('discarded', '1')")
+        conn.close()
+        self.assertTrue(conn.execute("SELECT 1").fetchone())
+
+        with transaction(rfd.db_path) as conn:
+            conn.execute("INSERT INTO memory (key, value) VALUES ('kept', '1')")
+
+        with db_connection(rfd.db_path) as conn:
+            keys = [row["key"] for row in conn.execute("SELECT key FROM memory")]
+        self.assertEqual(keys, ["kept"])
+
+    def test_rfd_delete_feature_with_tasks(self):
+        """Test deleting a feature that has tasks, as before the pool enforced foreign keys"""
+        from rfd import RFD
+        from rfd.db_utils import get_db_connection
+        from rfd.feature_commands import FeatureManager
+
+        rfd = RFD()
+        manager = FeatureManager(rfd.db_path)
+        self.assertTrue(manager.add_feature("f1", "Feature", "Works"))
+        conn = get_db_connection(rfd.db_path)
+        conn.execute("INSERT INTO tasks (feature_id, description) VALUES ('f1', 'Task')")
+        conn.commit()
+        conn.close()
+
+        self.assertTrue(manager.delete_feature("f1"))
+        self.assertIsNone(manager.get_feature("f1"))
+        self.assertFalse(manager.delete_feature("f1"))
+
+        # Every borrow was released
+        conn = get_db_connection(rfd.db_path, foreign_keys=False)
+        self.assertEqual(conn.users, 1)
+        conn.close()
+
+    def test_rfd_early_returns_release_connections(self):
+        """Test lookups of an unknown feature hand their pooled connection back"""
+        from rfd import RFD
+        from rfd.db_utils import get_db_connection
+        from rfd.feature_manager import FeatureManager
+        from rfd.prevention import ScopeDriftPrevention
+
+        rfd = RFD()
+        self.assertEqual(ScopeDriftPrevention(rfd.db_path).define_scope_boundaries("missing"), {})
+        self.assertEqual(FeatureManager(rfd).get_feature_status("missing"), {})
+        self.assertIsNone(rfd.session.get_current_feature())
+        with self.assertRaises(ValueError):
+            rfd.session.start("missing")
+
+        for foreign_keys in (True, False):
+            conn = get_db_connection(rfd.db_path, foreign_keys=foreign_keys)
+            self.assertEqual(conn.users, 1)
+            conn.close()
+
+    def test_rfd_project_spec_snapshot(self):
+        """Test the cached spec follows config.yaml and database changes"""
+        from rfd import RFD
+
+        rfd = RFD()
+        Path(".rfd/config.yaml").write_text("project:\n  name: First\n")
+
+        spec = rfd.load_project_spec()
+        self.assertEqual(spec["name"], "First")
+        self.assertEqual(spec["features"], [])
+
+        # Mutating a returned spec must not leak into the snapshot
+        spec["features"].append({"id": "bogus"})
+        self.assertEqual(rfd.load_project_spec()["features"], [])
+
+        # Config edit (size changes) invalidates
+        Path(".rfd/config.yaml").write_text("project:\n  name: Second one\n")
+        self.assertEqual(rfd.load_project_spec()["name"], "Second one")
+
+        # A commit from another connection invalidates
+        conn = sqlite3.connect(rfd.db_path)
+        conn.execute("INSERT INTO features (id, description, status) VALUES ('f1', 'Feature', 'pending')")
+        conn.commit()
+        conn.close()
+        self.assertEqual([f["id"] for f in rfd.load_project_spec()["features"]], ["f1"])
+
 
 class TestValidationEngine(unittest.TestCase):
     """Test the ValidationEngine component"""
@@ -148,6 +280,226 @@ class TestValidationEngine(unittest.TestCase):
         self.assertEqual(validator.rfd, rfd)
         self.assertIsInstance(validator.results, list)
 
+    def test_structure_ignores_excluded_dirs(self):
+        """Test max_files only counts project files, not venvs or node_modules"""
+        from rfd import RFD
+        from rfd.validation import ValidationEngine
+
+        for path in ["src/app.py", ".venv/lib/site.py", "node_modules/pkg/build.py", "src/__pycache__/app.py"]:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            Path(path).write_text("x = 1\n")
+
+        rfd = RFD()
+        self.assertEqual(rfd.project_files.with_suffix(".py"), [Path(self.test_dir).resolve() / "src/app.py"])
+
+        validator = ValidationEngine(rfd)
+        validator.spec = {"rules": {"max_files": 1}}
+        validator._validate_structure()
+
+        max_files = next(r for r in validator.results if r["test"] == "max_files")
+        self.assertTrue(max_files["passed"], max_files["message"])
+
+    def test_validate_reuses_rule_results(self):
+        """Test unchanged rules and files replay cached results instead of re-running"""
+        import subprocess
+
+        from rfd import RFD
+        from rfd.validation import ValidationEngine
+
+        Path("src").mkdir()
+        Path("src/small.py").write_text("x = 1\n")
+        Path("src/big.py").write_text("x = 1\n" * 5)
+        subprocess.run(["git", "init", "-q"], check=True)
+        subprocess.run(["git", "add", "src"], check=True)
+        subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "base"], check=True)
+
+        rfd = RFD()
+        validator = ValidationEngine(rfd)
+        validator.spec = {"rules": {"max_loc_per_file": 3}}
+        self.assertEqual([r["test"] for r in validator.validate()["results"]], ["loc_big.py"])
+
+        # A cached count is trusted while the file's stat is unchanged
+        cache = json.loads(validator.cache_path.read_text())
+        cache["loc"]["src/big.py"][2] = 1
+        validator.cache_path.write_text(json.dumps(cache))
+        validator = ValidationEngine(rfd)
+        validator.spec = {"rules": {"max_loc_per_file": 3}}
+        self.assertTrue(validator.validate()["passing"])
+
+        # Files outside the changed set replay their cached count - still reported, still cached
+        cache["loc"]["src/big.py"][2] = 4
+        validator.cache_path.write_text(json.dumps(cache))
+        validator = ValidationEngine(rfd)
+        validator.spec = {"rules": {"max_loc_per_file": 3}}
+        Path("src/small.py").write_text("x = 1\n" * 4)
+        results = validator.validate(changed_since="HEAD")["results"]
+        self.assertEqual(
+            sorted(r["message"] for r in results), ["big.py has 4 lines (max: 3)", "small.py has 4 lines (max: 3)"]
+        )
+        self.assertEqual(sorted(json.loads(validator.cache_path.read_text())["loc"]), ["src/big.py", "src/small.py"])
+
+        with patch.object(validator, "_validate_feature") as check:
+            validator.spec["features"] = [{"id": "f1", "description": "F1"}]
+            validator.validate(feature="f1")
+            validator.validate(feature="f1")
+            self.assertEqual(check.call_count, 1)
+
+    def test_validate_jobs_matches_sequential_order(self):
+        """Test parallel validation reports the same results in the same order"""
+        from rfd import RFD
+        from rfd.validation import ValidationEngine
+
+        Path("big.py").write_text("x = 1\n" * 5)
+        rfd = RFD()
+        spec = {
+            "rules": {"max_loc_per_file": 3},
+            "features": [{"id": f"f{i}", "description": f"F{i}", "status": "complete"} for i in range(6)],
+            "stack": {"database": "sqlite"},
+        }
+
+        reports = []
+        for jobs in (1, 4):
+            validator = ValidationEngine(rfd)
+            validator.spec = spec
+            validator.cache_path = Path(f"cache-{jobs}.json")
+            reports.append(validator.validate(full=True, jobs=jobs))
+
+        self.assertEqual(reports[0], reports[1])
+        self.assertEqual(
+            [r["test"] for r in reports[1]["results"]],
+            ["loc_big.py"] + [f"feature_f{i}" for i in range(6)] + ["database"],
+        )
+
+    def test_validate_api_concurrent_with_latency(self):
+        """Test API contract checks run against a live server with timeouts and latency stats"""
+        import threading
+        import time
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        from rfd import RFD
+        from rfd.validation import ValidationEngine
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/slow":
+                    time.sleep(1)
+                self.send_response(200 if self.path in ("/health", "/users", "/slow") else 404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        validator = ValidationEngine(RFD())
+        validator.spec = {
+            "api_contract": {
+                "base_url": f"http://127.0.0.1:{server.server_address[1]}",
+                "health_check": "/health",
+                "samples": 3,
+                "endpoints": [
+                    {"method": "GET", "path": "/users"},
+                    {"method": "GET", "path": "/missing", "expected_status": "4xx"},
+                    {"method": "GET", "path": "/gone"},
+                    {"method": "GET", "path": "/slow", "timeout": 0.2},
+                ],
+            }
+        }
+        validator._validate_api()
+
+        results = {r["test"]: r for r in validator.results}
+        self.assertEqual(
+            list(results),
+            ["api_health", "endpoint_GET_/users", "endpoint_GET_/missing", "endpoint_GET_/gone", "endpoint_GET_/slow"],
+        )
+        self.assertTrue(results["endpoint_GET_/users"]["passed"])
+        self.assertTrue(results["endpoint_GET_/missing"]["passed"])
+        self.assertFalse(results["endpoint_GET_/gone"]["passed"])
+        self.assertFalse(results["endpoint_GET_/slow"]["passed"])
+
+        latency = results["endpoint_GET_/users"]["latency_ms"]
+        self.assertEqual(latency["samples"], 3)
+        self.assertLessEqual(latency["p50"], latency["p95"])
+        self.assertLessEqual(latency["p95"], latency["max"])
+
+    def test_validate_perf_budgets(self):
+        """Test endpoint budgets are load-tested locally and fail validation when missed"""
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        from rfd import RFD
+        from rfd.service import ServiceSupervisor
+        from rfd.validation import ValidationEngine
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self.send_response(200 if self.path != "/flaky" else 500)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        contract = {
+            "base_url": f"http://127.0.0.1:{server.server_address[1]}",
+            "health_check": "/health",
+            "endpoints": [
+                {"method": "GET", "path": "/fast", "budget": {"requests": 20, "p95_ms": 5000, "max_error_rate": 0}},
+                {"method": "GET", "path": "/flaky", "budget": {"requests": 20, "max_error_rate": 0.1}},
+                {"method": "GET", "path": "/unbudgeted"},
+            ],
+        }
+        validator = ValidationEngine(RFD())
+        validator.spec = {"api_contract": contract}
+
+        # Only rfd validate brings the service up - status, checkpoints etc. just probe it
+        with patch.object(ServiceSupervisor, "ensure", autospec=True, side_effect=ServiceSupervisor.ensure) as ensure:
+            self.assertNotIn("perf_GET_/fast", [r["test"] for r in validator.validate()["results"]])
+            validator.get_status()
+            self.assertEqual(ensure.call_count, 0)
+            results = {r["test"]: r for r in validator.validate(perf=True, start_service=True)["results"]}
+            self.assertEqual(ensure.call_count, 1)
+        self.assertTrue(results["perf_GET_/fast"]["passed"], results["perf_GET_/fast"]["message"])
+        self.assertEqual(results["perf_GET_/fast"]["load"]["requests"], 20)
+        self.assertFalse(results["perf_GET_/flaky"]["passed"])
+        self.assertIn("error rate 100.0%", results["perf_GET_/flaky"]["message"])
+        self.assertNotIn("perf_GET_/unbudgeted", results)
+
+        contract["base_url"] = "http://api.example.com"
+        validator.results = []
+        validator._validate_performance()
+        self.assertEqual([(r["test"], r["passed"]) for r in validator.results], [("perf_budgets", False)])
+
+    def test_mock_scan_lines_and_process_pool(self):
+        """Test mock findings carry their own line numbers and a pooled scan matches a serial one"""
+        from rfd.ai_validator import AIClaimValidator
+
+        source = 'import os\n\nuser = "test_user"\nother = "test_user"\nhelper = MagicMock()\n'
+        has_mocks, findings = AIClaimValidator().detect_mock_data(content=source)
+        self.assertTrue(has_mocks)
+        self.assertEqual(
+            [(f["pattern"], f["line"]) for f in findings],
+            [("test user data", 3), ("test user data", 4), ("MagicMock usage", 5), ("Mock object usage", 5)],
+        )
+        self.assertEqual(AIClaimValidator().detect_mock_data(content="import os\n"), (False, []))
+
+        Path("src/pkg").mkdir(parents=True)
+        for i in range(6):
+            Path(f"src/pkg/mod{i}.py").write_text(source if i % 2 else "import os\n")
+        serial = AIClaimValidator().validate_no_mocks("src")
+        self.assertEqual(serial["files_checked"], 6)
+        self.assertEqual(len(serial["files_with_mocks"]), 3)
+        self.assertEqual(AIClaimValidator().validate_no_mocks("src", jobs=2), serial)
+
     def test_validate_ai_claims_detects_lies(self):
         """Test AI claim validation detects false claims"""
         from rfd import RFD
@@ -268,6 +620,33 @@ async def async_function():
         # Clean up
         Path("test_module.py").unlink()
 
+    def test_symbol_index_incremental(self):
+        """Test the symbol index records line ranges and only re-parses changed files"""
+        from rfd import RFD
+        from rfd.symbol_index import SymbolIndex
+
+        Path("src").mkdir()
+        Path("src/models.py").write_text("class User:\n    def save(self):\n        pass\n")
+        Path("src/server.go").write_text("package main\n\nfunc Serve() {\n\treturn\n}\n")
+        Path("src/util.py").write_text("def helper():\n    pass\n")
+
+        rfd = RFD()
+        self.assertEqual(rfd.symbol_index.refresh()["reparsed"], 3)
+        self.assertEqual(
+            [(s.path, s.kind, s.start_line, s.end_line) for s in rfd.symbol_index.find("save")],
+            [("src/models.py", "method", 2, 3)],
+        )
+        self.assertEqual(rfd.symbol_index.find("Serve")[0][2:], ("function", 3, 5))
+        self.assertTrue(rfd.validator.ai_validator._verify_function_exists("Serve"))
+
+        # Persisted - a fresh index over an unchanged tree parses nothing
+        Path("src/models.py").write_text("class User:\n    def load(self):\n        pass\n")
+        os.utime("src/util.py")
+        index = SymbolIndex(RFD().project_files, rfd.symbol_index.cache_path)
+        self.assertEqual(index.refresh(), {"files": 3, "reparsed": 1, "removed": 0})
+        self.assertFalse(index.defines("save"))
+        self.assertTrue(index.defines("load"))
+
     def test_validation_with_mixed_truth_lies(self):
         """Test validation with mix of true and false claims"""
         from rfd import RFD
@@ -362,17 +741,433 @@ class TestBuildEngine(unittest.TestCase):
         self.assertEqual(stack.get("language"), "ruby")
         Path("Gemfile").unlink()
 
-    @patch("subprocess.run")
+    def test_toolchain_detection_cached(self):
+        """Stack and runner are cached until a manifest file changes"""
+        from rfd import RFD
+        from rfd.build import BuildEngine
+
+        rfd = RFD()
+        Path("pyproject.toml").write_text("[project]\nname = 'demo'\n")
+
+        def probe(cmd, **kwargs):
+            # Only the module form of pytest "works" here
+            process = MagicMock()
+            process.wait.return_value = 0 if cmd[:3] == ["python", "-m", "pytest"] else 1
+            process.poll.return_value = 0
+            return process
+
+        with patch("rfd.build.subprocess.Popen", side_effect=probe) as popen:
+            runner = BuildEngine(rfd).detect_test_runner()
+        self.assertEqual(runner["runner"], "pytest")
+        # Probes gated on other manifests (npm, cargo, go, ...) never start
+        self.assertEqual(popen.call_count, 3)
+        self.assertTrue((rfd.rfd_dir / "cache" / "toolchain.json").exists())
+
+        # A fresh engine reuses the cached detection
+        builder = BuildEngine(rfd)
+        with patch("rfd.build.subprocess.Popen") as popen:
+            self.assertEqual(builder.detect_test_runner()["runner"], "pytest")
+            self.assertEqual(builder.detect_stack().get("language"), "python")
+        popen.assert_not_called()
+
+        # Changing the manifests invalidates it
+        Path("pyproject.toml").unlink()
+        Path("package.json").write_text('{"name": "test"}')
+        with patch("rfd.build.subprocess.Popen", side_effect=FileNotFoundError) as popen:
+            self.assertIsNone(builder.detect_test_runner())
+            self.assertEqual(builder.detect_stack().get("language"), "javascript")
+        self.assertEqual(popen.call_count, 6)
+
+    def _fake_runner(self, name="runner.py"):
+        """A test command outside the project tree: logs each call, exits with the code in exit.txt"""
+        outside = Path(tempfile.mkdtemp(prefix="rfd_runner_"))
+        self.addCleanup(shutil.rmtree, outside, ignore_errors=True)
+        (outside / "exit.txt").write_text("0")
+        (outside / name).write_text(
+            "import pathlib, sys\n"
+            "here = pathlib.Path(__file__).parent\n"
+            "with open(here / 'calls.txt', 'a') as log:\n"
+            "    log.write(' '.join(a for a in sys.argv[1:] if not a.startswith('--')) + '\\n')\n"
+            "code = int((here / 'exit.txt').read_text())\n"
+            "print('1 passed' if code == 0 else '1 failed')\n"
+            "sys.exit(code)\n"
+        )
+        return outside, [sys.executable, str(outside / name)]
+
+    def test_test_results_cached_until_sources_change(self):
+        """get_status reuses the last test outcome while the tree is unchanged"""
+        from rfd import RFD
+        from rfd.build import BuildEngine
+
+        rfd = RFD()
+        Path("test_app.py").write_text("def test_ok():\n    assert True\n")
+        builder = BuildEngine(rfd)
+        outside, command = self._fake_runner()
+
+        def runs():
+            return len((outside / "calls.txt").read_text().splitlines())
+
+        with patch.object(builder, "detect_test_runner", return_value={"runner": "pytest", "command": command}):
+            first = builder.get_status()
+            second = builder.get_status()
+            self.assertTrue(first["passing"])
+            self.assertFalse(first.get("cached", False))
+            self.assertTrue(second["cached"])
+            self.assertEqual(runs(), 1)
+
+            # --no-cache always runs
+            builder.get_status(use_cache=False)
+            self.assertEqual(runs(), 2)
+
+            # Any source change invalidates the stored outcome
+            Path("test_app.py").write_text("def test_ok():\n    assert False\n")
+            (outside / "exit.txt").write_text("1")
+            third = builder.check_tests()
+            self.assertFalse(third["passing"])
+            self.assertFalse(third.get("cached", False))
+            self.assertEqual(runs(), 3)
+
+            # An affected-only pass is never reported as the whole suite passing
+            from rfd.test_selection import Selection
+
+            Path("test_app.py").write_text("def test_ok():\n    assert True\n")
+            (outside / "exit.txt").write_text("0")
+            with patch.object(builder, "select_tests", return_value=Selection(["test_app.py"], "1 affected")):
+                affected = builder.check_tests(affected=True)
+                self.assertEqual(affected["selection"]["scope"], "affected")
+                self.assertTrue(builder.check_tests(affected=True)["cached"])
+            self.assertEqual(runs(), 4)
+            (outside / "exit.txt").write_text("1")
+            status = builder.get_status()
+            self.assertFalse(status["passing"])
+            self.assertFalse(status.get("cached", False))
+            self.assertEqual(runs(), 5)
+
+            # ...so a checkpoint never records it as a passing build for the next selection to diff against
+            rfd.__dict__["builder"] = builder
+            rfd.checkpoint("after an affected-only pass")
+            conn = sqlite3.connect(rfd.db_path)
+            self.assertEqual(conn.execute("SELECT build_passed FROM checkpoints").fetchall(), [(0,)])
+            conn.close()
+
+    def test_sharded_test_run(self):
+        """jobs > 1 splits test files into balanced shards and merges their results"""
+        from rfd import RFD
+        from rfd.build import BuildEngine
+        from rfd.test_shards import DurationHistory, plan_shards
+
+        history = DurationHistory(None, "pytest")
+        history.update({"a": 10, "b": 1, "c": 1, "d": 8})
+        self.assertEqual(plan_shards(["a", "b", "c", "d"], history, 2), [["a"], ["d", "b", "c"]])
+
+        rfd = RFD()
+        for index in range(4):
+            Path(f"test_{index}.py").write_text("def test_ok():\n    pass\n")
+        builder = BuildEngine(rfd)
+        outside, command = self._fake_runner()
+
+        with patch.object(builder, "detect_test_runner", return_value={"runner": "unittest", "command": command}):
+            result = builder.check_tests(use_cache=False, jobs=2)
+        self.assertTrue(result["passing"])
+        self.assertEqual([shard["units"] for shard in result["shards"]], [2, 2])
+
+        # Each test file ran in exactly one shard
+        calls = (outside / "calls.txt").read_text().split()
+        self.assertEqual(sorted(calls), [f"test_{index}.py" for index in range(4)])
+
+        # Timings were recorded for the next plan
+        durations = DurationHistory(rfd.rfd_dir / "cache" / "test_durations.json", "unittest").durations
+        self.assertEqual(set(durations), {f"test_{index}.py" for index in range(4)})
+
+    def test_streamed_output_is_bounded(self):
+        """Command output is teed live and logged with rotation; only its tail stays in memory"""
+        from rfd.streaming import RotatingLog, TestProgress, run_streaming
+
+        log = Path(self.test_dir) / "logs" / "run.log"
+        lines = []
+        script = "import sys\nfor i in range(5000): print(f'line {i}')\nprint('oops', file=sys.stderr)\nsys.exit(3)"
+        result = run_streaming([sys.executable, "-c", script], log_path=log, echo=lines.append, tail_bytes=1024)
+
+        self.assertEqual(result.returncode, 3)
+        self.assertEqual(len(lines), 5001)
+        self.assertLessEqual(len(result.output), 1100)
+        self.assertTrue(result.output.endswith("line 4999\n"))
+        self.assertEqual(result.errors, "oops\n")
+        self.assertIn("line 0\n", log.read_text())
+
+        # The next run's log starts fresh; the previous one is kept as run.log.1
+        run_streaming([sys.executable, "-c", "print('again')"], log_path=log)
+        self.assertEqual(log.read_text(), "again\n")
+        self.assertIn("line 4999", (log.parent / "run.log.1").read_text())
+
+        # Rolls over within a run too, keeping a bounded number of backups
+        rotating = RotatingLog(log, max_bytes=100, backups=2)
+        for index in range(50):
+            rotating.write(f"{index:09d}\n")
+        rotating.close()
+        self.assertEqual(sorted(path.name for path in log.parent.iterdir()), ["run.log", "run.log.1", "run.log.2"])
+
+        result = run_streaming([sys.executable, "-c", "import time; time.sleep(10)"], timeout=0.5)
+        self.assertTrue(result.timed_out)
+
+        # Per-test outcomes are parsed from the stream, not from retained output
+        progress = TestProgress("go")
+        for event in ('{"Action":"pass","Package":"p","Test":"TestA","Elapsed":0.5}', '{"Action":"output"}'):
+            progress.feed(event + "\n")
+        self.assertEqual([case.test_id for case in progress.cases], ["p::TestA"])
+        progress = TestProgress("pytest")
+        progress.feed("tests/test_a.py ..F.s                [ 40%]\n")
+        self.assertEqual(progress.summary(), "3 passed, 1 failed, 1 skipped, 40%")
+        progress.feed("tests/test_a.py::test_b FAILED                [ 60%]\n")
+        self.assertEqual(progress.summary(), "3 passed, 2 failed, 1 skipped, 60%")
+
+    def test_service_supervisor_reuses_running_service(self):
+        """The service is started once, reused by later commands, and restarted only when its sources change"""
+        import socket
+        import urllib.request
+
+        from rfd.service import ServiceSupervisor
+
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+
+        def healthy():
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1) as response:
+                    return response.status == 200
+            except OSError:
+                return False
+
+        sources = ["v1"]
+        root = Path(self.test_dir)
+
+        def supervisor(command=(sys.executable, "-m", "http.server", str(port), "--bind", "127.0.0.1")):
+            # A fresh instance per call, as each rfd command would have
+            return ServiceSupervisor(
+                list(command), root, healthy, lambda: sources[0], root / "service.json", root / "logs" / "service.log"
+            )
+
+        first = supervisor()
+        try:
+            started = first.ensure()
+            self.assertTrue(started["started"])
+            self.assertGreater(started["cold_start"], 0)
+            self.assertTrue(healthy())
+
+            again = supervisor().ensure()
+            self.assertEqual((again["started"], again["pid"]), (False, started["pid"]))
+
+            sources[0] = "v2"
+            restarted = first.ensure()
+            self.assertEqual(restarted["reason"], "sources changed")
+            self.assertNotEqual(restarted["pid"], started["pid"])
+            self.assertTrue(healthy())
+
+            status = supervisor().status()
+            self.assertTrue(status["running"])
+            self.assertEqual(len(status["cold_starts"]), 2)
+        finally:
+            self.assertTrue(first.stop())
+        self.assertFalse(supervisor().status()["running"])
+
+        # A service that dies on start is reported, not waited on
+        with self.assertRaises(RuntimeError):
+            supervisor((sys.executable, "-c", "raise SystemExit(2)")).ensure()
+
+    def test_build_start_service(self):
+        """A build only fails on the service when a contract says where it is, and stops it outside a session"""
+        from rfd import RFD
+        from rfd.build import BuildEngine
+
+        builder = BuildEngine(RFD())
+        builder.stack = {"language": "python", "framework": "flask"}
+        builder.spec = {}
+        started = {"pid": 1, "started": True, "cold_start": 0.5, "reason": "not running"}
+
+        with patch.object(builder.service, "ensure", side_effect=RuntimeError("Service not healthy after 60s")):
+            self.assertTrue(builder._start_service())
+            builder.spec = {"api_contract": {"base_url": "http://localhost:5000", "health_check": "/health"}}
+            self.assertFalse(builder._start_service())
+
+        with patch.object(builder.service, "ensure", return_value=started), patch.object(
+            builder.service, "stop"
+        ) as stop:
+            with patch.object(builder.rfd.session, "get_current", return_value={"feature_id": "f1"}):
+                self.assertTrue(builder._start_service())
+            stop.assert_not_called()
+            with patch.object(builder.rfd.session, "get_current", return_value=None):
+                self.assertTrue(builder._start_service())
+            stop.assert_called_once()
+
+    def test_affected_test_selection(self):
+        """Only tests that import (or cover) a changed module are selected"""
+        from rfd.test_selection import FULL_RUN_EVERY, TestSelector
+
+        root = Path(self.test_dir)
+        (root / "src" / "pkg").mkdir(parents=True)
+        (root / "tests").mkdir()
+        (root / "src" / "pkg" / "__init__.py").write_text("")
+        (root / "src" / "pkg" / "core.py").write_text("VALUE = 1\n")
+        (root / "src" / "pkg" / "api.py").write_text("from .core import VALUE\n")
+        (root / "src" / "pkg" / "cli.py").write_text("import os\n")
+        (root / "tests" / "test_api.py").write_text("from pkg.api import VALUE\n")
+        (root / "tests" / "test_cli.py").write_text("from pkg import cli\n")
+        cache = root / ".rfd" / "cache" / "test_selection.json"
+
+        def selector():
+            return TestSelector(root, sorted(root.rglob("*.py")), cache)
+
+        # No full run recorded yet - the safety net runs everything first
+        first = selector().select(["src/pkg/core.py"])
+        self.assertTrue(first.full)
+        selector().record(first)
+
+        # core.py reaches test_api.py through api.py's relative import
+        self.assertEqual(selector().select(["src/pkg/core.py"]).tests, ["tests/test_api.py"])
+        self.assertEqual(selector().select(["src/pkg/cli.py"]).tests, ["tests/test_cli.py"])
+        self.assertEqual(selector().select(["README.md"]).tests, [])
+        self.assertTrue(selector().select(["pytest.ini"]).full)
+        self.assertTrue(selector().select(None).full)
+
+        # rfd's own state and coverage reports change on every command - they never force a full run
+        generated = [".rfd/cache/tests.json", ".rfd/memory.db", "coverage.json", "htmlcov/index.html"]
+        self.assertEqual(selector().select(["src/pkg/core.py", *generated]).tests, ["tests/test_api.py"])
+        self.assertTrue(selector().select(["data/fixture.csv"]).full)
+
+        # coverage.json contexts add tests the import graph can't see
+        (root / "coverage.json").write_text(
+            json.dumps({"files": {"src/pkg/cli.py": {"contexts": {"1": ["tests/test_api.py::test_value|run"]}}}})
+        )
+        self.assertEqual(selector().select(["src/pkg/cli.py"]).tests, ["tests/test_api.py", "tests/test_cli.py"])
+
+        # Every FULL_RUN_EVERY selective runs, a full run comes round again
+        for _ in range(FULL_RUN_EVERY):
+            sel = selector().select(["src/pkg/core.py"])
+            self.assertFalse(sel.full)
+            selector().record(sel)
+        self.assertTrue(selector().select(["src/pkg/core.py"]).full)
+
+    def test_test_history_reports(self):
+        """Runner reports become per-test rows that rfd perf tests summarises"""
+        from rfd import RFD
+        from rfd.db_utils import get_db_connection
+        from rfd.test_reports import (
+            duration_regressions,
+            flaky_tests,
+            parse_go_json,
+            parse_junit,
+            record_run,
+            slowest_tests,
+        )
+
+        rfd = RFD()
+        Path("report.xml").write_text(
+            '<testsuites><testsuite name="pytest">'
+            '<testcase classname="tests.test_a" name="test_fast" time="0.01"/>'
+            '<testcase classname="tests.test_a" name="test_slow" time="1.5"><failure message="boom"/></testcase>'
+            '<testcase classname="tests.test_a" name="test_skip" time="0"><skipped/></testcase>'
+            "</testsuite></testsuites>"
+        )
+        cases = list(parse_junit(Path("report.xml")))
+        self.assertEqual([c.outcome for c in cases], ["passed", "failed", "skipped"])
+        self.assertEqual(cases[1].test_id, "tests.test_a::test_slow")
+
+        go_events = [
+            '{"Action":"run","Package":"x/y","Test":"TestA"}',
+            '{"Action":"pass","Package":"x/y","Test":"TestA","Elapsed":0.2}',
+            '{"Action":"pass","Package":"x/y","Elapsed":0.3}',
+        ]
+        go = list(parse_go_json(go_events))
+        self.assertEqual([(c.test_id, c.outcome, c.seconds) for c in go], [("x/y::TestA", "passed", 0.2)])
+
+        def checkpoint():
+            conn = get_db_connection(rfd.db_path)
+            conn.execute("INSERT INTO checkpoints (timestamp, validation_passed, build_passed) VALUES ('now', 1, 1)")
+            conn.commit()
+            conn.close()
+
+        checkpoint()
+        record_run(rfd.db_path, "pytest", cases, False, 2.0, fingerprint="tree1")
+        checkpoint()
+        slower = [c._replace(seconds=c.seconds * 3, outcome="passed") for c in cases]
+        record_run(rfd.db_path, "pytest", slower, True, 5.0, fingerprint="tree1")
+
+        self.assertEqual(slowest_tests(rfd.db_path, limit=1)[0]["test"], "tests.test_a::test_slow")
+        regressions = duration_regressions(rfd.db_path)["regressions"]
+        # test_slow failed before the first checkpoint's run, so only test_fast has two passing samples
+        self.assertEqual(regressions, [])
+        self.assertEqual(
+            duration_regressions(rfd.db_path, min_seconds=0.01)["regressions"][0]["test"], "tests.test_a::test_fast"
+        )
+        # Same tree, different outcome
+        self.assertEqual([f["test"] for f in flaky_tests(rfd.db_path)], ["tests.test_a::test_slow"])
+
+    def test_build_steps_scheduled_and_skipped(self):
+        """Independent build steps run concurrently; unchanged ones are skipped on the next build"""
+        import time
+
+        from rfd.build_steps import BLOCKED, FAILED, OK, UNCHANGED, BuildGraph, BuildStep
+        from rfd.project_files import ProjectFiles
+
+        root = Path(self.test_dir)
+        (root / "requirements.txt").write_text("requests\n")
+        cache = root / "build_steps.json"
+
+        def step(name, code, **kwargs):
+            return BuildStep(name, name, [sys.executable, "-c", code], **kwargs)
+
+        steps = [
+            step("install", "pass", inputs=("requirements.txt",)),
+            step("format", "import time; time.sleep(1)", needs=("install",), inputs=("*.py",)),
+            step("lint", "import time; time.sleep(1)", needs=("install",), inputs=("*.py",)),
+            step("start", "pass", needs=("lint",), cacheable=False),
+        ]
+
+        def build(steps):
+            return BuildGraph(root, steps, ProjectFiles(root), cache).run(echo=lambda line: None)
+
+        start = time.monotonic()
+        results = build(steps)
+        # format and lint overlap - one after the other they'd take over 2s
+        self.assertLess(time.monotonic() - start, 1.8)
+        self.assertEqual({result.status for result in results.values()}, {OK})
+
+        # Nothing changed: only the uncacheable step runs again
+        results = build(steps)
+        self.assertEqual(
+            {name: result.status for name, result in results.items()},
+            {"install": UNCHANGED, "format": UNCHANGED, "lint": UNCHANGED, "start": OK},
+        )
+
+        # A changed input reruns its step, and steps that depend on it
+        (root / "requirements.txt").write_text("requests\nclick\n")
+        results = build(steps)
+        self.assertEqual(results["install"].status, OK)
+        self.assertEqual(results["lint"].status, OK)
+
+        # A failing required step blocks its dependents; an optional one doesn't
+        steps[1] = step("format", "raise SystemExit(1)", needs=("install",), required=False)
+        steps[2] = step("lint", "raise SystemExit(1)", needs=("install",))
+        results = build(steps)
+        self.assertEqual(results["format"].status, FAILED)
+        self.assertEqual(results["lint"].status, FAILED)
+        self.assertEqual(results["start"].status, BLOCKED)
+        self.assertFalse(BuildGraph.succeeded(results, steps))
+        self.assertTrue(BuildGraph.succeeded({"format": results["format"]}, steps))
+
+    @patch("rfd.build.run_streaming")
     def test_run_tests(self, mock_run):
         """Test running tests for different stacks"""
         from rfd import RFD
         from rfd.build import BuildEngine
+        from rfd.streaming import StreamResult
 
         rfd = RFD()
         builder = BuildEngine(rfd)
 
         # Mock successful test run
-        mock_run.return_value = MagicMock(returncode=0, stdout="Tests passed")
+        mock_run.return_value = StreamResult(0, 0.1, "Tests passed", "", None)
 
         # Python tests
         Path("requirements.txt").write_text("pytest")
@@ -399,6 +1194,39 @@ class TestBuildEngine(unittest.TestCase):
         # Should return success status
         self.assertIn("success", result)
 
+    def test_incremental_byte_compile(self):
+        """Only files changed since the last clean compile are recompiled; syntax errors carry locations"""
+        from rfd.byte_compile import ByteCompiler
+
+        root = Path(self.test_dir)
+        (root / "pkg").mkdir()
+        files = []
+        for index in range(10):
+            path = root / "pkg" / f"mod_{index}.py"
+            path.write_text(f"VALUE = {index}\n")
+            files.append(path)
+        cache = root / "compile.json"
+
+        report = ByteCompiler(root, cache).compile(files, jobs=2)
+        self.assertEqual((report["checked"], report["compiled"], report["errors"]), (10, 10, []))
+        self.assertTrue((root / "pkg" / "__pycache__").is_dir())
+
+        # Nothing changed: nothing to compile
+        self.assertEqual(ByteCompiler(root, cache).compile(files)["compiled"], 0)
+
+        files[3].write_text("def broken(:\n    pass\n")
+        report = ByteCompiler(root, cache).compile(files)
+        self.assertEqual(report["compiled"], 1)
+        [error] = report["errors"]
+        self.assertEqual((error.file, error.line), (os.path.join("pkg", "mod_3.py"), 1))
+        self.assertTrue(str(error).startswith(f"{error.file}:1:"))
+
+        # Failures aren't cached - the file is checked again until it's fixed
+        self.assertEqual(len(ByteCompiler(root, cache).compile(files)["errors"]), 1)
+        files[3].write_text("def fixed():\n    pass\n")
+        report = ByteCompiler(root, cache).compile(files)
+        self.assertEqual((report["compiled"], report["errors"]), (1, []))
+
 
 class TestSessionManager(unittest.TestCase):
     """Test the SessionManager component"""
@@ -873,6 +1701,163 @@ class TestIntegrationBasics(unittest.TestCase):
         # Should validate against spec rules
         self.assertIsInstance(results["passing"], bool)
 
+    def test_daemon_round_trip(self):
+        """Test the thin client talks to a running daemon and falls back without one"""
+        import threading
+
+        from rfd import RFD
+        from rfd.client import request
+        from rfd.daemon import RFDDaemon
+
+        # No daemon yet - caller must run in-process
+        self.assertIsNone(request(["status"]))
+
+        daemon = RFDDaemon(RFD())
+        thread = threading.Thread(target=daemon.serve)
+        thread.start()
+        try:
+            Path("clean.py").write_text("def add(a, b):\n    return a + b\n")
+            response = request(["prevent", "validate", "clean.py"])
+            self.assertEqual(response["exit_code"], 0)
+            self.assertIn("Code validation passed", response["output"])
+
+            response = request(["prevent", "validate", "new.py", 'data = "mock_data"\n'])
+            self.assertEqual(response["exit_code"], 1)
+
+            # Commands the daemon does not serve are declined
+            self.assertIsNone(request(["init"]))
+        finally:
+            self.assertIsNotNone(request(["__stop__"]))
+            thread.join(timeout=5)
+
+        self.assertFalse(Path(daemon.path).exists())
+
+    def test_prevent_validate_batch(self):
+        """Test batch pre-write validation checks many files and records stats in one go"""
+        import subprocess
+
+        from click.testing import CliRunner
+
+        from rfd import RFD
+        from rfd.cli import cli
+        from rfd.prevention import HallucinationPrevention
+
+        rfd = RFD()
+        for i in range(10):
+            Path(f"mod{i}.py").write_text("def add(a, b):\n    return a + b\n")
+        Path("stub.py").write_text("def todo():\n    pass\n")
+        paths = [f"mod{i}.py" for i in range(10)] + ["stub.py", "missing.py"]
+
+        results = HallucinationPrevention().validate_paths(paths, jobs=2)
+        self.assertEqual(list(results), paths)
+        self.assertTrue(all(results[f"mod{i}.py"][0] for i in range(10)))
+        self.assertIn("Empty function: todo", results["stub.py"][1])
+        self.assertFalse(results["missing.py"][0])
+
+        conn = sqlite3.connect(rfd.db_path)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM prevention_stats").fetchone()[0], 11)
+        conn.close()
+
+        subprocess.run(["git", "init", "-q"], check=True)
+        subprocess.run(["git", "add", "mod0.py", "stub.py"], check=True)
+        result = CliRunner().invoke(cli, ["prevent", "validate", "--staged"], obj=rfd)
+        self.assertEqual(result.exit_code, 1, result.output)
+        self.assertIn("failed for 1 of 2 files", result.output)
+
+        result = CliRunner().invoke(cli, ["prevent", "validate", "--paths", "mod1.py", "mod2.py"], obj=rfd)
+        self.assertEqual(result.exit_code, 0, result.output)
+
+    def test_pre_commit_reads_staged_blobs_in_one_pass(self):
+        """Test the pre-commit fast path sees staged (not working tree) content for every file"""
+        import json
+        import subprocess
+
+        from rfd import RFD
+        from rfd.git_index import staged_changes
+        from rfd.prevention import WorkflowEnforcement, staged_sources
+
+        rfd = RFD()
+        subprocess.run(["git", "init", "-q"], check=True)
+        Path("pkg").mkdir()
+        for i in range(12):
+            Path(f"pkg/m{i}.py").write_text(f"VALUE = {i}\n")
+        Path("pkg/m3.py").write_text("import pdb\n")
+        Path("notes.txt").write_text("hello\n")
+        subprocess.run(["git", "add", "pkg", "notes.txt"], check=True)
+        # Working-tree edits after staging must not leak into the check
+        Path("pkg/m3.py").write_text("VALUE = 3\n")
+        Path("pkg/m4.py").write_text("import pdb\n")
+
+        changes = staged_changes()
+        self.assertEqual(len(changes), 13)
+        self.assertTrue(all(change.status == "A" and change.blob for change in changes))
+        sources = staged_sources()
+        self.assertEqual(len(sources), 12)
+        self.assertEqual(sources["pkg/m3.py"], "import pdb\n")
+        self.assertEqual(sources["pkg/m4.py"], "VALUE = 4\n")
+
+        conn = sqlite3.connect(rfd.db_path)
+        conn.execute(
+            "INSERT INTO workflows (id, spec) VALUES (?, ?)",
+            ("wf", json.dumps({"allowed_files": ["pkg/"], "forbidden_patterns": [r"import\s+pdb"]})),
+        )
+        conn.commit()
+        conn.close()
+
+        valid, violations = WorkflowEnforcement(str(rfd.db_path)).validate_commit("wf", jobs=2)
+        self.assertFalse(valid)
+        self.assertEqual(
+            violations,
+            ["File not in workflow scope: notes.txt", r"Forbidden pattern in pkg/m3.py: import\s+pdb"],
+        )
+
+    def test_watcher_batches_feed_live_checks(self):
+        """Test debounced watcher batches (inotify and polling) and the live state they produce"""
+        import threading
+
+        from rfd import RFD
+        from rfd.live_checks import LiveChecks, read_live_checks
+        from rfd.watcher import ChangeSet, FileWatcher, InotifyBackend
+
+        rfd = RFD()
+        Path("src").mkdir()
+        Path("src/app.py").write_text("def main():\n    return 1\n")
+
+        backends = [True] + ([False] if InotifyBackend.available() else [])
+        for polling in backends:
+            with FileWatcher(".", debounce=0.1, poll_interval=0.05, polling=polling) as watcher:
+                self.assertEqual(watcher.backend_name, "polling" if polling else "inotify")
+                stop = threading.Event()
+                batches = watcher.batches(stop)
+
+                def burst():
+                    for i in range(20):
+                        Path("src/app.py").write_text(f"def main():\n    return {i}\n")
+                    Path("src/new").mkdir(exist_ok=True)
+                    Path("src/new/helper.py").write_text("def helper():\n    return 2\n")
+
+                threading.Timer(0.1, burst).start()
+                changes = next(batches)
+                stop.set()
+            self.assertFalse(changes.rescan)
+            self.assertEqual(changes.paths, {"src/app.py", "src/new/helper.py"})
+            shutil.rmtree("src/new")
+
+        live = LiveChecks(rfd, "polling")
+        checks = live.prime()
+        self.assertEqual(set(checks), {"validation", "scope", "claims"})
+        self.assertTrue(rfd.symbol_index.defines("main"))
+
+        Path("src/extra.py").write_text("def extra():\n    return 3\n")
+        checks = live.process(ChangeSet(frozenset({"src/extra.py"})))
+        self.assertEqual(checks["claims"]["details"]["reparsed"], 1)
+        self.assertTrue(rfd.symbol_index.defines("extra"))
+        self.assertIn(rfd.root / "src" / "extra.py", rfd.project_files.files())
+
+        stored = read_live_checks(rfd.db_path)
+        self.assertTrue(stored["running"])
+        self.assertEqual([check["name"] for check in stored["checks"]], ["claims", "scope", "validation"])
+
 
 if __name__ == "__main__":
     # Run tests with verbose output
@@ -126,8 +126,59 @@ def test_multi_agent_coordination():
         return True
 
 
+def test_scope_check_paths_batch():
+    """Test batch scope checks share one matcher and log violations together"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        rfd_dir = Path(tmpdir) / ".rfd"
+        rfd_dir.mkdir()
+
+        rfd = RFD()
+        rfd.rfd_dir = rfd_dir
+        rfd.db_path = rfd_dir / "memory.db"
+        rfd._init_database()
+
+        import sqlite3
+
+        conn = sqlite3.connect(rfd.db_path)
+        conn.execute("INSERT INTO features (id, description, status) VALUES ('batch', 'Test', 'pending')")
+        conn.commit()
+        conn.close()
+
+        enforcer = WorkflowEnforcer(rfd)
+        enforcer.start_enforcement("batch")
+
+        paths = [f"src/m{i}.py" for i in range(500)] + ["lib/a.py", "x/tests", "/etc/passwd"]
+        results = enforcer.check_paths(paths, "batch")
+        assert list(results) == paths
+        assert all(results[f"src/m{i}.py"]["allowed"] for i in range(500))
+        # Baseline entries also match like Path.match globs ("tests" matches x/tests)
+        assert results["x/tests"]["allowed"]
+        assert not results["lib/a.py"]["allowed"]
+        assert not results["/etc/passwd"]["allowed"]
+        assert (rfd_dir / "cache" / "scope.json").exists()
+
+        from rfd.prevention import ScopeDriftPrevention
+
+        scope = ScopeDriftPrevention(str(rfd.db_path))
+        results = scope.check_paths(["src/a.py", "README.md", "lib/__pycache__/a.pyc", "lib/a.py"], "batch")
+        assert results["src/a.py"] == (True, "File is in allowed directory")
+        assert results["README.md"] == (True, "File is in allowed files list")
+        assert results["lib/__pycache__/a.pyc"] == (True, "Build/test artifact allowed")
+        assert results["lib/a.py"] == (False, "File lib/a.py not in allowed scope")
+
+        conn = sqlite3.connect(rfd.db_path)
+        logged = conn.execute("SELECT violation_type, file_path FROM violations ORDER BY id").fetchall()
+        conn.close()
+        assert logged == [
+            ("out_of_scope", "lib/a.py"),
+            ("out_of_scope", "/etc/passwd"),
+            ("scope_drift", "lib/a.py"),
+        ]
+
+
 if __name__ == "__main__":
     test_workflow_enforcement()
     test_drift_detection()
     test_multi_agent_coordination()
+    test_scope_check_paths_batch()
     print("\n🎉 All enforcement tests passed!")